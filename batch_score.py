@@ -0,0 +1,334 @@
+"""
+Batch Scoring for DevCare
+Re-scores recorded session videos offline, e.g. after the scoring weights
+change. Files are sharded across a process pool; each worker decodes,
+infers and scores its files independently, so throughput grows with the
+number of cores. Every file gets a fresh MediaPipe Pose (its tracking state
+would otherwise carry over from the previous recording), and a file that
+fails is reported in the stats without stopping the run.
+
+Landmarks are streamed into fixed-size chunks and scored by the vectorized
+scorer (posture_scoring.py) a chunk at a time, so memory stays flat however
+long a recording is. Chunks seen before the baselines are known are held
+back so they can be scored too, up to MAX_HELD_FRAMES; past that (an empty
+room, someone too far from the camera) they are written unscored. Each video gets a CSV score time series under --out,
+at its path relative to the inputs' common directory (so session1/cam.mp4
+and session2/cam.mp4 don't overwrite each other); the run's throughput is
+written to throughput.json.
+
+Usage:
+    python batch_score.py sessions/*.mp4 --out scores/
+    python batch_score.py sessions/*.mp4 --workers 8 --stride 3 --weights torso=0.4,head=0.2
+"""
+
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+import posture_scoring
+
+CHUNK_FRAMES = 256          # landmark rows scored per vectorized call
+CALIBRATION_FRAMES = 90     # frames with a person used for the baselines
+MAX_HELD_FRAMES = 8 * CHUNK_FRAMES  # frames held back waiting for the baselines
+MAX_WIDTH = 640             # downscale larger recordings before inference
+
+# Per worker process: the model to build a Pose from (_init_worker), the
+# current file's Pose (_open_backend) and reusable frame buffers
+_model = 'full'
+_backend = None
+_preprocessor = None
+
+
+def _init_worker(model, max_width):
+    """Pool initializer: remember the model and build this worker's frame buffers once"""
+    global _model, _preprocessor
+    import cv2
+
+    from frame_preprocessor import FramePreprocessor
+
+    # The pool already uses every core; don't let OpenCV oversubscribe them
+    cv2.setNumThreads(1)
+
+    _model = model
+    _preprocessor = FramePreprocessor(max_width=max_width)
+
+
+def _open_backend():
+    """Replace the worker's Pose with a fresh one (no tracking state from the last file)"""
+    global _backend
+    from pose_backends import SolutionsBackend
+
+    if _backend:
+        _backend.close()
+    _backend = SolutionsBackend(_model)
+
+
+def iter_landmark_chunks(camera, stride=1, chunk_frames=CHUNK_FRAMES):
+    """
+    Decode a video and run pose inference on every `stride`-th frame
+    Yields: (frame_indices, seconds, landmarks) - landmarks is (n, 33, 4),
+    NaN rows for frames without a person
+    """
+    import cv2
+
+    fps = camera.get(cv2.CAP_PROP_FPS) or 30.0
+    landmarks = np.empty((chunk_frames, 33, 4))
+    indices = np.empty(chunk_frames, dtype=np.int64)
+    filled = 0
+    index = -1
+
+    while True:
+        # grab() skips decoding work for frames we are striding over
+        if not camera.grab():
+            break
+        index += 1
+        if index % stride:
+            continue
+        success, frame = _preprocessor.retrieve(camera)
+        if not success:
+            break
+
+        result = _backend.detect(_preprocessor.to_rgb(frame), int(index * 1000 / fps))
+        if result.landmarks:
+            landmarks[filled] = [(lm.x, lm.y, lm.z, lm.visibility) for lm in result.landmarks]
+        else:
+            landmarks[filled] = np.nan
+        indices[filled] = index
+        filled += 1
+
+        if filled == chunk_frames:
+            yield indices.copy(), indices / fps, landmarks.copy()
+            filled = 0
+
+    if filled:
+        yield indices[:filled].copy(), indices[:filled] / fps, landmarks[:filled].copy()
+
+
+def output_names(paths):
+    """
+    CSV name for each input: its path below the inputs' common directory,
+    without the extension, suffixed -2, -3... if still taken (same file
+    listed twice, cam.mp4 next to cam.avi)
+    Returns: list of names, in the order of paths
+    """
+    absolute = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute]) if absolute else ''
+    names, used = [], set()
+    for path in absolute:
+        base = os.path.splitext(os.path.relpath(path, root))[0]
+        name, n = base, 1
+        while name in used:
+            n += 1
+            name = f"{base}-{n}"
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def _new_stats(path):
+    return {'file': path, 'csv': None, 'frames': 0, 'detected': 0, 'unscored': 0, 'mean_score': None,
+            'seconds': 0.0, 'fps': 0.0, 'worker': os.getpid(), 'error': None}
+
+
+def score_file(path, out_dir, stride=1, weights=None, calibration_frames=CALIBRATION_FRAMES, name=None):
+    """
+    Score one video into out_dir/<name>.csv (runs inside a pool worker)
+    name: output name from output_names (default: the file's own name)
+    Returns: dict - per-file stats (or an 'error')
+    """
+    import cv2
+
+    weights = weights or posture_scoring.WEIGHTS
+    start = time.perf_counter()
+    stats = _new_stats(path)
+
+    camera = cv2.VideoCapture(path)
+    if not camera.isOpened():
+        stats['error'] = 'could not open video'
+        return stats
+
+    csv_path = os.path.join(out_dir, (name or os.path.splitext(os.path.basename(path))[0]) + '.csv')
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    score_sum = 0
+
+    # Rows are held back until the baselines are known, then streamed. Only
+    # the first calibration_frames usable rows are kept for the baselines.
+    pending = []
+    held_frames = 0
+    usable = []
+    usable_count = 0
+    baselines = None
+
+    try:
+        _open_backend()
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame', 'time_s', 'person', 'score'])
+
+            def write_chunk(indices, seconds, landmarks):
+                nonlocal score_sum
+                scores = posture_scoring.score_landmarks(landmarks, *baselines, weights=weights)
+                person = ~np.isnan(landmarks[:, 0, 0])
+                writer.writerows(zip(indices.tolist(), np.round(seconds, 3).tolist(),
+                                     person.astype(int).tolist(), scores.tolist()))
+                stats['detected'] += int(person.sum())
+                score_sum += int(scores[person].sum())
+
+            def write_unscored(indices, seconds, landmarks):
+                person = ~np.isnan(landmarks[:, 0, 0])
+                writer.writerows(zip(indices.tolist(), np.round(seconds, 3).tolist(),
+                                     person.astype(int).tolist(), [''] * len(indices)))
+                stats['unscored'] += len(indices)
+
+            def collect_usable(landmarks):
+                nonlocal usable_count
+                width = posture_scoring.posture_ratios(landmarks)['shoulder_width']
+                rows = landmarks[width >= posture_scoring.MIN_SHOULDER_WIDTH][:calibration_frames - usable_count]
+                usable.append(rows)
+                usable_count += len(rows)
+
+            for chunk in iter_landmark_chunks(camera, stride):
+                stats['frames'] += len(chunk[0])
+                if baselines is not None:
+                    write_chunk(*chunk)
+                    continue
+
+                collect_usable(chunk[2])
+                pending.append(chunk)
+                held_frames += len(chunk[0])
+                if usable_count >= calibration_frames:
+                    baselines = posture_scoring.calibrate(np.concatenate(usable), calibration_frames)
+                    for held in pending:
+                        write_chunk(*held)
+                    pending, usable = [], []
+                elif held_frames > MAX_HELD_FRAMES:
+                    # Nobody usable for a long time - stop holding rows for them
+                    for held in pending:
+                        write_unscored(*held)
+                    pending, held_frames = [], 0
+
+            if baselines is None and usable_count:
+                # Short recording: calibrate on whatever was seen
+                baselines = posture_scoring.calibrate(np.concatenate(usable), calibration_frames)
+                for held in pending:
+                    write_chunk(*held)
+            elif baselines is None:
+                for held in pending:
+                    write_unscored(*held)
+                stats['error'] = 'no usable person'
+
+    finally:
+        camera.release()
+
+    stats['csv'] = csv_path
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    stats['fps'] = round(stats['frames'] / stats['seconds'], 1) if stats['seconds'] else 0.0
+    if stats['detected']:
+        stats['mean_score'] = round(score_sum / stats['detected'], 1)
+    return stats
+
+
+def _score_task(task):
+    """Score one file; an exception becomes that file's 'error' instead of ending the run"""
+    try:
+        return score_file(*task)
+    except Exception as e:
+        stats = _new_stats(task[0])
+        stats['error'] = f"{type(e).__name__}: {e}"
+        return stats
+
+
+def run_batch(paths, out_dir, workers=None, stride=1, weights=None, model='full',
+              max_width=MAX_WIDTH):
+    """
+    Score many videos across a process pool
+    Returns: dict - throughput summary with per-file stats
+    """
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Longest files first so one big file doesn't start last and run alone
+    paths = sorted(paths, key=lambda p: -os.path.getsize(p) if os.path.exists(p) else 0)
+    tasks = [(path, out_dir, stride, weights, CALIBRATION_FRAMES, name)
+             for path, name in zip(paths, output_names(paths))]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+
+    start = time.perf_counter()
+    files = []
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(workers, initializer=_init_worker,
+                  initargs=(model, max_width)) as pool:
+        for stats in pool.imap_unordered(_score_task, tasks):
+            files.append(stats)
+            if stats['error']:
+                print(f"❌ {stats['file']}: {stats['error']}")
+            else:
+                print(f"✅ {stats['file']}: {stats['frames']} frames, {stats['fps']} fps, "
+                      f"mean score {stats['mean_score']}")
+    elapsed = time.perf_counter() - start
+
+    frames = sum(s['frames'] for s in files)
+    busy = sum(s['seconds'] for s in files)
+    return {
+        'workers': workers,
+        'files': len(files),
+        'failed': sum(1 for s in files if s['error']),
+        'frames': frames,
+        'wall_seconds': round(elapsed, 3),
+        'frames_per_second': round(frames / elapsed, 1) if elapsed else 0.0,
+        'frames_per_second_per_worker': round(frames / busy, 1) if busy else 0.0,
+        # 1.0 = every worker busy for the whole run
+        'parallel_efficiency': round(busy / (elapsed * workers), 3) if elapsed else 0.0,
+        'stride': stride,
+        'model': model,
+        'weights': weights or posture_scoring.WEIGHTS,
+        'per_file': sorted(files, key=lambda s: s['file'])
+    }
+
+
+def parse_weights(text):
+    """
+    Parse 'torso=0.4,head=0.2' over the default weights
+    Returns: dict
+    """
+    weights = dict(posture_scoring.WEIGHTS)
+    for item in filter(None, text.split(',')):
+        name, _, value = item.partition('=')
+        if name not in weights:
+            raise argparse.ArgumentTypeError(f"unknown weight '{name}' (choose from {', '.join(weights)})")
+        weights[name] = float(value)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-score recorded sessions across CPU cores')
+    parser.add_argument('videos', nargs='+', help='video files to score')
+    parser.add_argument('--out', default='scores', help='directory for per-file CSVs and throughput.json')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--stride', type=int, default=1, help='score every Nth frame')
+    parser.add_argument('--model', default='full', choices=('lite', 'full', 'heavy'), help='pose model size')
+    parser.add_argument('--max-width', type=int, default=MAX_WIDTH, help='downscale wider frames to this width')
+    parser.add_argument('--weights', type=parse_weights, default=None,
+                        help='override score weights, e.g. torso=0.4,head=0.2')
+    args = parser.parse_args(argv)
+
+    summary = run_batch(args.videos, args.out, args.workers, args.stride, args.weights,
+                        args.model, args.max_width)
+
+    path = os.path.join(args.out, 'throughput.json')
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"\n📊 {summary['frames']} frames from {summary['files']} files in {summary['wall_seconds']}s "
+          f"({summary['frames_per_second']} fps, {summary['workers']} workers, "
+          f"efficiency {summary['parallel_efficiency']:.0%})")
+    print(f"💾 Throughput stats: {path}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
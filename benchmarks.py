@@ -0,0 +1,530 @@
+"""
+DevCare Benchmarks
+Headless benchmarks for every hot path - no camera, keyboard or display needed
+
+Usage:
+    python benchmarks.py                  # run and print results
+    python benchmarks.py --save           # run and store the results as the baseline
+    python benchmarks.py --compare        # run and fail if slower than the baseline
+    python benchmarks.py -k typing        # only benchmarks whose name contains 'typing'
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+DEFAULT_BASELINE = os.path.join('.benchmarks', 'baseline.json')
+DEFAULT_TOLERANCE = 0.20  # fail if more than 20% slower than baseline
+ROUNDS = 5
+MIN_ROUND_TIME = 0.1      # seconds per timed round
+
+BENCHMARKS = []
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup function when its component can't be loaded here"""
+
+
+def benchmark(name, ops=1):
+    """
+    Register a benchmark setup function
+    The setup function returns a zero-argument callable that performs `ops` operations
+    """
+    def register(setup):
+        BENCHMARKS.append((name, setup, ops))
+        return setup
+    return register
+
+
+@contextlib.contextmanager
+def quiet():
+    """Swallow the components' console output while benchmarking"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ==========================================
+# SYNTHETIC INPUTS
+# ==========================================
+
+Landmark = namedtuple('Landmark', 'x y z visibility')
+
+
+def make_landmarks(head_drop=0.0, slouch=0.0):
+    """
+    Build 33 MediaPipe-style landmarks for a seated person facing the camera
+    head_drop / slouch: 0 = upright, larger values move ears and shoulders down
+    Returns: list of Landmark
+    """
+    points = [Landmark(0.5, 0.5, 0.0, 0.5)] * 33
+
+    ear_y = 0.32 + head_drop
+    shoulder_y = 0.50 + slouch
+
+    points[0] = Landmark(0.50, 0.30 + head_drop, -0.3, 0.99)     # nose
+    points[7] = Landmark(0.45, ear_y, -0.1, 0.98)                # left ear
+    points[8] = Landmark(0.55, ear_y, -0.1, 0.98)                # right ear
+    points[11] = Landmark(0.38, shoulder_y, 0.0, 0.99)           # left shoulder
+    points[12] = Landmark(0.62, shoulder_y + 0.01, 0.0, 0.99)    # right shoulder
+    points[23] = Landmark(0.42, 0.85, 0.0, 0.90)                 # left hip
+    points[24] = Landmark(0.58, 0.85, 0.0, 0.90)                 # right hip
+    return points
+
+
+UPRIGHT = make_landmarks()
+SLOUCHED = make_landmarks(head_drop=0.08, slouch=0.06)
+
+TYPING_RATES = (60, 300, 600)  # keys per minute held in the 60 s window
+
+_detector = None
+
+
+def get_calibrated_detector():
+    """One PostureDetector shared by all posture benchmarks, calibrated on UPRIGHT"""
+    global _detector
+    if _detector is None:
+        try:
+            from posture_detector import PostureDetector
+        except ImportError as e:
+            raise SkipBenchmark(f"posture detector unavailable ({e})")
+
+        with quiet():
+            detector = PostureDetector()
+            for _ in range(detector.CALIBRATION_FRAMES):
+                detector.calculate_posture_score(UPRIGHT)
+            detector.complete_calibration()
+        _detector = detector
+    return _detector
+
+
+def make_typing_analyzer(rate):
+    """TypingAnalyzer (no keyboard hook) with `rate` keys spread over the last minute"""
+    from typing_analyzer import TypingAnalyzer
+
+    with quiet():
+        analyzer = TypingAnalyzer(listen=False)
+
+    now = time.time()
+    analyzer.start_time = now - 120
+    analyzer.keystrokes = max(rate, 10)
+    analyzer.backspaces = rate // 10
+    analyzer.keys_last_minute = [now - 60 + (i + 1) * 60 / rate for i in range(rate)]
+    return analyzer
+
+
+# ==========================================
+# BENCHMARKS
+# ==========================================
+
+@benchmark('posture_scoring', ops=2)
+def bench_posture_scoring():
+    detector = get_calibrated_detector()
+    score = detector.calculate_posture_score
+
+    def run():
+        score(UPRIGHT)
+        score(SLOUCHED)
+    return run
+
+
+@benchmark('posture_tracked_scoring')
+def bench_posture_tracked_scoring():
+    from landmark_tracker import LandmarkTracker, as_landmarks
+    from posture_detector import landmarks_to_array
+
+    detector = get_calibrated_detector()
+    tracker = LandmarkTracker()
+    tracker.update(landmarks_to_array(UPRIGHT), 0.0)
+    clock = [0.0]
+
+    def run():
+        # One predicted frame between detections, as in PostureDetector.score_tracked
+        clock[0] += 0.033
+        detector.calculate_posture_score(as_landmarks(tracker.predict(clock[0])))
+    return run
+
+
+@benchmark('posture_scoring_vectorized_1000', ops=1000)
+def bench_posture_scoring_vectorized():
+    try:
+        import numpy as np
+        from posture_detector import landmarks_to_array
+        from posture_scoring import calibrate, score_landmarks
+    except ImportError as e:
+        raise SkipBenchmark(f"posture scoring unavailable ({e})")
+
+    # Per-frame cost when re-scoring recordings (batch_score.py), vs posture_scoring
+    frames = np.stack([landmarks_to_array(UPRIGHT if i % 2 else SLOUCHED) for i in range(1000)])
+    baselines = calibrate(frames[1::2])
+    return lambda: score_landmarks(frames, *baselines)
+
+
+def _bench_person_tracker(people):
+    try:
+        import numpy as np
+        from person_tracker import PersonTracker
+        from posture_detector import landmarks_to_array
+    except ImportError as e:
+        raise SkipBenchmark(f"person tracker unavailable ({e})")
+
+    # Per-inference cost of multi-person mode: matching, calibration bookkeeping, scoring
+    tracker = PersonTracker(calibration_frames=1)
+    detections = []
+    for i in range(people):
+        landmarks = landmarks_to_array(UPRIGHT if i % 2 else SLOUCHED)
+        landmarks[:, 0] += (i - people / 2) * 0.3
+        detections.append(landmarks)
+    for _ in range(2):
+        tracker.update(detections)  # calibrate everyone
+    return lambda: tracker.update(detections)
+
+
+@benchmark('person_tracker_update_1')
+def bench_person_tracker_1():
+    return _bench_person_tracker(1)
+
+
+@benchmark('person_tracker_update_4')
+def bench_person_tracker_4():
+    return _bench_person_tracker(4)
+
+
+@benchmark('drift_detector_update')
+def bench_drift_detector_update():
+    from drift_detector import DriftDetector
+
+    # Added to every scored detection once calibrated
+    detector = DriftDetector()
+    detector.start({'shoulder_hip': 1.4, 'head_shoulder': 0.75})
+    ratios = [(1.4 + (i % 7) * 0.01, 0.75 - (i % 5) * 0.01) for i in range(100)]
+    clock = [0]
+
+    def run():
+        clock[0] += 1
+        detector.update(ratios[clock[0] % 100], (0.16, 0.5, 0.85, 0.25, 0.5, 0.5))
+    return run
+
+
+@benchmark('posture_smoothing', ops=100)
+def bench_posture_smoothing():
+    detector = get_calibrated_detector()
+    smooth = detector.smooth_score
+    scores = [60 + i % 40 for i in range(100)]
+
+    def run():
+        for s in scores:
+            smooth(s)
+    return run
+
+
+def _bench_on_press(rate):
+    from typing_analyzer import BACKSPACE
+
+    analyzer = make_typing_analyzer(rate)
+    window = list(analyzer.keys_last_minute)
+    keys = ['a'] * 9 + [BACKSPACE]
+
+    def run():
+        # Start each batch from the same window so its size stays ~rate
+        analyzer.keys_last_minute = list(window)
+        for _ in range(10):
+            for key in keys:
+                analyzer.on_press(key)
+    return run
+
+
+def _bench_query(rate, method):
+    analyzer = make_typing_analyzer(rate)
+    return getattr(analyzer, method)
+
+
+for _rate in TYPING_RATES:
+    benchmark(f'typing_on_press_{_rate}kpm', ops=100)(lambda rate=_rate: _bench_on_press(rate))
+    benchmark(f'typing_speed_{_rate}kpm')(lambda rate=_rate: _bench_query(rate, 'get_typing_speed'))
+    benchmark(f'typing_stress_level_{_rate}kpm')(lambda rate=_rate: _bench_query(rate, 'get_stress_level'))
+
+
+@benchmark('stress_analyze_patterns')
+def bench_stress_analyze_patterns():
+    from stress_detector import StressDetector
+
+    with quiet():
+        detector = StressDetector()
+    stats = {'typing_speed': 320, 'backspace_ratio': 0.2, 'stress_level': 'Medium'}
+
+    def run():
+        detector.analyze_patterns(stats, posture_score=55)
+    return run
+
+
+@benchmark('break_get_status')
+def bench_break_get_status():
+    from break_manager import BreakManager
+
+    with quiet():
+        manager = BreakManager()
+    return manager.get_status
+
+
+def _bench_break_statistics(history):
+    from break_manager import BreakManager
+
+    with quiet():
+        manager = BreakManager()
+        for _ in range(history):
+            manager.take_break()
+    return manager.get_statistics
+
+
+for _history in (10, 1000, 10000):
+    benchmark(f'break_get_statistics_{_history}')(lambda n=_history: _bench_break_statistics(n))
+
+
+@benchmark('motion_gate_640x480')
+def bench_motion_gate():
+    try:
+        import numpy as np
+        from motion_gate import MotionGate
+    except ImportError as e:
+        raise SkipBenchmark(f"motion gate unavailable ({e})")
+
+    gate = MotionGate(max_staleness=float('inf'))
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    gate.should_process(frame)
+    return lambda: gate.should_process(frame)
+
+
+@benchmark('frame_to_rgb_640x480')
+def bench_frame_to_rgb():
+    try:
+        import numpy as np
+        from frame_preprocessor import FramePreprocessor
+    except ImportError as e:
+        raise SkipBenchmark(f"frame preprocessor unavailable ({e})")
+
+    preprocessor = FramePreprocessor()
+    frame = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    return lambda: preprocessor.to_rgb(frame)
+
+
+def _bench_pose_inference(backend_name, model):
+    try:
+        import numpy as np
+        from pose_backends import create_backend
+    except ImportError as e:
+        raise SkipBenchmark(f"pose backends unavailable ({e})")
+
+    try:
+        with quiet():
+            backend = create_backend(backend_name, model)
+    except Exception as e:
+        raise SkipBenchmark(f"{backend_name} {model} model unavailable ({e})")
+
+    # Each op waits for its own result: inference latency, comparable across backends
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    clock = [0]
+
+    def run():
+        clock[0] += 33
+        backend.detect(image, clock[0], wait=True)
+    return run
+
+
+for _backend in ('solutions', 'tasks'):
+    for _model in ('lite', 'full', 'heavy'):
+        benchmark(f'pose_inference_{_backend}_{_model}')(
+            lambda b=_backend, m=_model: _bench_pose_inference(b, m))
+
+
+@benchmark('head_pose_inference')
+def bench_head_pose_inference():
+    try:
+        import numpy as np
+        from head_pose import HeadPoseEstimator
+    except ImportError as e:
+        raise SkipBenchmark(f"head pose unavailable ({e})")
+
+    # Head mode's per-frame cost, to set against pose_inference_*
+    with quiet():
+        estimator = HeadPoseEstimator()
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    return lambda: estimator.detect(image)
+
+
+def _telemetry_samples(count):
+    """An hour-like run of 1 Hz telemetry tuples"""
+    now = time.time()
+    return [(now + i + (i % 7) * 0.001, 60 + i % 40, i % 3, 120 + i % 200, i // 600, i % 600 > 540)
+            for i in range(count)]
+
+
+@benchmark('telemetry_frame_encode_3600')
+def bench_telemetry_encode():
+    from telemetry_uploader import encode_frame
+
+    samples = _telemetry_samples(3600)
+    return lambda: encode_frame('bench@host', 'default', samples)
+
+
+@benchmark('telemetry_frame_decode_3600')
+def bench_telemetry_decode():
+    from telemetry_uploader import decode_frame, encode_frame
+
+    frame = encode_frame('bench@host', 'default', _telemetry_samples(3600))
+    return lambda: decode_frame(frame)
+
+
+@benchmark('api_status_request')
+def bench_api_status():
+    try:
+        with quiet():
+            import devcareapp
+    except ImportError as e:
+        raise SkipBenchmark(f"flask unavailable ({e})")
+
+    client = devcareapp.app.test_client()
+
+    def run():
+        client.get('/api/status')
+    return run
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+
+def time_benchmark(fn, ops):
+    """
+    Time fn over several rounds
+    Returns: dict with median/min/max ops per second and microseconds per op
+    """
+    with quiet():
+        fn()  # warm up
+
+        # Pick a call count that makes each round last at least MIN_ROUND_TIME
+        calls = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_ROUND_TIME:
+                break
+            calls *= 2 if elapsed <= 0 else max(2, int(MIN_ROUND_TIME / elapsed * 1.2))
+
+        rates = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for _ in range(calls):
+                fn()
+            rates.append(calls * ops / (time.perf_counter() - start))
+
+    median = statistics.median(rates)
+    return {
+        'ops_per_sec': round(median, 1),
+        'min_ops_per_sec': round(min(rates), 1),
+        'max_ops_per_sec': round(max(rates), 1),
+        'us_per_op': round(1e6 / median, 3),
+        'rounds': ROUNDS
+    }
+
+
+def run_benchmarks(selected=None):
+    """
+    Run all (or the selected) benchmarks
+    Returns: dict - name -> result (or {'skipped': reason})
+    """
+    results = {}
+    for name, setup, ops in BENCHMARKS:
+        if selected and selected not in name:
+            continue
+        try:
+            fn = setup()
+        except SkipBenchmark as e:
+            results[name] = {'skipped': str(e)}
+            print(f"⏭️  {name:<32} skipped: {e}")
+            continue
+
+        result = time_benchmark(fn, ops)
+        results[name] = result
+        print(f"⏱️  {name:<32} {result['ops_per_sec']:>14,.0f} ops/s  {result['us_per_op']:>10.2f} µs/op")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare results against a baseline
+    Returns: list of names that regressed
+    """
+    regressions = []
+    print("\n" + "=" * 60)
+    print(f"{'Benchmark':<32}{'Baseline':>12}{'Now':>12}{'Change':>10}")
+    print("-" * 60)
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if 'skipped' in result or not base or 'skipped' in base:
+            continue
+        change = result['ops_per_sec'] / base['ops_per_sec'] - 1
+        marker = ''
+        if change < -tolerance:
+            regressions.append(name)
+            marker = '  ❌'
+        print(f"{name:<32}{base['ops_per_sec']:>12,.0f}{result['ops_per_sec']:>12,.0f}{change:>+10.1%}{marker}")
+    print("=" * 60)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DevCare headless benchmarks')
+    parser.add_argument('-k', dest='selected', default=None,
+                        help='only run benchmarks whose name contains this string')
+    parser.add_argument('--save', action='store_true', help='store results as the new baseline')
+    parser.add_argument('--compare', action='store_true', help='fail if slower than the baseline')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown before failing (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("DEVCARE - BENCHMARKS")
+    print("=" * 60)
+    results = run_benchmarks(args.selected)
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"❌ No baseline at {args.baseline} - run with --save first")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+            exit_code = 1
+        else:
+            print("✅ No regressions")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                'timestamp': time.time(),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+                'results': results
+            }, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,41 @@
 import time
+from array import array
 from datetime import datetime, timedelta
 
+from running_stats import QuantileSketch, RunningStats
+
+
+class BreakHistory:
+    def __init__(self):
+        """
+        Break records stored column-wise in typed arrays (24 bytes per break
+        instead of a dict each). Indexing and iteration still yield dicts.
+        """
+        self.timestamps = array('d')
+        self.durations_before = array('d')  # minutes of work before each break
+        self.work_minutes = array('q')  # 8 bytes everywhere; 'l' is 4 on Windows
+
+    def append(self, record):
+        self.timestamps.append(record['timestamp'])
+        self.durations_before.append(record['duration_before'])
+        self.work_minutes.append(record['work_minutes'])
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return {
+            'timestamp': self.timestamps[index],
+            'duration_before': self.durations_before[index],
+            'work_minutes': self.work_minutes[index]
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
 
 class BreakManager:
     def __init__(self):
@@ -10,8 +45,13 @@ class BreakManager:
         self.breaks_taken = 0
         self.break_interval = 45  # Suggest break every 45 minutes
 
-        # History tracking
-        self.break_history = []
+        # History tracking, plus running aggregates so statistics don't rescan it
+        self.break_history = BreakHistory()
+        self.interval_stats = RunningStats()
+        self.interval_sketch = QuantileSketch()
+
+        # Optional BreakScheduler that tracks effective (activity-based) work time
+        self.scheduler = None
 
         print("☕ Break Manager initialized")
 
@@ -36,6 +76,10 @@ class BreakManager:
         Check if it's time to suggest a break
         Returns: bool - True if break should be suggested
         """
+        # Activity-based only once a source reports; until then, wall-clock time
+        if self.scheduler and self.scheduler.reporting:
+            return self.scheduler.should_break
+
         minutes_since_break = self.get_time_since_break()
         return minutes_since_break >= self.break_interval
 
@@ -45,19 +89,23 @@ class BreakManager:
         """
         current_time = time.time()
 
-        # Calculate how long since last break
-        duration_before_break = current_time - self.last_break
+        # Calculate how long since last break (in minutes)
+        duration_before_break = (current_time - self.last_break) / 60
 
         # Record break
         self.break_history.append({
             'timestamp': current_time,
-            'duration_before': duration_before_break / 60,  # in minutes
+            'duration_before': duration_before_break,
             'work_minutes': self.get_time_working()
         })
+        self.interval_stats.add(duration_before_break)
+        self.interval_sketch.add(duration_before_break)
 
         # Update counters
         self.last_break = current_time
         self.breaks_taken += 1
+        if self.scheduler:
+            self.scheduler.break_taken(current_time)
 
         print(f"☕ Break #{self.breaks_taken} recorded")
 
@@ -66,7 +114,10 @@ class BreakManager:
         Get a personalized break suggestion
         Returns: str - suggestion message
         """
-        minutes = self.get_time_since_break()
+        if self.scheduler and self.scheduler.reporting:
+            minutes = int(self.scheduler.effective_work_seconds() / 60)
+        else:
+            minutes = self.get_time_since_break()
 
         if minutes < 30:
             return "Keep coding! Break coming soon."
@@ -84,35 +135,43 @@ class BreakManager:
         Get current break status
         Returns: dict with all break info
         """
-        return {
+        status = {}
+        if self.scheduler:
+            status.update(self.scheduler.get_status())
+        status.update({
             'time_working': self.get_time_working(),
             'time_since_break': self.get_time_since_break(),
             'breaks_taken': self.breaks_taken,
             'should_break': self.should_suggest_break(),
             'suggestion': self.get_break_suggestion()
-        }
+        })
+        return status
 
     def get_statistics(self):
         """
-        Get statistics about break patterns
-        Returns: dict with statistics
+        Get statistics about break patterns (constant time - read from running aggregates)
+        Returns: dict with statistics; percentiles are approximate (within 1%)
         """
-        if len(self.break_history) == 0:
+        stats = self.interval_stats
+        if stats.count == 0:
             return {
                 'total_breaks': 0,
                 'average_interval': 0,
                 'longest_session': 0,
-                'shortest_session': 0
+                'shortest_session': 0,
+                'interval_stddev': 0,
+                'median_interval': 0,
+                'p90_interval': 0
             }
 
-        # Calculate statistics
-        intervals = [b['duration_before'] for b in self.break_history]
-
         return {
-            'total_breaks': len(self.break_history),
-            'average_interval': round(sum(intervals) / len(intervals), 1),
-            'longest_session': round(max(intervals), 1),
-            'shortest_session': round(min(intervals), 1)
+            'total_breaks': stats.count,
+            'average_interval': round(stats.mean, 1),
+            'longest_session': round(stats.maximum, 1),
+            'shortest_session': round(stats.minimum, 1),
+            'interval_stddev': round(stats.stddev, 1),
+            'median_interval': round(self.interval_sketch.quantile(0.5), 1),
+            'p90_interval': round(self.interval_sketch.quantile(0.9), 1)
         }
 
     def set_break_interval(self, minutes):
@@ -122,6 +181,8 @@ class BreakManager:
             minutes: int - minutes between breaks
         """
         self.break_interval = minutes
+        if self.scheduler:
+            self.scheduler.set_break_interval(minutes * 60)
         print(f"⏰ Break interval set to {minutes} minutes")
 
     def reset(self):
@@ -129,7 +190,11 @@ class BreakManager:
         self.work_start = time.time()
         self.last_break = time.time()
         self.breaks_taken = 0
-        self.break_history = []
+        self.break_history = BreakHistory()
+        self.interval_stats = RunningStats()
+        self.interval_sketch = QuantileSketch()
+        if self.scheduler:
+            self.scheduler.break_taken()
         print("🔄 Break stats reset")
 
     def get_formatted_time(self):
@@ -202,5 +267,6 @@ if __name__ == "__main__":
     print(f"   Average interval: {stats['average_interval']} min")
     print(f"   Longest session: {stats['longest_session']} min")
     print(f"   Shortest session: {stats['shortest_session']} min")
+    print(f"   Median interval: {stats['median_interval']} min")
 
     print("\n✅ Break Manager test complete!\n")
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Activity-Aware Break Scheduler for DevCare
+Tracks effective work time from activity events instead of wall-clock time.
+
+- TypingAnalyzer reports every key press, PostureDetector every frame with
+  a person in it. No events for idle_threshold seconds means the user is idle
+  (or away from the desk) and the work clock pauses.
+- Staying idle for natural_break seconds counts as a break, so stepping away
+  for coffee resets the clock without clicking "Take Break".
+- Fast typing counts as extra strain and brings the next break forward.
+- Until some source has reported at least once (no camera, no keyboard
+  hook) silence says nothing about the user, so the clock runs on wall time
+  and no natural break is ever credited.
+- Deadlines (break due, idle check, natural break) live on a timer wheel
+  that is advanced once per tick, so nothing is recomputed on each poll and
+  the per-event cost is a couple of attribute writes.
+"""
+
+import threading
+import time
+
+# Defaults (seconds)
+BREAK_INTERVAL = 45 * 60
+IDLE_THRESHOLD = 3 * 60
+NATURAL_BREAK = 5 * 60
+TICK = 1.0
+
+INTENSE_KPM = 300      # typing faster than this counts as strain...
+INTENSE_WEIGHT = 1.5   # ...and each such second counts as 1.5 seconds of work
+
+
+class Timer:
+    __slots__ = ('tick', 'callback', 'cancelled')
+
+    def __init__(self, tick, callback):
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TimerWheel:
+    def __init__(self, start, tick=TICK, slots=512):
+        """
+        Hashed timer wheel: timers sit in the slot for their due tick, and
+        advancing one tick only looks at that slot
+        start: clock time of tick 0
+        """
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.current = int(start / tick)
+
+    def schedule(self, when, callback):
+        """
+        Call callback(now) once the wheel is advanced past `when`
+        Returns: Timer (call .cancel() to drop it)
+        """
+        due = max(int(when / self.tick), self.current + 1)
+        timer = Timer(due, callback)
+        self.slots[due % len(self.slots)].append(timer)
+        return timer
+
+    def advance(self, now):
+        """Fire every timer due up to `now`"""
+        target = int(now / self.tick)
+        if target - self.current >= len(self.slots):
+            # Clock jumped (suspend/resume) - one pass over every slot
+            self.current = target
+            for slot in self.slots:
+                self._fire_due(slot, now)
+            return
+
+        while self.current < target:
+            self.current += 1
+            self._fire_due(self.slots[self.current % len(self.slots)], now)
+
+    def _fire_due(self, slot, now):
+        if not slot:
+            return
+        due = [t for t in slot if t.tick <= self.current]
+        slot[:] = [t for t in slot if t.tick > self.current and not t.cancelled]
+        for timer in due:
+            if not timer.cancelled:
+                timer.callback(now)
+
+
+class BreakScheduler:
+    def __init__(self, break_interval=BREAK_INTERVAL, idle_threshold=IDLE_THRESHOLD,
+                 natural_break=NATURAL_BREAK, tick=TICK, clock=time.time):
+        """
+        break_interval: seconds of effective work between breaks
+        idle_threshold: seconds without activity before the work clock pauses
+        natural_break: seconds without activity that count as a break (>= idle_threshold)
+        clock: time source (replaceable for simulation)
+        """
+        self.break_interval = break_interval
+        self.idle_threshold = idle_threshold
+        self.natural_break = max(natural_break, idle_threshold)
+        self.tick_seconds = tick
+        self.clock = clock
+
+        # Optional BreakManager notified when a natural break is credited
+        self.break_manager = None
+
+        now = clock()
+        self.wheel = TimerWheel(now, tick)
+        self.state = 'active'
+        self.last_activity = now
+        self.stretch_start = now    # start of the current active stretch
+        self.worked_before = 0.0    # effective seconds from earlier stretches since the last break
+        self.strain = 0.0           # extra seconds added for intense typing
+        self.should_break = False
+        self.natural_breaks = 0
+        self.keys = 0               # key presses since the last tick
+        self.sources = set()        # activity sources that have reported at least once
+
+        self.running = False
+        self._lock = threading.RLock()
+        self._deadline_timer = None
+        self._idle_timer = None
+        self._natural_timer = None
+
+        self._schedule_deadline()
+        self._idle_timer = self.wheel.schedule(now + idle_threshold, self._check_idle)
+
+    # ------------------------------------------
+    # Events (hot path)
+    # ------------------------------------------
+
+    def on_activity(self, source, timestamp=None):
+        """
+        Report user activity ('typing' per key press, 'presence' per detected frame)
+        Safe to call from any thread
+        """
+        self.last_activity = timestamp or self.clock()
+        if source not in self.sources:
+            self.sources.add(source)
+        if source == 'typing':
+            self.keys += 1
+        if self.state != 'active':
+            with self._lock:
+                self._resume(self.last_activity)
+
+    def break_taken(self, now=None):
+        """A break was taken (manually or credited) - restart the work clock"""
+        with self._lock:
+            now = now or self.clock()
+            self.worked_before = 0.0
+            self.strain = 0.0
+            self.should_break = False
+            if self.state == 'active':
+                self.stretch_start = now
+                self._schedule_deadline()
+
+    # ------------------------------------------
+    # Timers
+    # ------------------------------------------
+
+    def _schedule_deadline(self):
+        if self._deadline_timer:
+            self._deadline_timer.cancel()
+        remaining = self.break_interval - self.worked_before - self.strain
+        self._deadline_timer = self.wheel.schedule(self.stretch_start + remaining, self._break_due)
+
+    def _break_due(self, now):
+        if self.state == 'active':
+            self.should_break = True
+
+    def _check_idle(self, now):
+        if not self.sources:
+            # Nothing reports activity - keep counting wall-clock time
+            self._idle_timer = self.wheel.schedule(now + self.idle_threshold, self._check_idle)
+            return
+
+        idle_at = self.last_activity + self.idle_threshold
+        if now < idle_at:
+            # There was activity since this check was scheduled - look again later
+            self._idle_timer = self.wheel.schedule(idle_at, self._check_idle)
+            return
+
+        # Work stopped at the last activity, not when we noticed
+        self.worked_before += max(0.0, self.last_activity - self.stretch_start)
+        self.state = 'idle'
+        self._deadline_timer.cancel()
+        self._natural_timer = self.wheel.schedule(self.last_activity + self.natural_break, self._credit_natural_break)
+
+    def _credit_natural_break(self, now):
+        if self.state != 'idle' or not self.sources:
+            return
+        self.state = 'on_break'
+        self.natural_breaks += 1
+        print(f"🌿 Natural break credited (away {int((now - self.last_activity) / 60)} min)")
+        if self.break_manager:
+            self.break_manager.take_break()  # calls back into break_taken()
+        else:
+            self.break_taken(now)
+
+    def _resume(self, now):
+        if self.state == 'active':
+            return
+        if self._natural_timer:
+            self._natural_timer.cancel()
+        self.state = 'active'
+        self.stretch_start = now
+        self._schedule_deadline()
+        self._idle_timer = self.wheel.schedule(now + self.idle_threshold, self._check_idle)
+
+    # ------------------------------------------
+    # Driving the wheel
+    # ------------------------------------------
+
+    def tick(self, now=None):
+        """Advance the timers to now and account for typing intensity since the last tick"""
+        with self._lock:
+            now = now or self.clock()
+            keys, self.keys = self.keys, 0
+            if self.state == 'active' and keys * 60 / self.tick_seconds > INTENSE_KPM:
+                self.strain += (INTENSE_WEIGHT - 1) * self.tick_seconds
+                self._schedule_deadline()
+            self.wheel.advance(now)
+
+    def run(self):
+        """Drive the scheduler once per tick (blocking - run on a thread)"""
+        self.running = True
+        while self.running:
+            self.tick()
+            time.sleep(self.tick_seconds)
+
+    def start(self):
+        threading.Thread(target=self.run, name='break-scheduler', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    # ------------------------------------------
+    # Queries
+    # ------------------------------------------
+
+    @property
+    def reporting(self):
+        """Whether any activity source has reported (otherwise work time is wall-clock time)"""
+        return bool(self.sources)
+
+    def effective_work_seconds(self, now=None):
+        """Seconds of effective work (plus strain) since the last break"""
+        now = now or self.clock()
+        active = now - self.stretch_start if self.state == 'active' else 0.0
+        return self.worked_before + active + self.strain
+
+    def set_break_interval(self, seconds):
+        with self._lock:
+            self.break_interval = seconds
+            self.should_break = self.effective_work_seconds() >= seconds
+            if self.state == 'active':
+                self._schedule_deadline()
+
+    def get_status(self):
+        """
+        Get scheduler state
+        Returns: dict
+        """
+        worked = self.effective_work_seconds()
+        return {
+            'activity': self.state,
+            'effective_work_minutes': int(worked / 60),
+            'next_break_in_minutes': max(0, int((self.break_interval - worked) / 60)),
+            'idle_seconds': int(max(0.0, self.clock() - self.last_activity)),
+            'natural_breaks': self.natural_breaks,
+            'activity_sources': sorted(self.sources),
+            'should_break': self.should_break
+        }
+
+
+# ==========================================
+# TEST MODE (simulated clock)
+# ==========================================
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BREAK SCHEDULER - SIMULATION")
+    print("=" * 60)
+
+    now = [0.0]
+    scheduler = BreakScheduler(break_interval=30 * 60, clock=lambda: now[0])
+
+    def tick_silently(minutes):
+        for _ in range(int(minutes * 60)):
+            now[0] += 1
+            scheduler.tick(now[0])
+
+    def simulate(minutes, typing_kpm=0, present=True):
+        for _ in range(int(minutes * 60)):
+            now[0] += 1
+            if present:
+                scheduler.on_activity('presence', now[0])
+            for _ in range(typing_kpm // 60):
+                scheduler.on_activity('typing', now[0])
+            scheduler.tick(now[0])
+
+    def show(label):
+        status = scheduler.get_status()
+        print(f"{label:<34} {status['activity']:<9} worked {status['effective_work_minutes']:>3} min, "
+              f"next in {status['next_break_in_minutes']:>3} min, "
+              f"due={status['should_break']}, natural={status['natural_breaks']}")
+
+    tick_silently(31)
+    show("31 min, no activity source yet")
+    scheduler.break_taken(now[0])
+
+    simulate(10, typing_kpm=120)
+    show("10 min normal typing")
+    simulate(10, typing_kpm=480)
+    show("+10 min intense typing")
+    simulate(4, present=False)
+    show("+4 min away (idle, clock paused)")
+    simulate(1)
+    show("back at desk")
+    simulate(5)
+    show("+5 min present, not typing")
+    simulate(8, present=False)
+    show("+8 min away (natural break)")
+    simulate(1)
+    show("back at desk")
+
+    print("\n✅ Break Scheduler simulation complete!\n")
@@ -0,0 +1,183 @@
+"""
+Calibration Store for DevCare
+Saves posture calibration baselines per user and camera so a restart can
+score from the first detected frame instead of waiting for 90 frames of
+good posture.
+
+A profile is keyed by user and a camera fingerprint (device index plus the
+negotiated resolution and pixel format). Alongside the baselines it keeps
+the geometry of the person at calibration time - shoulder width and where
+the shoulders sat in the frame. After loading, the first few detected
+frames are checked against that geometry: if the camera was moved, the chair
+changed or someone else is sitting there, the profile is dropped and a fresh
+calibration runs.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+import posture_scoring
+
+PROFILE_PATH = 'calibration_profiles.json'
+PROFILE_VERSION = 1
+
+VALIDATION_FRAMES = 15    # detected frames checked against a loaded profile
+MAX_SCALE_CHANGE = 0.25   # shoulder width may differ this much (fraction) - distance to camera
+MAX_SHIFT = 0.15          # shoulder centre may move this far (normalized image units)
+MAX_RATIO_GAIN = 0.25     # sitting this much "straighter" than baseline means the baseline no longer fits
+
+
+def camera_fingerprint(capture_report, index=0):
+    """
+    Identify a camera setup from its negotiated capture properties
+    Returns: str, e.g. 'cam0-640x480-MJPG'
+    """
+    effective = capture_report['effective']
+    return f"cam{index}-{effective['width']}x{effective['height']}-{effective['fourcc'] or 'raw'}"
+
+
+def measure_frame(landmarks):
+    """
+    Geometry and ratios of one detection
+    landmarks: (33, 4) array of x, y, z, visibility
+    Returns: dict of floats
+    """
+    ratios = posture_scoring.posture_ratios(landmarks[None])
+    shoulders = landmarks[[posture_scoring.LEFT_SHOULDER, posture_scoring.RIGHT_SHOULDER]]
+    return {
+        'shoulder_width': float(ratios['shoulder_width'][0]),
+        'center_x': float(shoulders[:, 0].mean()),
+        'center_y': float(shoulders[:, 1].mean()),
+        'shoulder_hip': float(ratios['shoulder_hip'][0]),
+        'head_shoulder': float(ratios['head_shoulder'][0])
+    }
+
+
+def summarize(samples):
+    """
+    Median of each measurement over many frames
+    Returns: dict
+    """
+    return {key: float(np.median([s[key] for s in samples])) for key in samples[0]}
+
+
+def validate_profile(profile, samples):
+    """
+    Check whether a stored profile still fits what the camera sees now
+    Returns: (bool, str) - whether it fits, and why not
+    """
+    stored = profile['geometry']
+    current = summarize(samples)
+
+    scale = current['shoulder_width'] / stored['shoulder_width'] - 1
+    if abs(scale) > MAX_SCALE_CHANGE:
+        return False, f"shoulder width changed {scale:+.0%} (camera distance)"
+
+    shift = np.hypot(current['center_x'] - stored['center_x'], current['center_y'] - stored['center_y'])
+    if shift > MAX_SHIFT:
+        return False, f"shoulders moved {shift:.2f} in frame (camera or seat moved)"
+
+    for key, baseline in (('shoulder_hip', profile['baseline_shoulder_hip']),
+                          ('head_shoulder', profile['baseline_head_shoulder'])):
+        gain = current[key] / baseline - 1
+        if gain > MAX_RATIO_GAIN:
+            return False, f"{key} ratio {gain:+.0%} above baseline (camera angle changed)"
+
+    return True, 'ok'
+
+
+class CalibrationStore:
+    def __init__(self, path=PROFILE_PATH):
+        """JSON file of calibration profiles keyed by user and camera fingerprint"""
+        self.path = path
+
+    @staticmethod
+    def key(user, fingerprint):
+        return f"{user}|{fingerprint}"
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable calibration profiles ({e})")
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, profiles):
+        # Write-then-rename so a crash never leaves a half-written file
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def load(self, user, fingerprint):
+        """
+        Get the stored profile for a user on a camera
+        Returns: dict or None
+        """
+        profile = self._read().get(self.key(user, fingerprint))
+        if not profile or profile.get('version') != PROFILE_VERSION:
+            return None
+        return profile
+
+    def save(self, user, fingerprint, baseline_shoulder_hip, baseline_head_shoulder, geometry, head=None):
+        """Store (or replace) a profile"""
+        profiles = self._read()
+        profiles[self.key(user, fingerprint)] = {
+            'version': PROFILE_VERSION,
+            'user': user,
+            'camera': fingerprint,
+            'saved_at': time.time(),
+            'baseline_shoulder_hip': float(baseline_shoulder_hip),
+            'baseline_head_shoulder': float(baseline_head_shoulder),
+            'geometry': geometry,
+            'head': head
+        }
+        try:
+            self._write(profiles)
+        except OSError as e:
+            print(f"⚠️ Could not save calibration profile ({e})")
+
+    def remove(self, user, fingerprint):
+        profiles = self._read()
+        if profiles.pop(self.key(user, fingerprint), None) is not None:
+            self._write(profiles)
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("=" * 60)
+    print("CALIBRATION STORE - ROUND TRIP TEST")
+    print("=" * 60)
+
+    def person(shift=0.0, scale=1.0, slouch=0.0):
+        return posture_scoring.synthetic_pose(0.5 + shift, slouch=slouch, scale=scale)
+
+    path = os.path.join(tempfile.mkdtemp(), PROFILE_PATH)
+    store = CalibrationStore(path)
+    calibration = [measure_frame(person()) for _ in range(90)]
+    geometry = summarize(calibration)
+    store.save('dev', 'cam0-640x480-MJPG', geometry['shoulder_hip'], geometry['head_shoulder'], geometry)
+
+    profile = store.load('dev', 'cam0-640x480-MJPG')
+    print(f"Loaded:          {profile is not None} (other camera: {store.load('dev', 'cam1-1280x720-MJPG')})")
+
+    for label, frame in [
+        ("Same setup", person()),
+        ("Same setup, slouching", person(slouch=0.05)),
+        ("Moved closer", person(scale=1.4)),
+        ("Camera moved", person(shift=0.2))
+    ]:
+        ok, reason = validate_profile(profile, [measure_frame(frame)] * VALIDATION_FRAMES)
+        print(f"{label:<24} {'✅' if ok else '❌'} {reason}")
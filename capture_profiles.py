@@ -0,0 +1,163 @@
+"""
+Camera Capture Profiles for DevCare
+Negotiates resolution, frame rate, pixel format and buffering with the
+webcam instead of accepting driver defaults (often 720p/1080p YUYV), then
+reads back what the device actually accepted.
+
+Pose inference downsamples to ~256 px anyway, so 640x480 MJPG frames cost a
+fraction of the USB bandwidth and decode/convert CPU of 1080p YUYV without
+changing scores. CAP_PROP_BUFFERSIZE=1 keeps us reading the newest frame
+instead of a queue of stale ones.
+"""
+
+import time
+
+import cv2
+
+# name -> requested capture properties (None = leave the driver default)
+CAPTURE_PROFILES = {
+    'low': {'width': 424, 'height': 240, 'fps': 15, 'fourcc': 'MJPG'},
+    'balanced': {'width': 640, 'height': 480, 'fps': 30, 'fourcc': 'MJPG'},
+    'hd': {'width': 1280, 'height': 720, 'fps': 30, 'fourcc': 'MJPG'},
+    'driver': {'width': None, 'height': None, 'fps': None, 'fourcc': None}
+}
+DEFAULT_PROFILE = 'balanced'
+
+# Rough bytes per pixel on the wire
+WIRE_BYTES_PER_PIXEL = {
+    'YUYV': 2.0,
+    'YUY2': 2.0,
+    'MJPG': 0.2  # JPEG at webcam quality is roughly 10:1 against YUYV
+}
+
+
+def decode_fourcc(value):
+    """
+    Turn CAP_PROP_FOURCC's float into its four-letter code
+    Returns: str ('' if the backend doesn't report one)
+    """
+    code = int(value)
+    if code <= 0:
+        return ''
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ')
+
+
+def read_capture_properties(camera):
+    """
+    Read the properties the device is actually using
+    Returns: dict
+    """
+    return {
+        'width': int(camera.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(camera.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'fps': round(camera.get(cv2.CAP_PROP_FPS), 1),
+        'fourcc': decode_fourcc(camera.get(cv2.CAP_PROP_FOURCC)),
+        'buffersize': int(camera.get(cv2.CAP_PROP_BUFFERSIZE))
+    }
+
+
+def apply_capture_profile(camera, profile=DEFAULT_PROFILE):
+    """
+    Request a profile's properties, then verify what the device accepted
+    profile: name from CAPTURE_PROFILES or a dict with the same keys
+    Returns: dict - {'profile', 'requested', 'effective', 'rejected', 'cost'}
+    """
+    name = profile if isinstance(profile, str) else 'custom'
+    requested = CAPTURE_PROFILES[profile] if isinstance(profile, str) else profile
+
+    # Format first: on V4L2 the valid resolutions depend on it
+    if requested.get('fourcc'):
+        camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested['fourcc']))
+    if requested.get('width'):
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, requested['width'])
+    if requested.get('height'):
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, requested['height'])
+    if requested.get('fps'):
+        camera.set(cv2.CAP_PROP_FPS, requested['fps'])
+    camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    effective = read_capture_properties(camera)
+
+    rejected = []
+    for key in ('width', 'height', 'fourcc'):
+        if requested.get(key) and effective[key] and effective[key] != requested[key]:
+            rejected.append(key)
+    if requested.get('fps') and effective['fps'] and abs(effective['fps'] - requested['fps']) > 1:
+        rejected.append('fps')
+
+    return {
+        'profile': name,
+        'requested': dict(requested),
+        'effective': effective,
+        'rejected': rejected,
+        'cost': estimate_capture_cost(effective)
+    }
+
+
+def estimate_capture_cost(properties):
+    """
+    Estimate what a capture configuration costs per second
+    Returns: dict - wire bandwidth and decoded bytes per second
+    """
+    width, height = properties['width'], properties['height']
+    fps = properties['fps'] or 30
+    pixels = width * height
+    wire = WIRE_BYTES_PER_PIXEL.get(properties['fourcc'], 2.0)
+
+    return {
+        'megapixels_per_sec': round(pixels * fps / 1e6, 2),
+        'usb_mbytes_per_sec': round(pixels * wire * fps / 1e6, 2),
+        'decoded_mbytes_per_sec': round(pixels * 3 * fps / 1e6, 2)  # BGR frames handed to us
+    }
+
+
+def measure_read_cost(camera, frames=30):
+    """
+    Time camera.read() over a few frames (includes waiting for the device)
+    Returns: dict - {'frames', 'read_ms', 'fps'}
+    """
+    start = time.perf_counter()
+    read = 0
+    for _ in range(frames):
+        success, _ = camera.read()
+        if success:
+            read += 1
+    elapsed = time.perf_counter() - start
+    return {
+        'frames': read,
+        'read_ms': round(elapsed / max(read, 1) * 1000, 2),
+        'fps': round(read / elapsed, 1) if elapsed > 0 else 0.0
+    }
+
+
+def format_capture_report(report):
+    effective = report['effective']
+    cost = report['cost']
+    line = (f"{effective['width']}x{effective['height']} @ {effective['fps']} fps "
+            f"{effective['fourcc'] or '?'} (profile '{report['profile']}'), "
+            f"~{cost['usb_mbytes_per_sec']} MB/s over USB")
+    if report['rejected']:
+        line += f" - device ignored: {', '.join(report['rejected'])}"
+    return line
+
+
+# ==========================================
+# TEST MODE (needs a webcam)
+# ==========================================
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("CAPTURE PROFILES - DEVICE TEST")
+    print("=" * 60)
+
+    for profile in CAPTURE_PROFILES:
+        camera = cv2.VideoCapture(0)
+        if not camera.isOpened():
+            print("❌ Could not open webcam")
+            break
+
+        report = apply_capture_profile(camera, profile)
+        measured = measure_read_cost(camera)
+        print(f"📷 {format_capture_report(report)}")
+        print(f"   read: {measured['read_ms']} ms/frame, {measured['fps']} fps measured")
+        camera.release()
@@ -0,0 +1,73 @@
+"""
+Command Bus for DevCare
+Lets in-process UIs (dashboard, system tray) call the backend directly.
+
+devcareapp registers a handler for each command; when a handler is
+registered the call is a plain function call. Only when nothing is
+registered (the UI runs in another process) does the bus fall back to
+POSTing to the HTTP API.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+DEFAULT_BACKEND_URL = 'http://localhost:5000'
+
+# HTTP route for each command, used by out-of-process clients only
+COMMAND_ROUTES = {
+    'take_break': '/api/break',
+    'reset': '/api/reset'
+}
+
+
+class CommandBus:
+    def __init__(self, backend_url=DEFAULT_BACKEND_URL, timeout=1):
+        """
+        backend_url: where to send commands that have no local handler
+        timeout: HTTP timeout in seconds for the fallback
+        """
+        self.backend_url = backend_url
+        self.timeout = timeout
+        self._handlers = {}
+
+    def register(self, name, handler):
+        """Register the in-process handler for a command"""
+        self._handlers[name] = handler
+
+    def unregister(self, name):
+        self._handlers.pop(name, None)
+
+    def has_handler(self, name):
+        return name in self._handlers
+
+    def dispatch(self, name, **kwargs):
+        """
+        Run a command locally if possible, otherwise over HTTP
+        Returns: dict - {'success': bool, 'message': str, ...}
+        """
+        handler = self._handlers.get(name)
+        if handler is not None:
+            return handler(**kwargs)
+        return self._post(name, kwargs)
+
+    def _post(self, name, payload):
+        route = COMMAND_ROUTES.get(name)
+        if route is None:
+            return {'success': False, 'message': f"Unknown command: {name}"}
+
+        request = urllib.request.Request(
+            self.backend_url + route,
+            data=json.dumps(payload).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST'
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            return {'success': False, 'message': f"Backend unreachable: {e}"}
+
+
+# Shared bus for everything running in this process
+bus = CommandBus()
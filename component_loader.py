@@ -0,0 +1,120 @@
+"""
+Lazy Component Loader for DevCare
+Imports and constructs each monitoring component on its own background thread
+so the web server can start serving immediately
+"""
+
+import importlib
+import threading
+import time
+
+
+class LazyComponent:
+    def __init__(self, name, module_name, class_name, run_method=None, factory=None):
+        """
+        name: short component name used in /api/health ('posture', 'typing', ...)
+        module_name: module to import in the background (e.g. 'posture_detector')
+        class_name: class to construct from that module
+        run_method: optional method started on a daemon thread once constructed
+        factory: optional callable(cls) used instead of cls() to build the instance
+        """
+        self.name = name
+        self.module_name = module_name
+        self.class_name = class_name
+        self.run_method = run_method
+        self.factory = factory
+
+        self.instance = None
+        self.status = 'pending'
+        self.error = None
+        self.load_seconds = None
+
+        self._thread = None
+        self._ready = threading.Event()
+
+    def start(self):
+        """Begin importing and constructing the component (non-blocking)"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._load,
+                name=f"load-{self.name}",
+                daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _load(self):
+        self.status = 'loading'
+        start = time.perf_counter()
+
+        try:
+            module = importlib.import_module(self.module_name)
+            cls = getattr(module, self.class_name)
+            instance = self.factory(cls) if self.factory else cls()
+
+            if self.run_method:
+                threading.Thread(
+                    target=getattr(instance, self.run_method),
+                    name=self.name,
+                    daemon=True
+                ).start()
+
+        except ImportError as e:
+            self.status = 'missing'
+            self.error = str(e)
+            print(f"❌ {self.name}: NOT FOUND ({e})")
+
+        except Exception as e:
+            self.status = 'failed'
+            self.error = str(e)
+            print(f"❌ {self.name}: FAILED ({e})")
+
+        else:
+            self.instance = instance
+            self.status = 'ready'
+
+        finally:
+            self.load_seconds = time.perf_counter() - start
+            self._ready.set()
+
+        if self.status == 'ready':
+            print(f"✅ {self.name}: READY ({self.load_seconds:.2f}s)")
+
+    def provide(self, instance):
+        """Mark the component ready with an already-built instance (stubs, load tests)"""
+        self.instance = instance
+        self.status = 'ready'
+        self.error = None
+        self.load_seconds = 0.0
+        self._ready.set()
+        return self
+
+    @property
+    def ready(self):
+        return self.status == 'ready'
+
+    @property
+    def available(self):
+        """False once loading has failed (missing dependency or constructor error)"""
+        return self.status not in ('missing', 'failed')
+
+    def wait(self, timeout=None):
+        """
+        Block until loading has finished (successfully or not)
+        Returns: bool - True if the component is ready
+        """
+        self._ready.wait(timeout)
+        return self.ready
+
+    def describe(self):
+        """
+        Get readiness info for health reporting
+        Returns: dict
+        """
+        return {
+            'available': self.available,
+            'ready': self.ready,
+            'status': self.status,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'error': self.error
+        }
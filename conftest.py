@@ -0,0 +1,24 @@
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+
+class RecordingStore:
+    """Stands in for CalibrationStore and records every save"""
+
+    def __init__(self):
+        self.saved = []
+
+    def save(self, user, fingerprint, shoulder_hip, head_shoulder, geometry, head=None):
+        self.saved.append({'user': user, 'fingerprint': fingerprint, 'shoulder_hip': shoulder_hip,
+                           'head_shoulder': head_shoulder, 'geometry': geometry, 'head': head})
+
+    def load(self, user, fingerprint):
+        return None
+
+
+@pytest.fixture
+def calibration_store():
+    return RecordingStore()
@@ -3,122 +3,232 @@ DevCare Web Application
 Flask server that serves HTML frontend and provides API
 """
 
-from flask import Flask, jsonify, render_template, send_from_directory
+from flask import Flask, Response, g, jsonify, render_template, request, send_from_directory
 from flask_cors import CORS
+import argparse
+import json
 import threading
 import time
 import sys
 import os
 
-# Try to import other modules
+import metrics
+from command_bus import bus as commands
+from break_scheduler import BreakScheduler
+from component_loader import LazyComponent
+from state_store import VersionedState
+
+# Heavy modules (cv2, mediapipe, pynput) are imported on background threads
+# by the loaders below, so the web server can come up immediately
 print("=" * 60)
 print("DEVCARE - Starting Up")
 print("=" * 60)
 
-# Import Person 2's code
-try:
-    from posture_detector import PostureDetector
-    HAS_POSTURE = True
-    print("✅ Posture Detection: LOADED")
-except ImportError as e:
-    HAS_POSTURE = False
-    print(f"❌ Posture Detection: NOT FOUND ({e})")
-
-# Import Person 3's code
-try:
-    from typing_analyzer import TypingAnalyzer
-    HAS_TYPING = True
-    print("✅ Typing Analyzer: LOADED")
-except ImportError as e:
-    HAS_TYPING = False
-    print(f"❌ Typing Analyzer: NOT FOUND ({e})")
-
-try:
-    from break_manager import BreakManager
-    HAS_BREAKS = True
-    print("✅ Break Manager: LOADED")
-except ImportError as e:
-    HAS_BREAKS = False
-    print(f"❌ Break Manager: NOT FOUND ({e})")
-
-print("=" * 60)
-
 # Initialize Flask
 app = Flask(__name__,
             static_folder='static',
             template_folder='templates')
 CORS(app)
 
-# Global state dictionary
-state = {
+# Global state dictionary (versioned so UIs only redraw on change)
+state = VersionedState({
     'posture': 0,
+    'posture_mode': 'full_body',
+    'posture_people': [],
     'time': '0 min',
     'stress': 'Low',
     'breaks_taken': 0,
     'should_break': False,
+    'activity': 'active',
+    'next_break_in': 0,
     'typing_speed': 0,
     'status': 'Starting...'
+})
+
+# Seconds between keep-alive comments on idle /api/stream connections
+STREAM_KEEPALIVE = 15
+
+# Effective work time from typing/presence events (drives break suggestions)
+scheduler = BreakScheduler()
+
+# Optional SharedChannelWriter (--shared-channel) for local consumers
+channel = None
+
+# Optional TelemetryUploader (--collector) for fleet dashboards
+uploader = None
+
+# Webcam capture profile (--capture-profile); None keeps the detector's default
+capture_profile = None
+
+# Pose inference backend/model for the posture component (--pose-backend, --pose-model, --max-people)
+posture_options = {}
+
+def build_component(cls, **options):
+    """Construct a component and connect it to the scheduler and shared channel"""
+    component = cls(**options)
+    if hasattr(component, 'on_activity'):
+        component.on_activity = scheduler.on_activity
+    if hasattr(component, 'scheduler'):
+        component.scheduler = scheduler
+        scheduler.break_manager = component
+        scheduler.set_break_interval(component.break_interval * 60)
+    # Only the in-process detector has per-frame landmarks to publish
+    if channel and hasattr(component, 'channel'):
+        component.channel = channel
+    if capture_profile and hasattr(component, 'capture_profile'):
+        component.capture_profile = capture_profile
+    return component
+
+def build_posture(cls):
+    """Construct the posture component with the configured pose backend"""
+    return build_component(cls, **posture_options)
+
+# Monitoring components, each imported and constructed on its own thread
+components = {
+    'posture': LazyComponent('posture', 'posture_detector', 'PostureDetector', run_method='run',
+                             factory=build_posture),
+    'typing': LazyComponent('typing', 'typing_analyzer', 'TypingAnalyzer', run_method='run',
+                            factory=build_component),
+    'breaks': LazyComponent('breaks', 'break_manager', 'BreakManager', factory=build_component)
 }
 
-# Initialize components
-posture_detector = None
-typing_analyzer = None
-break_manager = None
+# ============================================
+# COMMANDS (shared by HTTP routes and in-process UIs)
+# ============================================
+
+def take_break_command():
+    """Record a break taken"""
+    break_manager = get_component('breaks')
+    if break_manager:
+        break_manager.take_break()
+        return {'success': True, 'message': 'Break recorded'}
+    return {'success': False, 'message': 'Break manager not available'}
+
+def reset_command():
+    """Reset all statistics"""
+    break_manager = get_component('breaks')
+    if break_manager:
+        break_manager.reset()
+    return {'success': True, 'message': 'Stats reset'}
+
+commands.register('take_break', take_break_command)
+commands.register('reset', reset_command)
+
+def get_component(name):
+    """
+    Get a component instance
+    Returns: the instance, or None while it is loading or unavailable
+    """
+    return components[name].instance
+
+# Internal metrics (see /metrics)
+STATE_LOOP_SECONDS = metrics.histogram(
+    'devcare_state_loop_seconds', 'Time spent in one update_state_loop iteration')
+HTTP_REQUESTS = metrics.counter(
+    'devcare_http_requests_total', 'HTTP requests handled per route',
+    labels=('route', 'method', 'status'))
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    'devcare_http_request_duration_seconds', 'HTTP request latency per route',
+    labels=('route', 'method'))
+metrics.gauge(
+    'devcare_typing_window_keys', 'Keystroke timestamps held in the 60 s window',
+    fn=lambda: len(get_component('typing').keys_last_minute) if get_component('typing') else 0)
+metrics.gauge(
+    'devcare_typing_window_backspaces', 'Backspace timestamps held in the 60 s window',
+    fn=lambda: len(get_component('typing').backspaces_last_minute) if get_component('typing') else 0)
+metrics.gauge(
+    'devcare_posture_score_history', 'Scores held in the posture smoothing window',
+    fn=lambda: len(get_component('posture').score_history) if get_component('posture') else 0)
+metrics.gauge(
+    'devcare_break_history', 'Breaks held in break history',
+    fn=lambda: len(get_component('breaks').break_history) if get_component('breaks') else 0)
 
 def initialize_components():
-    """Initialize all monitoring components"""
-    global posture_detector, typing_analyzer, break_manager
-
-    if HAS_POSTURE:
-        print("Initializing Posture Detector...")
-        posture_detector = PostureDetector()
-        threading.Thread(target=posture_detector.run, daemon=True).start()
-        print("✅ Posture detector running")
-
-    if HAS_TYPING:
-        print("Initializing Typing Analyzer...")
-        typing_analyzer = TypingAnalyzer()
-        threading.Thread(target=typing_analyzer.run, daemon=True).start()
-        print("✅ Typing analyzer running")
-
-    if HAS_BREAKS:
-        print("Initializing Break Manager...")
-        break_manager = BreakManager()
-        print("✅ Break manager ready")
+    """Start loading all monitoring components in parallel (non-blocking)"""
+    for component in components.values():
+        component.start()
+    scheduler.start()
 
 def update_state_loop():
     """Background thread that updates state from all components"""
     print("Starting state update loop...")
 
     while True:
+        loop_start = time.perf_counter()
         try:
+            posture_detector = get_component('posture')
+            typing_analyzer = get_component('typing')
+            break_manager = get_component('breaks')
+
             # Update posture
-            if HAS_POSTURE and posture_detector:
+            if posture_detector:
                 state['posture'] = posture_detector.get_score()
+                state['posture_mode'] = 'head' if posture_detector.head_mode else 'full_body'
+                state['posture_people'] = posture_detector.get_people()
 
             # Update typing & stress
-            if HAS_TYPING and typing_analyzer:
+            if typing_analyzer:
                 state['stress'] = typing_analyzer.get_stress_level()
                 state['typing_speed'] = typing_analyzer.get_typing_speed()
 
             # Update breaks
-            if HAS_BREAKS and break_manager:
+            if break_manager:
                 break_status = break_manager.get_status()
                 state['time'] = f"{break_status['time_working']} min"
                 state['breaks_taken'] = break_status['breaks_taken']
                 state['should_break'] = break_status['should_break']
+                state['activity'] = break_status.get('activity', 'active')
+                state['next_break_in'] = break_status.get('next_break_in_minutes', 0)
+
+            if channel:
+                channel.publish(
+                    posture=state['posture'],
+                    stress=state['stress'],
+                    typing_speed=state['typing_speed'],
+                    breaks_taken=state['breaks_taken'],
+                    time_working=break_status['time_working'] if break_manager else 0,
+                    should_break=state['should_break']
+                )
+
+            if uploader:
+                uploader.record(state)
 
             # Update overall status
             if state['posture'] > 0:
                 state['status'] = 'Running'
+            elif components['posture'].status in ('pending', 'loading'):
+                state['status'] = 'Loading posture detector...'
             else:
                 state['status'] = 'Waiting for webcam...'
 
         except Exception as e:
             print(f"Error updating state: {e}")
 
+        STATE_LOOP_SECONDS.observe(time.perf_counter() - loop_start)
         time.sleep(1)
 
+# ============================================
+# REQUEST METRICS
+# ============================================
+
+@app.before_request
+def start_request_timer():
+    """Remember when the request started"""
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and record its latency per route"""
+    start = g.pop('request_start', None)
+    if start is not None:
+        # Use the route pattern, not the raw path, to keep label sets bounded
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.labels(route, request.method, response.status_code).inc()
+        HTTP_REQUEST_SECONDS.labels(route, request.method).observe(
+            time.perf_counter() - start
+        )
+    return response
+
 # ============================================
 # WEB ROUTES (Serve HTML pages)
 # ============================================
@@ -137,10 +247,11 @@ def serve_static(path):
 # HTTP API ENDPOINTS
 # ============================================
 
-@app.route('/api/status', methods=['GET'])
-def get_status():
-    """API endpoint for getting current status"""
-
+def build_status():
+    """
+    Build the /api/status payload from the global state
+    Returns: dict
+    """
     posture_score = state.get('posture', 0)
     typing_speed = state.get('typing_speed', 0)
     breaks_taken = state.get('breaks_taken', 0)
@@ -154,7 +265,9 @@ def get_status():
         "posture": {
             "score": posture_score,
             "status": "Good posture" if posture_score >= 70 else "Needs improvement",
-            "color": "green" if posture_score >= 70 else "orange"
+            "color": "green" if posture_score >= 70 else "orange",
+            "mode": state.get('posture_mode', 'full_body'),
+            "people": state.get('posture_people', [])
         },
         "typing": {
             "speed": typing_speed
@@ -162,39 +275,62 @@ def get_status():
         "breaks": {
             "taken": breaks_taken,
             "should_break": should_break,
-            "time": session_time
+            "time": session_time,
+            "activity": state.get('activity', 'active'),
+            "next_break_in": state.get('next_break_in', 0)
         },
         "stress": stress_level
     }
 
-    return jsonify(response)
+    return response
+
+@app.route('/api/status', methods=['GET'])
+def get_status():
+    """API endpoint for getting current status"""
+    return jsonify(build_status())
+
+@app.route('/api/stream', methods=['GET'])
+def stream_status():
+    """Server-sent events: pushes the /api/status payload whenever the state changes"""
+    def events():
+        version = None
+        while True:
+            new_version = state.wait_for_change(version, timeout=STREAM_KEEPALIVE)
+            if new_version == version:
+                yield ": keep-alive\n\n"
+                continue
+            version = new_version
+            yield f"data: {json.dumps(build_status())}\n\n"
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    health = {
         'status': 'ok',
-        'components': {
-            'posture': HAS_POSTURE,
-            'typing': HAS_TYPING,
-            'breaks': HAS_BREAKS
-        }
-    })
+        'ready': all(c.ready for c in components.values()),
+        'components': {name: c.describe() for name, c in components.items()}
+    }
+    if uploader:
+        health['telemetry'] = uploader.get_status()
+    return jsonify(health)
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 @app.route('/api/break', methods=['POST'])
 def record_break():
     """Record a break taken"""
-    if HAS_BREAKS and break_manager:
-        break_manager.take_break()
-        return jsonify({'success': True, 'message': 'Break recorded'})
-    return jsonify({'success': False, 'message': 'Break manager not available'})
+    return jsonify(commands.dispatch('take_break'))
 
 @app.route('/api/reset', methods=['POST'])
 def reset_stats():
     """Reset all statistics"""
-    if HAS_BREAKS and break_manager:
-        break_manager.reset()
-    return jsonify({'success': True, 'message': 'Stats reset'})
+    return jsonify(commands.dispatch('reset'))
 
 # ============================================
 # STARTUP
@@ -211,17 +347,68 @@ def print_startup_banner():
     print("                                        ")
     print("=" * 60)
     print("\n🚀 Starting DevCare Web Application...")
-    print("\n📊 Component Status:")
-    print(f"   Posture Detection: {'✅ ACTIVE' if HAS_POSTURE else '❌ MISSING'}")
-    print(f"   Typing Analysis:   {'✅ ACTIVE' if HAS_TYPING else '❌ MISSING'}")
-    print(f"   Break Management:  {'✅ ACTIVE' if HAS_BREAKS else '❌ MISSING'}")
+    print("\n📊 Components load in the background - see /api/health for readiness")
     print("\n🌐 Web App: http://localhost:5000")
     print("📡 API: http://localhost:5000/api/status")
+    print("📈 Metrics: http://localhost:5000/metrics")
     print("\n" + "=" * 60)
     print("Open your browser and go to: http://localhost:5000")
     print("Press Ctrl+C to stop\n")
 
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='DevCare Web Application')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='time imports, constructors, camera open and first inference, then exit')
+    parser.add_argument('--profile-output', default='startup_profile.json',
+                        help="where to write the JSON startup profile ('-' for stdout)")
+    parser.add_argument('--startup-budget', type=float, default=None,
+                        help='exit non-zero if the profiled startup exceeds this many seconds')
+    parser.add_argument('--posture-process', action='store_true',
+                        help='run posture inference in a separate, supervised worker process')
+    parser.add_argument('--shared-channel', nargs='?', const='devcare', default=None, metavar='NAME',
+                        help='publish scores and landmarks to a shared-memory channel (default name: devcare)')
+    parser.add_argument('--capture-profile', default=None,
+                        choices=('low', 'balanced', 'hd', 'driver'),
+                        help="webcam resolution/fps/format to negotiate (default: balanced, 640x480 MJPG)")
+    parser.add_argument('--pose-backend', default=None, choices=('solutions', 'tasks'),
+                        help="pose inference API: 'solutions' (default) or 'tasks' (pipelined, needs a downloaded model)")
+    parser.add_argument('--pose-model', default=None, choices=('lite', 'full', 'heavy'),
+                        help='pose model size (default: full)')
+    parser.add_argument('--max-people', type=int, default=1, metavar='N',
+                        help='score up to N people sharing the desk (needs --pose-backend tasks)')
+    parser.add_argument('--collector', default=None, metavar='URL',
+                        help='upload batched telemetry to a fleet collector (see fleet_collector.py)')
+    parser.add_argument('--team', default='default', help='team name reported to the fleet collector')
+    parser.add_argument('--agent-id', default=None, help='agent name reported to the fleet collector')
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
+    args = parse_args()
+
+    if args.profile_startup:
+        from startup_profiler import run_profile
+        sys.exit(run_profile(args.profile_output, args.startup_budget))
+
+    capture_profile = args.capture_profile
+    posture_options = {'pose_backend': args.pose_backend, 'pose_model': args.pose_model,
+                       'max_people': args.max_people}
+
+    if args.posture_process:
+        # Keep MediaPipe off this process's GIL; scores arrive over a pipe
+        components['posture'] = LazyComponent('posture', 'posture_worker', 'PostureProcess', run_method='run',
+                                              factory=build_posture)
+
+    if args.shared_channel:
+        from shared_channel import SharedChannelWriter
+
+        channel = SharedChannelWriter(args.shared_channel)
+
+    if args.collector:
+        from telemetry_uploader import TelemetryUploader
+
+        uploader = TelemetryUploader(args.collector, agent_id=args.agent_id, team=args.team).start()
+
     # Print banner
     print_startup_banner()
 
@@ -230,15 +417,12 @@ if __name__ == '__main__':
     os.makedirs('static/css', exist_ok=True)
     os.makedirs('static/js', exist_ok=True)
 
-    # Initialize all components
+    # Start loading all components in parallel (returns immediately)
     initialize_components()
 
     # Start background state updater
     threading.Thread(target=update_state_loop, daemon=True).start()
 
-    # Give components 2 seconds to initialize
-    time.sleep(2)
-
     # Start Flask server
     try:
         app.run(
@@ -250,4 +434,9 @@ if __name__ == '__main__':
     except KeyboardInterrupt:
         print("\n\n👋 Shutting down DevCare...")
         print("Goodbye!\n")
-        sys.exit(0)
\ No newline at end of file
+        sys.exit(0)
+    finally:
+        if uploader:
+            uploader.stop()
+        if channel:
+            channel.close()
\ No newline at end of file
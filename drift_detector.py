@@ -0,0 +1,264 @@
+"""
+Baseline Drift Detector for DevCare
+Notices when the calibration baselines stop fitting (chair or camera moved)
+and re-baselines without a manual reset.
+
+Each posture ratio from calculate_posture_score (shoulder-hip,
+head-shoulder) is fed, relative to its baseline, into a two-sided
+Page-Hinkley test: a running mean and two cumulative sums, O(1) memory per
+signal. An alarm alone doesn't mean drift - slouching moves the ratios too -
+so an alarmed signal is held as pending until its moving average has settled
+on the new level, and the baseline is only replaced if the shift can't be
+posture:
+
+- the ratio settled above its baseline (straighter than the calibrated
+  "good" posture, which the baseline was supposed to be), or
+- the whole body moved in the frame the way a camera move moves it: hips
+  and shoulders shifted together, or both changed size. Slouching can slide
+  the hips down the chair too, but then the shoulders drop much further
+  than the hips, so a lower level is never adopted on hip movement alone.
+
+Otherwise the alarm was posture and is dropped.
+"""
+
+import math
+
+# Page-Hinkley on relative deviation from the baseline
+DEFAULT_DELTA = 0.02        # deviations smaller than this are ignored
+DEFAULT_THRESHOLD = 3.0     # cumulative deviation that raises an alarm
+SMOOTHING = 0.05            # EWMA weight of each new sample (~20 frame time constant)
+WARMUP_FRAMES = 30          # no alarms (and the hip reference keeps moving) until averages settle
+SETTLE_FRAMES = 60          # frames after an alarm before the new level is trusted (3 time constants)
+
+REBASE_MARGIN = 0.08        # ratio level this far above baseline is drift, not posture
+MIN_SHIFT = 0.03            # smaller settled shifts are left alone even if the setup moved
+MAX_SCALE_CHANGE = 0.20     # hip width change (fraction) that means the setup moved
+MAX_SHIFT = 0.06            # hip centre movement (normalized units) that means the setup moved
+BODY_SHIFT_TOLERANCE = 0.5  # shoulders may move this fraction of the hip shift apart from them in a camera move
+
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_HIP, RIGHT_HIP = 23, 24
+
+
+class PageHinkley:
+    __slots__ = ('delta', 'threshold', 'n', 'mean', 'up', 'up_min', 'down', 'down_max')
+
+    def __init__(self, delta=DEFAULT_DELTA, threshold=DEFAULT_THRESHOLD):
+        """Two-sided Page-Hinkley change detector"""
+        self.delta = delta
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.mean = 0.0
+        self.up = self.up_min = 0.0
+        self.down = self.down_max = 0.0
+
+    def update(self, x):
+        """
+        Add a sample
+        Returns: int - 1 if the mean shifted up, -1 if down, 0 otherwise
+        """
+        self.n += 1
+        self.mean += (x - self.mean) / self.n
+
+        self.up += x - self.mean - self.delta
+        self.up_min = min(self.up_min, self.up)
+        self.down += x - self.mean + self.delta
+        self.down_max = max(self.down_max, self.down)
+
+        if self.up - self.up_min > self.threshold:
+            return 1
+        if self.down_max - self.down > self.threshold:
+            return -1
+        return 0
+
+
+def _pair_geometry(landmarks, left, right):
+    lx, ly = landmarks[left, 0], landmarks[left, 1]
+    rx, ry = landmarks[right, 0], landmarks[right, 1]
+    return float(math.hypot(lx - rx, ly - ry)), float((lx + rx) / 2), float((ly + ry) / 2)
+
+
+def body_geometry(landmarks):
+    """
+    Hip and shoulder width and centre of a (33, 4) landmark array
+    Returns: (hip_width, hip_x, hip_y, shoulder_width, shoulder_x, shoulder_y)
+    """
+    return (_pair_geometry(landmarks, LEFT_HIP, RIGHT_HIP) +
+            _pair_geometry(landmarks, LEFT_SHOULDER, RIGHT_SHOULDER))
+
+
+class DriftDetector:
+    SIGNALS = ('shoulder_hip', 'head_shoulder')
+
+    def __init__(self, delta=DEFAULT_DELTA, threshold=DEFAULT_THRESHOLD, smoothing=SMOOTHING):
+        """Watches the posture ratios for baseline drift (call start() once calibrated)"""
+        self.smoothing = smoothing
+        self.tests = {name: PageHinkley(delta, threshold) for name in self.SIGNALS}
+        self.baselines = {}
+        self.levels = {}        # EWMA of each ratio
+        self.pending = {}       # frames since an unresolved alarm (0 = none)
+        self.geometry = None    # EWMA of body_geometry
+        self.reference = None   # the same for the current setup
+        self.moved_frames = 0   # frames the setup has looked moved with nothing pending
+        self.active = False
+        self.frames = 0
+        self.alarms = 0
+        self.rebaselines = 0
+
+    def start(self, baselines):
+        """
+        Begin watching against fresh baselines
+        baselines: {'shoulder_hip': float, 'head_shoulder': float}
+        """
+        self.baselines = {name: float(value) for name, value in baselines.items()}
+        self.levels = dict(self.baselines)
+        self.pending = dict.fromkeys(self.SIGNALS, 0)
+        self.geometry = self.reference = None
+        self.moved_frames = 0
+        for test in self.tests.values():
+            test.reset()
+        self.frames = 0
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def setup_moved(self):
+        """Whether the hips moved or changed size (seat or camera moved, or the user shifted)"""
+        width, x, y = self.geometry[:3]
+        ref_width, ref_x, ref_y = self.reference[:3]
+        return (abs(width / ref_width - 1) > MAX_SCALE_CHANGE or
+                math.hypot(x - ref_x, y - ref_y) > MAX_SHIFT)
+
+    def camera_moved(self):
+        """
+        Whether hips and shoulders moved together, as they do when the camera moves
+        Returns: bool - False for a slouch that only slid the hips down the chair
+        """
+        hip_w, hip_x, hip_y, shoulder_w, shoulder_x, shoulder_y = self.geometry
+        ref_hip_w, ref_hip_x, ref_hip_y, ref_shoulder_w, ref_shoulder_x, ref_shoulder_y = self.reference
+
+        hip_scale = hip_w / ref_hip_w - 1
+        shoulder_scale = shoulder_w / ref_shoulder_w - 1
+        if (abs(hip_scale) > MAX_SCALE_CHANGE and abs(shoulder_scale) > MAX_SCALE_CHANGE and
+                hip_scale * shoulder_scale > 0):
+            return True  # camera moved closer or further away
+
+        hip_dx, hip_dy = hip_x - ref_hip_x, hip_y - ref_hip_y
+        hip_shift = math.hypot(hip_dx, hip_dy)
+        apart = math.hypot(shoulder_x - ref_shoulder_x - hip_dx, shoulder_y - ref_shoulder_y - hip_dy)
+        return hip_shift > MAX_SHIFT and apart <= BODY_SHIFT_TOLERANCE * hip_shift
+
+    def update(self, ratios, geometry):
+        """
+        Add one detection
+        ratios: (shoulder_hip, head_shoulder) from calculate_posture_score
+        geometry: body_geometry of the same frame
+        Returns: dict of replaced baselines ({} if none changed)
+        """
+        if not self.active:
+            return {}
+
+        a = self.smoothing
+        self.frames += 1
+        if self.geometry is None:
+            self.geometry = geometry
+        else:
+            self.geometry = tuple(g + a * (v - g) for g, v in zip(self.geometry, geometry))
+        if self.frames <= WARMUP_FRAMES:
+            self.reference = self.geometry
+
+        changed = {}
+        for name, value in zip(self.SIGNALS, ratios):
+            level = self.levels[name] = self.levels[name] + a * (value - self.levels[name])
+            baseline = self.baselines[name]
+            shifted = self.tests[name].update(value / baseline - 1)
+
+            if not self.pending[name]:
+                if shifted and self.frames > WARMUP_FRAMES:
+                    self.alarms += 1
+                    self.pending[name] = 1
+                    self.tests[name].reset()
+                continue
+
+            self.pending[name] += 1
+            if self.pending[name] < SETTLE_FRAMES:
+                continue
+
+            self.pending[name] = 0
+            deviation = level / baseline - 1
+            # Lower levels look like slouching unless the camera visibly moved
+            if deviation > REBASE_MARGIN or (abs(deviation) > MIN_SHIFT and self.camera_moved()):
+                self.baselines[name] = changed[name] = level
+                self.tests[name].reset()
+
+        if changed:
+            self.rebaselines += 1
+
+        # Adopt the new setup once nothing is waiting on the old reference
+        if self.frames > WARMUP_FRAMES and not any(self.pending.values()):
+            if changed:
+                self.reference = self.geometry
+                self.moved_frames = 0
+            elif self.setup_moved():
+                self.moved_frames += 1
+                if self.moved_frames >= SETTLE_FRAMES:
+                    self.reference = self.geometry  # moved without changing the ratios
+                    self.moved_frames = 0
+            else:
+                self.moved_frames = 0
+        return changed
+
+    def describe(self):
+        return {
+            'active': self.active,
+            'frames': self.frames,
+            'alarms': self.alarms,
+            'rebaselines': self.rebaselines,
+            'pending': [name for name, age in self.pending.items() if age],
+            'levels': {name: round(level / self.baselines[name], 3) for name, level in self.levels.items()}
+            if self.active else {}
+        }
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import random
+
+    print("=" * 60)
+    print("DRIFT DETECTOR - SIMULATION")
+    print("=" * 60)
+
+    random.seed(0)
+    detector = DriftDetector()
+    detector.start({'shoulder_hip': 1.40, 'head_shoulder': 0.75})
+
+    def simulate(label, seconds, shoulder_hip, head_shoulder, hip_y=0.85):
+        changes = []
+        for frame in range(int(seconds * 10)):  # 10 inferences per second
+            ratio = shoulder_hip * (1 + random.gauss(0, 0.03))
+            y = hip_y + random.gauss(0, 0.01)
+            changed = detector.update(
+                (ratio, head_shoulder * (1 + random.gauss(0, 0.03))),
+                (0.16, 0.5, y, 0.25, 0.5, y - ratio * 0.25))
+            if changed:
+                changes.append(f"{frame / 10:.1f}s {', '.join(f'{k}={v:.2f}' for k, v in changed.items())}")
+        print(f"{label:<38} alarms={detector.alarms:<3} rebaselines={detector.rebaselines}")
+        for change in changes:
+            print(f"    ↳ re-baselined at {change}")
+
+    simulate("60 s upright", 60, 1.40, 0.75)
+    simulate("30 s slouching (not drift)", 30, 1.15, 0.55)
+    simulate("30 s upright again", 30, 1.40, 0.75)
+    simulate("slouching, hips slid down (not drift)", 30, 1.15, 0.55, hip_y=0.92)
+    simulate("upright again", 30, 1.40, 0.75)
+    simulate("camera raised (drift)", 60, 1.25, 0.66, hip_y=0.95)
+    simulate("slouching in the new setup", 30, 1.05, 0.50, hip_y=0.95)
+    simulate("sitting straighter than baseline", 60, 1.40, 0.75, hip_y=0.95)
+    print(f"Final baselines: { {k: round(v, 2) for k, v in detector.baselines.items()} }")
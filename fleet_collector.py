@@ -0,0 +1,571 @@
+"""
+DevCare Fleet Collector
+Central server that ingests batched, compressed metric uploads from many
+DevCare agents and serves team-level wellbeing aggregates.
+
+- POST /ingest accepts a gzip-compressed JSON batch or a binary frame from
+  telemetry_uploader.py and only enqueues it;
+  a writer thread stores batches in SQLite. When the queue is full the
+  collector answers 429 with Retry-After so agents back off.
+- Samples are stored in one table per UTC day (samples_YYYYMMDD), so
+  queries only touch the days they cover and old days can be dropped whole.
+- GET /api/teams/<team>/summary returns posture distributions, break
+  compliance and a stress heatmap.
+
+Usage:
+    python fleet_collector.py --port 6000 --db fleet.db
+    python fleet_collector.py --simulate 200 --url http://localhost:6000
+"""
+
+import argparse
+import gzip
+import json
+import math
+import queue
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, Response, jsonify, request
+
+import metrics
+from telemetry_uploader import FRAME_CONTENT_TYPE, decode_frame, decompress_limited
+
+STRESS_LEVELS = ('Low', 'Medium', 'High')
+STRESS_CODES = {level: code for code, level in enumerate(STRESS_LEVELS)}
+
+DEFAULT_QUEUE_SIZE = 1000      # batches waiting to be written
+WRITE_BATCH = 50               # batches committed per transaction
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_DECODED_BYTES = 16 * 1024 * 1024   # a compressed body may inflate to at most this
+MAX_SAMPLE_AGE = 366 * 86400           # spooled samples can be old, but not older than this
+MAX_CLOCK_SKEW = 86400                 # or this far in the future
+MAX_QUERY_SPAN = 366 * 86400           # longest summary window
+MAX_COUNT = 0xFFFF                     # typing speed / breaks taken (uint16, like the frame codec)
+POSTURE_BINS = 10              # 0-9, 10-19, ... 90-100
+
+BATCHES_ACCEPTED = metrics.counter(
+    'devcare_fleet_batches_accepted_total', 'Upload batches accepted for writing')
+BATCHES_REJECTED = metrics.counter(
+    'devcare_fleet_batches_rejected_total', 'Upload batches rejected', labels=('reason',))
+SAMPLES_WRITTEN = metrics.counter(
+    'devcare_fleet_samples_written_total', 'Samples stored')
+WRITE_SECONDS = metrics.histogram(
+    'devcare_fleet_write_seconds', 'Time to commit one group of batches')
+
+_TEAM_PATTERN = re.compile(r'^[\w.-]{1,64}$')
+
+
+def partition_name(timestamp):
+    """
+    Get the table holding samples for a timestamp
+    Returns: str - e.g. 'samples_20260219'
+    """
+    return 'samples_' + datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y%m%d')
+
+
+class FleetStore:
+    def __init__(self, path):
+        """
+        path: SQLite database file (':memory:' is not supported - readers
+        and the writer need separate connections)
+        """
+        self.path = path
+        self._known_partitions = set()
+
+        conn = self.connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS agents (
+                agent_id TEXT PRIMARY KEY,
+                team TEXT NOT NULL,
+                last_seen REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def forget_partitions(self):
+        """Re-check partition tables on next use (after a rolled-back write)"""
+        self._known_partitions.clear()
+
+    def _ensure_partition(self, conn, table):
+        if table in self._known_partitions:
+            return
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                agent_id TEXT NOT NULL,
+                team TEXT NOT NULL,
+                ts REAL NOT NULL,
+                posture INTEGER NOT NULL,
+                stress INTEGER NOT NULL,
+                typing_speed INTEGER NOT NULL,
+                breaks_taken INTEGER NOT NULL,
+                should_break INTEGER NOT NULL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_team_ts ON {table} (team, ts)")
+        self._known_partitions.add(table)
+
+    def write_batches(self, conn, batches):
+        """
+        Store decoded batches in one transaction (writer thread only)
+        Returns: int - samples written
+        """
+        rows_by_table = {}
+        agents = {}
+        for batch in batches:
+            agent_id, team = batch['agent_id'], batch['team']
+            for s in batch['samples']:
+                rows_by_table.setdefault(partition_name(s['ts']), []).append((
+                    agent_id, team, s['ts'], s['posture'], s['stress'],
+                    s['typing_speed'], s['breaks_taken'], s['should_break']
+                ))
+            if batch['samples']:
+                agents[agent_id] = (agent_id, team, batch['samples'][-1]['ts'])
+
+        written = 0
+        with conn:
+            for table, rows in rows_by_table.items():
+                self._ensure_partition(conn, table)
+                conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                written += len(rows)
+            conn.executemany("""
+                INSERT INTO agents VALUES (?, ?, ?)
+                ON CONFLICT(agent_id) DO UPDATE SET team = excluded.team,
+                    last_seen = MAX(last_seen, excluded.last_seen)
+            """, list(agents.values()))
+        return written
+
+    def partitions_between(self, conn, start, end):
+        """Existing partition tables that can hold samples in [start, end]"""
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'samples_%'"
+        )}
+        tables = []
+        day = datetime.fromtimestamp(start, timezone.utc).date()
+        last = datetime.fromtimestamp(end, timezone.utc).date()
+        while day <= last:
+            table = 'samples_' + day.strftime('%Y%m%d')
+            if table in existing:
+                tables.append(table)
+            day += timedelta(days=1)
+        return tables
+
+    def teams(self):
+        conn = self.connect()
+        try:
+            return [
+                {'team': team, 'agents': agents}
+                for team, agents in conn.execute(
+                    "SELECT team, COUNT(*) FROM agents GROUP BY team ORDER BY team"
+                )
+            ]
+        finally:
+            conn.close()
+
+    def team_summary(self, team, start, end):
+        """
+        Aggregate one team's samples in [start, end]
+        Returns: dict with posture distribution, break compliance and stress heatmap
+        """
+        conn = self.connect()
+        try:
+            tables = self.partitions_between(conn, start, end)
+            posture_bins = [0] * POSTURE_BINS
+            heatmap = {level: [0] * 24 for level in STRESS_LEVELS}
+            per_agent = {}
+            samples = 0
+
+            for table in tables:
+                params = (team, start, end)
+                for bin_index, count in conn.execute(f"""
+                    SELECT MIN(posture / 10, {POSTURE_BINS - 1}), COUNT(*) FROM {table}
+                    WHERE team = ? AND ts BETWEEN ? AND ? AND posture > 0
+                    GROUP BY 1
+                """, params):
+                    posture_bins[bin_index] += count
+
+                for hour, stress, count in conn.execute(f"""
+                    SELECT CAST(strftime('%H', ts, 'unixepoch') AS INTEGER), stress, COUNT(*)
+                    FROM {table} WHERE team = ? AND ts BETWEEN ? AND ?
+                    GROUP BY 1, 2
+                """, params):
+                    if 0 <= stress < len(STRESS_LEVELS):
+                        heatmap[STRESS_LEVELS[stress]][hour] += count
+
+                for agent_id, total, overdue in conn.execute(f"""
+                    SELECT agent_id, COUNT(*), SUM(should_break)
+                    FROM {table} WHERE team = ? AND ts BETWEEN ? AND ?
+                    GROUP BY agent_id
+                """, params):
+                    agent = per_agent.setdefault(agent_id, [0, 0])
+                    agent[0] += total
+                    agent[1] += overdue
+                    samples += total
+
+            # Compliance: share of each agent's samples where no break was overdue
+            compliance = [1 - overdue / total for total, overdue in per_agent.values() if total]
+
+            return {
+                'team': team,
+                'from': start,
+                'to': end,
+                'agents': len(per_agent),
+                'samples': samples,
+                'posture_distribution': {
+                    f"{i * 10}-{i * 10 + 9 if i < POSTURE_BINS - 1 else 100}": count
+                    for i, count in enumerate(posture_bins)
+                },
+                'break_compliance': {
+                    'mean': round(sum(compliance) / len(compliance), 3) if compliance else None,
+                    'min': round(min(compliance), 3) if compliance else None,
+                    'agents_fully_compliant': sum(1 for c in compliance if c >= 0.999)
+                },
+                'stress_heatmap': {
+                    'hours_utc': list(range(24)),
+                    'counts': heatmap
+                }
+            }
+        finally:
+            conn.close()
+
+
+class FleetCollector:
+    def __init__(self, store, queue_size=DEFAULT_QUEUE_SIZE):
+        """
+        store: FleetStore to write to
+        queue_size: batches held in memory before ingest answers 429
+        """
+        self.store = store
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.running = False
+        self._thread = None
+
+        metrics.gauge('devcare_fleet_queue_depth', 'Batches waiting to be written',
+                      fn=self.queue.qsize)
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._writer_loop, name='fleet-writer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def submit(self, batch):
+        """
+        Queue a decoded batch for writing
+        Returns: bool - False if the queue is full (caller should send 429)
+        """
+        try:
+            self.queue.put_nowait(batch)
+        except queue.Full:
+            BATCHES_REJECTED.labels('backpressure').inc()
+            return False
+        BATCHES_ACCEPTED.inc()
+        return True
+
+    def _writer_loop(self):
+        conn = self.store.connect()
+        try:
+            while self.running or not self.queue.empty():
+                try:
+                    batches = [self.queue.get(timeout=0.5)]
+                except queue.Empty:
+                    continue
+                while len(batches) < WRITE_BATCH:
+                    try:
+                        batches.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                start = time.perf_counter()
+                self._write(conn, batches)
+                WRITE_SECONDS.observe(time.perf_counter() - start)
+        finally:
+            conn.close()
+
+    def _write(self, conn, batches):
+        """Store a group of batches; if the group fails, store them one by one and drop the bad ones"""
+        try:
+            SAMPLES_WRITTEN.inc(self.store.write_batches(conn, batches))
+            return
+        except Exception as e:
+            # Never let one bad batch kill the writer - ingest would answer 429 forever
+            self.store.forget_partitions()  # tables created in the rolled-back transaction are gone
+            if len(batches) == 1:
+                BATCHES_REJECTED.labels('write_failed').inc()
+                print(f"❌ Could not store batch from {batches[0].get('agent_id')}: {e!r}")
+                return
+            print(f"⚠️ Could not store {len(batches)} batches ({e!r}), retrying one by one")
+
+        for batch in batches:
+            self._write(conn, [batch])
+
+    def flush(self, timeout=10):
+        """Wait until every queued batch has been picked up by the writer"""
+        deadline = time.time() + timeout
+        while not self.queue.empty() and time.time() < deadline:
+            time.sleep(0.05)
+
+
+def check_timestamp(ts, now=None):
+    """
+    Reject timestamps the partitioning can't place (NaN, inf, year 5000...)
+    Returns: float
+    Raises: ValueError if ts is not finite or outside the accepted window
+    """
+    ts = float(ts)
+    now = now or time.time()
+    if not math.isfinite(ts) or not now - MAX_SAMPLE_AGE <= ts <= now + MAX_CLOCK_SKEW:
+        raise ValueError(f"sample timestamp out of range: {ts!r}")
+    return ts
+
+
+def clean_sample(s, now=None):
+    """
+    Normalize one decoded sample into storable ranges
+    Returns: dict
+    Raises: ValueError for a bad timestamp or non-numeric fields
+    """
+    stress = s.get('stress', 0)
+    stress = STRESS_CODES.get(stress, 0) if isinstance(stress, str) else int(stress)
+    return {
+        'ts': check_timestamp(s['ts'], now),
+        'posture': max(0, min(100, int(s.get('posture', 0)))),
+        'stress': max(0, min(len(STRESS_LEVELS) - 1, stress)),
+        'typing_speed': max(0, min(MAX_COUNT, int(s.get('typing_speed', 0)))),
+        'breaks_taken': max(0, min(MAX_COUNT, int(s.get('breaks_taken', 0)))),
+        'should_break': 1 if s.get('should_break') else 0
+    }
+
+
+def decode_upload(body, content_encoding, content_type=''):
+    """
+    Decode and validate one upload body (gzip JSON batch or binary telemetry frame)
+    Returns: dict - {'agent_id', 'team', 'samples': [...]}
+    Raises: ValueError if the body is malformed
+    """
+    if content_type.startswith(FRAME_CONTENT_TYPE):
+        payload = decode_frame(body, max_size=MAX_DECODED_BYTES)
+        agent_id, team, samples = payload['agent_id'], payload['team'], payload['samples']
+    else:
+        if content_encoding == 'gzip':
+            body = decompress_limited(body, MAX_DECODED_BYTES, 16 + zlib.MAX_WBITS)
+        elif content_encoding == 'deflate':
+            body = decompress_limited(body, MAX_DECODED_BYTES)
+
+        payload = json.loads(body)
+        agent_id = str(payload['agent_id'])
+        team = str(payload.get('team') or 'default')
+        samples = payload['samples']
+
+    if not _TEAM_PATTERN.match(team):
+        raise ValueError(f"invalid team name: {team!r}")
+
+    now = time.time()
+    return {'agent_id': agent_id[:128], 'team': team, 'samples': [clean_sample(s, now) for s in samples]}
+
+
+def parse_window(args, now=None):
+    """
+    Read the summary window from ?hours=, ?from= and ?to=
+    Returns: (start, end)
+    Raises: ValueError if the window is not finite, inverted or too long
+    """
+    now = now or time.time()
+    hours = args.get('hours', default=24, type=float)
+    end = args.get('to', default=now, type=float)
+    start = args.get('from', default=end - hours * 3600, type=float)
+
+    if not (math.isfinite(start) and math.isfinite(end)):
+        raise ValueError('from/to must be finite timestamps')
+    if not 0 <= start <= end <= now + MAX_CLOCK_SKEW:
+        raise ValueError('need 0 <= from <= to <= now')
+    if end - start > MAX_QUERY_SPAN:
+        raise ValueError(f"window longer than {MAX_QUERY_SPAN // 86400} days")
+    return start, end
+
+
+def create_app(collector):
+    """Build the collector's Flask app"""
+    app = Flask(__name__)
+    app.config['MAX_CONTENT_LENGTH'] = MAX_BODY_BYTES  # also bounds chunked uploads
+
+    @app.route('/ingest', methods=['POST'])
+    def ingest():
+        """Accept one compressed batch (202), or push back (429) when saturated"""
+        if request.content_length and request.content_length > MAX_BODY_BYTES:
+            BATCHES_REJECTED.labels('too_large').inc()
+            return jsonify({'success': False, 'message': 'Batch too large'}), 413
+
+        try:
+            batch = decode_upload(request.get_data(),
+                                  request.headers.get('Content-Encoding', ''),
+                                  request.headers.get('Content-Type', ''))
+        except (ValueError, KeyError, TypeError, AttributeError, OverflowError, OSError, zlib.error) as e:
+            BATCHES_REJECTED.labels('malformed').inc()
+            return jsonify({'success': False, 'message': f"Malformed batch: {e}"}), 400
+
+        if not collector.submit(batch):
+            response = jsonify({'success': False, 'message': 'Collector busy, retry later'})
+            response.headers['Retry-After'] = '1'
+            return response, 429
+
+        return jsonify({'success': True, 'accepted': len(batch['samples'])}), 202
+
+    @app.route('/api/teams', methods=['GET'])
+    def list_teams():
+        return jsonify(collector.store.teams())
+
+    @app.route('/api/teams/<team>/summary', methods=['GET'])
+    def team_summary(team):
+        """Team aggregates over the last ?hours= (default 24)"""
+        try:
+            start, end = parse_window(request.args)
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        return jsonify(collector.store.team_summary(team, start, end))
+
+    @app.route('/api/health', methods=['GET'])
+    def health():
+        return jsonify({
+            'status': 'ok',
+            'queue_depth': collector.queue.qsize(),
+            'queue_capacity': collector.queue.maxsize
+        })
+
+    @app.route('/metrics', methods=['GET'])
+    def get_metrics():
+        return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+    return app
+
+
+# ==========================================
+# SIMULATED AGENTS
+# ==========================================
+
+def make_simulated_batch(agent_id, team, start, samples, rng):
+    """One batch of plausible samples, one per second from start"""
+    posture = rng.randint(55, 95)
+    breaks = rng.randint(0, 5)
+    rows = []
+    for i in range(samples):
+        posture = max(0, min(100, posture + rng.randint(-3, 3)))
+        rows.append({
+            'ts': start + i,
+            'posture': posture,
+            'stress': rng.choices(STRESS_LEVELS, (0.7, 0.2, 0.1))[0],
+            'typing_speed': rng.randint(0, 350),
+            'breaks_taken': breaks,
+            'should_break': rng.random() < 0.1
+        })
+    return {'agent_id': agent_id, 'team': team, 'samples': rows}
+
+
+def post_batch(url, batch, timeout=5):
+    """
+    POST one gzip-compressed JSON batch
+    Returns: int - HTTP status code
+    """
+    body = gzip.compress(json.dumps(batch).encode())
+    req = urllib.request.Request(
+        url.rstrip('/') + '/ingest',
+        data=body,
+        headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'},
+        method='POST'
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def simulate_agents(url, agents, batches, samples_per_batch=60, teams=5, seed=0):
+    """
+    Run simulated agents concurrently, each uploading `batches` batches
+    Returns: dict - status code counts and throughput
+    """
+    results = {}
+    lock = threading.Lock()
+    start_ts = time.time() - batches * samples_per_batch
+
+    def agent(index):
+        rng = random.Random(seed + index)
+        agent_id = f"sim-{index:04d}"
+        team = f"team-{index % teams}"
+        for b in range(batches):
+            batch = make_simulated_batch(agent_id, team, start_ts + b * samples_per_batch,
+                                         samples_per_batch, rng)
+            code = post_batch(url, batch)
+            while code == 429:
+                time.sleep(0.2 + rng.random() * 0.3)  # honour backpressure
+                code = post_batch(url, batch)
+            with lock:
+                results[code] = results.get(code, 0) + 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=agent, args=(i,), daemon=True) for i in range(agents)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        'agents': agents,
+        'batches': agents * batches,
+        'samples': agents * batches * samples_per_batch,
+        'seconds': round(elapsed, 2),
+        'batches_per_sec': round(agents * batches / elapsed, 1),
+        'status_codes': results
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DevCare fleet collector')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=6000)
+    parser.add_argument('--db', default='fleet.db', help='SQLite database file')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument('--simulate', type=int, metavar='AGENTS', default=None,
+                        help='instead of serving, run this many simulated agents against --url')
+    parser.add_argument('--url', default='http://localhost:6000', help='collector URL for --simulate')
+    parser.add_argument('--batches', type=int, default=10, help='batches per simulated agent')
+    args = parser.parse_args(argv)
+
+    if args.simulate:
+        print(f"🤖 Simulating {args.simulate} agents against {args.url}...")
+        print(json.dumps(simulate_agents(args.url, args.simulate, args.batches), indent=2))
+        return 0
+
+    collector = FleetCollector(FleetStore(args.db), args.queue_size).start()
+    app = create_app(collector)
+    print(f"🛰️  DevCare fleet collector on http://{args.host}:{args.port} (db: {args.db})")
+    try:
+        app.run(host=args.host, port=args.port, threaded=True, debug=False, use_reloader=False)
+    finally:
+        collector.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""
+Frame Preprocessor for DevCare
+Turns webcam frames into the RGB images pose inference wants without
+allocating a new array per frame.
+
+The capture buffer, the optional downscaled frame and the RGB image are
+allocated once (and again only if the frame size changes) and every OpenCV
+call writes into them through dst=. Any time OpenCV hands back a different
+array than the one we gave it, that counts as an allocation, so a steady
+state of zero bytes per frame is checkable rather than assumed.
+"""
+
+import cv2
+import numpy as np
+
+import metrics
+
+BUFFER_BYTES_ALLOCATED = metrics.counter(
+    'devcare_frame_buffer_allocated_bytes_total', 'Bytes of frame buffers allocated by the preprocessor')
+
+
+class FramePreprocessor:
+    def __init__(self, max_width=None):
+        """
+        max_width: downscale wider frames to this width before converting
+        (landmarks are normalized, so scores don't change)
+        """
+        self.max_width = max_width
+
+        self.frames = 0
+        self.allocated_bytes = 0
+        self.allocations = 0
+        self.last_frame_bytes = 0   # allocated while reading + converting the latest frame
+        self._bytes_at_last_frame = 0
+
+        self._capture = None
+        self._resized = None
+        self._rgb = None
+
+    def _allocate(self, shape, dtype=np.uint8):
+        buffer = np.empty(shape, dtype=dtype)
+        self._count(buffer)
+        return buffer
+
+    def _count(self, array):
+        self.allocations += 1
+        self.allocated_bytes += array.nbytes
+        BUFFER_BYTES_ALLOCATED.inc(array.nbytes)
+
+    def read(self, camera):
+        """
+        Read the next frame into the reusable capture buffer
+        Returns: (success, frame) like camera.read()
+        """
+        success, frame = camera.read(self._capture)
+        if success and frame is not self._capture:
+            # First frame, or the size changed - OpenCV allocated; keep its array
+            self._count(frame)
+            self._capture = frame
+        return success, frame
+
+    def retrieve(self, camera):
+        """
+        Decode a frame already grabbed with camera.grab() into the capture buffer
+        Returns: (success, frame) like camera.retrieve()
+        """
+        success, frame = camera.retrieve(self._capture)
+        if success and frame is not self._capture:
+            self._count(frame)
+            self._capture = frame
+        return success, frame
+
+    def to_rgb(self, frame):
+        """
+        Convert (and, if needed, downscale) a BGR frame into the RGB buffer
+        Returns: read-only RGB array, valid until the next call
+        """
+        self.frames += 1
+        source = frame
+
+        height, width = frame.shape[:2]
+        if self.max_width and width > self.max_width:
+            size = (self.max_width, round(height * self.max_width / width))
+            if self._resized is None or self._resized.shape[:2] != (size[1], size[0]):
+                self._resized = self._allocate((size[1], size[0], 3))
+            out = cv2.resize(frame, size, dst=self._resized, interpolation=cv2.INTER_AREA)
+            if out is not self._resized:
+                self._count(out)
+                self._resized = out
+            source = self._resized
+
+        if self._rgb is None or self._rgb.shape != source.shape:
+            self._rgb = self._allocate(source.shape)
+
+        self._rgb.flags.writeable = True
+        out = cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        if out is not self._rgb:
+            self._count(out)
+            self._rgb = out
+        self._rgb.flags.writeable = False  # MediaPipe can then skip its own copy
+
+        self.last_frame_bytes = self.allocated_bytes - self._bytes_at_last_frame
+        self._bytes_at_last_frame = self.allocated_bytes
+        return self._rgb
+
+    @property
+    def bytes_per_frame(self):
+        return self.allocated_bytes / self.frames if self.frames else 0.0
+
+    def describe(self):
+        """
+        Get allocation statistics
+        Returns: dict
+        """
+        return {
+            'frames': self.frames,
+            'allocations': self.allocations,
+            'allocated_bytes': self.allocated_bytes,
+            'bytes_per_frame': round(self.bytes_per_frame, 1),
+            'last_frame_bytes': self.last_frame_bytes
+        }
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    print("=" * 60)
+    print("FRAME PREPROCESSOR - ALLOCATION TEST")
+    print("=" * 60)
+
+    frame = np.random.default_rng(0).integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    preprocessor = FramePreprocessor(max_width=640)
+    preprocessor.to_rgb(frame)  # first frame allocates the buffers
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    for _ in range(300):
+        preprocessor.to_rgb(frame)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    naive_start = time.perf_counter()
+    for _ in range(300):
+        cv2.cvtColor(cv2.resize(frame, (640, 360), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+    naive = time.perf_counter() - naive_start
+
+    print(f"Preprocessor stats:        {preprocessor.describe()}")
+    print(f"Traced growth / 300 frames: {current - before} bytes (peak {peak - before})")
+    print(f"Reused buffers:            {elapsed / 300 * 1000:.2f} ms/frame")
+    print(f"Fresh arrays:              {naive / 300 * 1000:.2f} ms/frame")
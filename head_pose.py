@@ -0,0 +1,183 @@
+"""
+Head Pose Estimator for DevCare
+Cheap posture scoring from face detection alone, for users who sit so close
+to the camera that their hips (and so the torso metric) are never visible.
+
+BlazeFace (mp.solutions.face_detection) gives six keypoints per face in a
+few milliseconds - a fraction of full-body Pose. From the eyes, nose and
+mouth we track, relative to the calibrated baseline:
+
+- head drop: how far the eyes sank in the frame, in eye-distances
+- forward head: how much bigger the face got (leaning in towards the screen)
+- pitch: where the nose sits between the eye line and the mouth (looking down)
+"""
+
+import math
+
+import mediapipe as mp
+import numpy as np
+
+# Keypoint order of mp.solutions.face_detection
+RIGHT_EYE, LEFT_EYE, NOSE_TIP, MOUTH_CENTER = 0, 1, 2, 3
+
+MIN_CALIBRATION_SAMPLES = 10
+
+
+def face_features(keypoints):
+    """
+    Turn face keypoints into scale-free head measurements
+    keypoints: sequence of objects with x, y (normalized), in face_detection order
+    Returns: dict - eye_y, face_scale, pitch (None if the face is degenerate)
+    """
+    right_eye, left_eye = keypoints[RIGHT_EYE], keypoints[LEFT_EYE]
+    nose, mouth = keypoints[NOSE_TIP], keypoints[MOUTH_CENTER]
+
+    face_scale = math.hypot(left_eye.x - right_eye.x, left_eye.y - right_eye.y)
+    eye_y = (left_eye.y + right_eye.y) / 2
+    eye_mouth = mouth.y - eye_y
+    if face_scale < 0.01 or eye_mouth <= 0:
+        return None
+
+    return {
+        'eye_y': eye_y,
+        'face_scale': face_scale,
+        'pitch': (nose.y - eye_y) / eye_mouth
+    }
+
+
+class HeadPoseEstimator:
+    def __init__(self, min_detection_confidence=0.5):
+        """Face-detection-only posture scoring (short-range model, faces within ~2 m)"""
+        self.detector = mp.solutions.face_detection.FaceDetection(
+            model_selection=0,
+            min_detection_confidence=min_detection_confidence
+        )
+
+        self.samples = {'eye_y': [], 'face_scale': [], 'pitch': []}
+        self.baseline = None
+        self.confidence = 0.0
+        self.frames = 0
+
+    @property
+    def calibrated(self):
+        return self.baseline is not None
+
+    def detect(self, image):
+        """
+        Find the most confident face in an RGB image
+        Returns: dict of face_features, or None if no usable face
+        """
+        self.frames += 1
+        results = self.detector.process(image)
+        if not results.detections:
+            self.confidence = 0.0
+            return None
+
+        detection = max(results.detections, key=lambda d: d.score[0])
+        self.confidence = detection.score[0]
+        return face_features(detection.location_data.relative_keypoints)
+
+    def add_calibration_sample(self, features):
+        for key, value in features.items():
+            self.samples[key].append(value)
+
+    def complete_calibration(self):
+        """
+        Set baselines from the median of the collected samples
+        Returns: bool - False if too few faces were seen to calibrate
+        """
+        if len(self.samples['eye_y']) < MIN_CALIBRATION_SAMPLES:
+            return False
+        self.baseline = {key: float(np.median(values)) for key, values in self.samples.items()}
+        return True
+
+    def reset(self):
+        self.samples = {'eye_y': [], 'face_scale': [], 'pitch': []}
+        self.baseline = None
+
+    def score(self, features):
+        """
+        Score head posture against the baseline
+        Returns: int (0-100)
+        """
+        baseline = self.baseline
+
+        # Eyes lower in the frame than at calibration, in units of eye distance
+        drop = (features['eye_y'] - baseline['eye_y']) / baseline['face_scale']
+        if drop < 0.2:
+            drop_score = 100
+        elif drop < 0.6:
+            drop_score = 100 - (drop - 0.2) * 150
+        else:
+            drop_score = max(0, 40 - (drop - 0.6) * 80)
+
+        # Face grown relative to calibration: leaning in towards the screen
+        forward = features['face_scale'] / baseline['face_scale'] - 1
+        if forward < 0.08:
+            forward_score = 100
+        elif forward < 0.25:
+            forward_score = 100 - (forward - 0.08) * 350
+        else:
+            forward_score = max(10, 40 - (forward - 0.25) * 100)
+
+        pitch = abs(features['pitch'] - baseline['pitch']) / baseline['pitch']
+        if pitch < 0.10:
+            pitch_score = 100
+        elif pitch < 0.30:
+            pitch_score = 100 - (pitch - 0.10) * 250
+        else:
+            pitch_score = max(30, 50 - (pitch - 0.30) * 100)
+
+        if self.confidence > 0.9:
+            confidence_score = 100
+        elif self.confidence > 0.7:
+            confidence_score = 70 + (self.confidence - 0.7) * 150
+        else:
+            confidence_score = max(30, self.confidence * 100)
+
+        final_score = (
+            drop_score * 0.40 +
+            forward_score * 0.35 +
+            pitch_score * 0.15 +
+            confidence_score * 0.10
+        )
+        return int(max(0, min(100, final_score)))
+
+    def close(self):
+        self.detector.close()
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    from collections import namedtuple
+
+    print("=" * 60)
+    print("HEAD POSE - SYNTHETIC TEST")
+    print("=" * 60)
+
+    Point = namedtuple('Point', 'x y')
+
+    def face(drop=0.0, scale=1.0, nose=0.45):
+        """Face keypoints around the image centre; scale > 1 = leaning in"""
+        eye_half, eye_mouth = 0.06 * scale, 0.12 * scale
+        eye_y = 0.40 + drop
+        return [Point(0.5 - eye_half, eye_y), Point(0.5 + eye_half, eye_y),
+                Point(0.5, eye_y + nose * eye_mouth), Point(0.5, eye_y + eye_mouth)]
+
+    estimator = HeadPoseEstimator()
+    for i in range(30):
+        estimator.add_calibration_sample(face_features(face(drop=0.002 * (i % 3))))
+    estimator.complete_calibration()
+    estimator.confidence = 0.95
+
+    for label, keypoints in [
+        ("Upright", face()),
+        ("Head dropped", face(drop=0.06)),
+        ("Leaning in", face(scale=1.3)),
+        ("Looking down", face(nose=0.6)),
+        ("Slumped towards screen", face(drop=0.08, scale=1.3, nose=0.55))
+    ]:
+        print(f"{label:<24} {estimator.score(face_features(keypoints)):>3}")
@@ -0,0 +1,321 @@
+"""
+DevCare Load Test
+Starts devcareapp.app with stub components (no webcam or keyboard) and drives
+/api/status, /api/break and the /api/stream event stream with concurrent
+async clients, then reports throughput, latency percentiles and error rates.
+
+In --mode single the polling endpoints share one server that handles a
+request at a time. An event stream would hold that server for the whole
+run, so stream clients get their own threaded server there.
+
+Usage:
+    python load_test.py --clients 50 --duration 10
+    python load_test.py --clients 200 --stream-clients 20 --mode single --json report.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import random
+import statistics
+import sys
+import threading
+import time
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+# Default request mix for the polling clients (endpoint -> weight)
+DEFAULT_MIX = {'status': 0.9, 'break': 0.1}
+
+ENDPOINTS = {
+    'status': ('GET', '/api/status'),
+    'break': ('POST', '/api/break')
+}
+
+
+# ==========================================
+# STUB COMPONENTS
+# ==========================================
+
+class FakePostureDetector:
+    def __init__(self):
+        """Posture source that drifts between good and poor posture"""
+        self.start = time.time()
+        self.score_history = []
+        self.head_mode = False
+
+    def get_score(self):
+        elapsed = time.time() - self.start
+        return int(70 + 20 * math.sin(elapsed / 5))
+
+    def get_people(self):
+        return []
+
+
+class FakeTypingAnalyzer:
+    def __init__(self):
+        """Typing source with a slowly changing speed"""
+        self.keys_last_minute = []
+        self.backspaces_last_minute = []
+
+    def get_typing_speed(self):
+        return 180 + int(time.time()) % 60
+
+    def get_stress_level(self):
+        return 'Medium' if self.get_typing_speed() > 230 else 'Low'
+
+
+class FakeBreakManager:
+    def __init__(self):
+        """Break source that only counts (no printing on the hot path)"""
+        self.work_start = time.time()
+        self.breaks_taken = 0
+        self.break_history = []
+
+    def get_status(self):
+        return {
+            'time_working': int((time.time() - self.work_start) / 60),
+            'time_since_break': 0,
+            'breaks_taken': self.breaks_taken,
+            'should_break': False,
+            'suggestion': 'Keep coding! Break coming soon.'
+        }
+
+    def take_break(self):
+        self.breaks_taken += 1
+
+    def reset(self):
+        self.breaks_taken = 0
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass  # an access log line per request would dominate the measurement
+
+
+def start_stub_server(mode='threaded'):
+    """
+    Serve devcareapp.app with stub components on a free local port
+    mode: 'threaded' (one thread per request) or 'single' (one request at a
+          time, plus a threaded server for /api/stream clients)
+    Returns: (servers, port, stream_port)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import devcareapp
+
+    devcareapp.components['posture'].provide(FakePostureDetector())
+    devcareapp.components['typing'].provide(FakeTypingAnalyzer())
+    devcareapp.components['breaks'].provide(FakeBreakManager())
+
+    threading.Thread(target=devcareapp.update_state_loop, daemon=True).start()
+
+    servers = [make_server('127.0.0.1', 0, devcareapp.app, threaded=(mode == 'threaded'),
+                           request_handler=QuietRequestHandler)]
+    if mode == 'single':
+        servers.append(make_server('127.0.0.1', 0, devcareapp.app, threaded=True,
+                                   request_handler=QuietRequestHandler))
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers, servers[0].server_port, servers[-1].server_port
+
+
+# ==========================================
+# ASYNC CLIENTS
+# ==========================================
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.status_codes = {}
+
+    def report(self, duration):
+        count = len(self.latencies) + self.errors
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2)
+
+        return {
+            'requests': count,
+            'errors': self.errors,
+            'error_rate': round(self.errors / count, 4) if count else 0.0,
+            'throughput_rps': round(len(self.latencies) / duration, 1),
+            'latency_ms': {
+                'mean': round(statistics.mean(ordered) * 1000, 2) if ordered else None,
+                'p50': pct(50),
+                'p90': pct(90),
+                'p99': pct(99),
+                'max': round(ordered[-1] * 1000, 2) if ordered else None
+            },
+            'status_codes': self.status_codes
+        }
+
+
+async def http_request(port, method, path, timeout):
+    """
+    Send one HTTP/1.1 request on a fresh connection
+    Returns: int - status code
+    """
+    reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+    try:
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Content-Length: 0\r\nConnection: close\r\n\r\n".encode()
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        await asyncio.wait_for(reader.read(), timeout)
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def polling_client(port, mix, deadline, stats, timeout):
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    while time.perf_counter() < deadline:
+        name = random.choices(names, weights)[0]
+        method, path = ENDPOINTS[name]
+        start = time.perf_counter()
+        try:
+            code = await http_request(port, method, path, timeout)
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            stats[name].errors += 1
+            continue
+
+        stats[name].status_codes[code] = stats[name].status_codes.get(code, 0) + 1
+        if code >= 400:
+            stats[name].errors += 1
+        else:
+            stats[name].latencies.append(time.perf_counter() - start)
+
+
+async def stream_client(port, deadline, stats, timeout):
+    """Hold one /api/stream connection open and time the gaps between events"""
+    try:
+        start = time.perf_counter()
+        reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+        writer.write(b"GET /api/stream HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+    except (OSError, asyncio.TimeoutError):
+        stats.errors += 1
+        return
+
+    last = start
+    try:
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            line = await asyncio.wait_for(reader.readline(), remaining)
+            if not line:
+                stats.errors += 1  # server closed the stream early
+                break
+            if line.startswith(b'data:'):
+                now = time.perf_counter()
+                stats.latencies.append(now - last)  # time to first event, then between events
+                last = now
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load(port, clients, stream_clients, duration, mix, timeout, stream_port=None):
+    stats = {name: EndpointStats() for name in mix}
+    stream_stats = EndpointStats()
+    deadline = time.perf_counter() + duration
+
+    tasks = [polling_client(port, mix, deadline, stats, timeout) for _ in range(clients)]
+    tasks += [stream_client(stream_port or port, deadline, stream_stats, timeout) for _ in range(stream_clients)]
+    await asyncio.gather(*tasks)
+
+    if stream_clients:
+        stats['stream'] = stream_stats
+    return stats
+
+
+def format_report(report):
+    lines = [
+        "=" * 78,
+        f"DEVCARE LOAD TEST - {report['clients']} clients, {report['stream_clients']} stream clients, "
+        f"{report['duration']}s, {report['mode']} server",
+        "=" * 78,
+        f"{'Endpoint':<10}{'Requests':>10}{'Errors':>8}{'Err %':>8}{'req/s':>10}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+        "-" * 78
+    ]
+    for name, r in report['endpoints'].items():
+        lat = r['latency_ms']
+        fmt = lambda v: f"{v:>9.1f}" if v is not None else f"{'--':>9}"
+        lines.append(
+            f"{name:<10}{r['requests']:>10}{r['errors']:>8}{r['error_rate']:>8.1%}"
+            f"{r['throughput_rps']:>10.1f}{fmt(lat['p50'])}{fmt(lat['p90'])}{fmt(lat['p99'])}{fmt(lat['max'])}"
+        )
+    lines.append("-" * 78)
+    lines.append("(stream latencies are time to first event, then time between events)")
+    lines.append("=" * 78)
+    return '\n'.join(lines)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint '{name}' (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load test DevCare with stub components')
+    parser.add_argument('--clients', type=int, default=20, help='concurrent polling clients')
+    parser.add_argument('--stream-clients', type=int, default=5, help='concurrent /api/stream clients')
+    parser.add_argument('--duration', type=float, default=10, help='seconds to run')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='request mix, e.g. status=9,break=1')
+    parser.add_argument('--mode', choices=('threaded', 'single'), default='threaded',
+                        help='werkzeug server mode')
+    parser.add_argument('--timeout', type=float, default=5, help='per-request timeout in seconds')
+    parser.add_argument('--json', dest='json_path', default=None, help='also write the report as JSON')
+    args = parser.parse_args(argv)
+
+    servers, port, stream_port = start_stub_server(args.mode)
+    print(f"🚀 Stub DevCare server on http://127.0.0.1:{port} ({args.mode})")
+    if stream_port != port:
+        print(f"🚀 Event streams on http://127.0.0.1:{stream_port} (threaded)")
+
+    try:
+        stats = asyncio.run(run_load(port, args.clients, args.stream_clients,
+                                     args.duration, args.mix, args.timeout, stream_port))
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    report = {
+        'clients': args.clients,
+        'stream_clients': args.stream_clients,
+        'duration': args.duration,
+        'mode': args.mode,
+        'endpoints': {name: s.report(args.duration) for name, s in stats.items()}
+    }
+    print(format_report(report))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.json_path}")
+
+    total_errors = sum(r['errors'] for r in report['endpoints'].values())
+    return 1 if total_errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
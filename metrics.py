@@ -0,0 +1,330 @@
+"""
+DevCare Metrics
+Low-overhead counters, gauges and histograms rendered in Prometheus text format
+
+Hot paths (PostureDetector.run, TypingAnalyzer.on_press) only ever touch a
+per-thread shard, so no lock is taken when recording a value. Shards are
+summed when /metrics is scraped, and the shards of threads that have exited
+(Werkzeug serves each request on a new thread) are folded into a running
+total so they don't pile up.
+"""
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: no getrusage (and no /proc) - RSS is not exported
+
+# Latency buckets in seconds (covers keystroke hooks up to slow inference)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_labels(label_names, label_values, extra=None):
+    pairs = list(zip(label_names, label_values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    body = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return '{' + body + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _add_into(totals, shard):
+    for i, value in enumerate(shard):
+        totals[i] += value
+
+
+class _ThreadShards:
+    def __init__(self, factory):
+        """Per-thread lists of running totals, created by factory() on a thread's first record"""
+        self.factory = factory
+        self.local = threading.local()
+        self.shards = []             # (thread, shard)
+        self.retired = factory()     # totals of threads that have exited
+        self.lock = threading.Lock()
+
+    def get(self):
+        """
+        This thread's shard (the lock is only taken the first time)
+        Returns: shard
+        """
+        shard = getattr(self.local, 'shard', None)
+        if shard is None:
+            shard = self.local.shard = self.factory()
+            with self.lock:
+                self.shards.append((threading.current_thread(), shard))
+        return shard
+
+    def merged(self):
+        """
+        Sum every shard, folding those of exited threads into the retired totals
+        Returns: list - element-wise totals
+        """
+        with self.lock:
+            live = []
+            for thread, shard in self.shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    _add_into(self.retired, shard)
+            self.shards = live
+
+            totals = list(self.retired)
+            for _, shard in live:
+                _add_into(totals, shard)
+        return totals
+
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name, help_text, label_names=(), label_values=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.label_values = tuple(label_values)
+        self._children = {}
+        self._children_lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        """
+        Get the child metric for one label combination
+        Returns: metric of the same type
+        """
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.label_names)
+        key = tuple(str(v) for v in values)
+
+        child = self._children.get(key)
+        if child is None:
+            with self._children_lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child(key)
+                    self._children[key] = child
+        return child
+
+    def _new_child(self, label_values):
+        return type(self)(self.name, self.help_text, self.label_names, label_values)
+
+    def _series(self):
+        if self.label_names and not self.label_values:
+            for child in list(self._children.values()):
+                yield from child._samples()
+        else:
+            yield from self._samples()
+
+    def _samples(self):
+        return []
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        for sample_name, labels, value in self._series():
+            lines.append(f"{sample_name}{labels} {_format_value(value)}")
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    metric_type = 'counter'
+
+    def __init__(self, name, help_text, label_names=(), label_values=(), fn=None):
+        super().__init__(name, help_text, label_names, label_values)
+        self._shards = _ThreadShards(lambda: [0])
+        self.fn = fn
+
+    def inc(self, amount=1):
+        """Add to the counter (lock-free, per-thread shard)"""
+        self._shards.get()[0] += amount
+
+    def get(self):
+        """
+        Get the current total (calls fn if this is a callback counter)
+        Returns: int or float
+        """
+        if self.fn is not None:
+            try:
+                return self.fn()
+            except Exception:
+                return 0
+        return self._shards.merged()[0]
+
+    def _samples(self):
+        labels = _format_labels(self.label_names, self.label_values)
+        return [(self.name, labels, self.get())]
+
+
+class Gauge(_Metric):
+    metric_type = 'gauge'
+
+    def __init__(self, name, help_text, label_names=(), label_values=(), fn=None):
+        super().__init__(name, help_text, label_names, label_values)
+        self.value = 0
+        self.fn = fn
+
+    def set(self, value):
+        """Set the gauge (single attribute store)"""
+        self.value = value
+
+    def get(self):
+        """
+        Get the current value (calls fn if this is a callback gauge)
+        Returns: int or float
+        """
+        if self.fn is not None:
+            try:
+                return self.fn()
+            except Exception:
+                return 0
+        return self.value
+
+    def _samples(self):
+        labels = _format_labels(self.label_names, self.label_values)
+        return [(self.name, labels, self.get())]
+
+
+class Histogram(_Metric):
+    metric_type = 'histogram'
+
+    def __init__(self, name, help_text, label_names=(), label_values=(),
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, label_names, label_values)
+        self.buckets = tuple(sorted(buckets))
+        # Bucket counts, +Inf count, then the running sum
+        self._shards = _ThreadShards(lambda: [0] * (len(self.buckets) + 1) + [0.0])
+
+    def _new_child(self, label_values):
+        return Histogram(self.name, self.help_text, self.label_names,
+                         label_values, self.buckets)
+
+    def observe(self, value):
+        """Record one observation (lock-free, per-thread shard)"""
+        shard = self._shards.get()
+        shard[bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self):
+        """
+        Merge all thread shards
+        Returns: (bucket_counts, count, sum)
+        """
+        totals = self._shards.merged()
+        counts = totals[:-1]
+        return counts, sum(counts), totals[-1]
+
+    def _samples(self):
+        counts, count, total = self.snapshot()
+        samples = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            labels = _format_labels(self.label_names, self.label_values,
+                                    ('le', _format_value(float(bound))))
+            samples.append((f"{self.name}_bucket", labels, cumulative))
+        labels = _format_labels(self.label_names, self.label_values)
+        samples.append((f"{self.name}_count", labels, count))
+        samples.append((f"{self.name}_sum", labels, total))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, help_text, labels=(), **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = cls(name, help_text, labels, **kwargs)
+                    self._metrics[name] = metric
+        return metric
+
+    def counter(self, name, help_text, labels=(), fn=None):
+        counter = self._get_or_create(Counter, name, help_text, labels)
+        if fn is not None:
+            counter.fn = fn
+        return counter
+
+    def gauge(self, name, help_text, labels=(), fn=None):
+        gauge = self._get_or_create(Gauge, name, help_text, labels)
+        if fn is not None:
+            gauge.fn = fn
+        return gauge
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labels,
+                                   buckets=buckets)
+
+    def render(self):
+        """
+        Render every metric in Prometheus text exposition format
+        Returns: str
+        """
+        metrics = list(self._metrics.values())
+        return '\n'.join(m.render() for m in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+render = REGISTRY.render
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+# ==========================================
+# PROCESS METRICS
+# ==========================================
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_START_TIME = time.time()
+
+
+def get_resident_memory_bytes():
+    """
+    Get current resident set size of this process
+    Returns: int - bytes
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        # ru_maxrss is peak RSS, in bytes on macOS and KiB elsewhere
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+if resource or os.path.exists('/proc/self/statm'):
+    gauge('process_resident_memory_bytes', 'Resident memory size in bytes',
+          fn=get_resident_memory_bytes)
+counter('process_cpu_seconds_total', 'Total user and system CPU time in seconds',
+        fn=time.process_time)
+gauge('process_start_time_seconds', 'Start time of the process since unix epoch',
+      fn=lambda: _START_TIME)
+gauge('process_threads', 'Number of live Python threads',
+      fn=threading.active_count)
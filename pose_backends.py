@@ -0,0 +1,288 @@
+"""
+Pose Inference Backends for DevCare
+Two interchangeable ways of getting pose landmarks out of MediaPipe:
+
+- 'solutions': the legacy mp.solutions.pose.Pose. process() blocks the
+  capture loop for the whole inference.
+- 'tasks': the Tasks API PoseLandmarker in LIVE_STREAM mode. detect_async()
+  returns immediately and results arrive on MediaPipe's own thread, keyed by
+  the frame timestamp, so the next frame is captured and preprocessed while
+  the previous one is still being inferred.
+
+Both take lite/full/heavy models and return the same PoseResult, so
+PostureDetector doesn't care which one it is talking to. Only 'tasks' can
+find more than one person per frame (num_poses); Solutions Pose tracks a
+single person.
+
+Download Tasks models with: python pose_backends.py --download full
+"""
+
+import os
+import threading
+import time
+import urllib.request
+from collections import namedtuple
+
+import mediapipe as mp
+
+DEFAULT_BACKEND = 'solutions'
+DEFAULT_MODEL = 'full'
+MODEL_VARIANTS = ('lite', 'full', 'heavy')
+
+# Solutions models are picked by complexity (and fetched by MediaPipe itself)
+MODEL_COMPLEXITY = {'lite': 0, 'full': 1, 'heavy': 2}
+
+# Tasks models are .task bundles we keep in MODEL_DIR
+MODEL_DIR = 'models'
+MODEL_URL = ('https://storage.googleapis.com/mediapipe-models/pose_landmarker/'
+             'pose_landmarker_{variant}/float16/latest/pose_landmarker_{variant}.task')
+
+RESULT_TIMEOUT = 5.0      # seconds detect(wait=True) waits for an async result
+IN_FLIGHT_TIMEOUT = 0.5   # seconds before an unanswered frame stops counting as in flight
+
+# landmarks: sequence of objects with x, y, z, visibility (None = nobody in frame)
+# latency: seconds from submitting the frame to its result
+# people: landmarks of every person found (landmarks is the first of them)
+PoseResult = namedtuple('PoseResult', 'timestamp_ms landmarks latency people')
+
+
+def model_path(variant, model_dir=MODEL_DIR):
+    return os.path.join(model_dir, f"pose_landmarker_{variant}.task")
+
+
+def download_model(variant, model_dir=MODEL_DIR):
+    """
+    Fetch a PoseLandmarker .task bundle (skipped if already present)
+    Returns: str - path of the model file
+    """
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(f"unknown model '{variant}' (choose from {', '.join(MODEL_VARIANTS)})")
+
+    path = model_path(variant, model_dir)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(model_dir, exist_ok=True)
+    print(f"⬇️ Downloading {os.path.basename(path)}...")
+    urllib.request.urlretrieve(MODEL_URL.format(variant=variant), path + '.part')
+    os.replace(path + '.part', path)
+    return path
+
+
+class SolutionsBackend:
+    name = 'solutions'
+    pipelined = False
+
+    def __init__(self, model=DEFAULT_MODEL, num_poses=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        """Synchronous backend on mp.solutions.pose (the original pipeline)"""
+        if num_poses != 1:
+            raise ValueError("the solutions backend finds one person - use the tasks backend for num_poses > 1")
+        self.model = model
+        self.pose = mp.solutions.pose.Pose(
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            model_complexity=MODEL_COMPLEXITY[model]
+        )
+        self.frames = 0
+
+    def detect(self, image, timestamp_ms, wait=True):
+        """
+        Run inference on an RGB image
+        Returns: PoseResult for this image
+        """
+        start = time.perf_counter()
+        results = self.pose.process(image)
+        self.frames += 1
+        landmarks = results.pose_landmarks.landmark if results.pose_landmarks else None
+        return PoseResult(timestamp_ms, landmarks, time.perf_counter() - start, [landmarks] if landmarks else [])
+
+    def describe(self):
+        return {'backend': self.name, 'model': self.model, 'frames': self.frames}
+
+    def close(self):
+        self.pose.close()
+
+
+class TasksBackend:
+    name = 'tasks'
+    pipelined = True
+
+    def __init__(self, model=DEFAULT_MODEL, model_dir=MODEL_DIR, max_in_flight=1, num_poses=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5,
+                 in_flight_timeout=IN_FLIGHT_TIMEOUT, landmarker=None):
+        """
+        Asynchronous backend on the Tasks PoseLandmarker (LIVE_STREAM mode)
+        max_in_flight: frames submitted but not yet answered; further frames
+                       are dropped rather than queued behind a busy model
+        num_poses: most people found per frame (shared desks)
+        in_flight_timeout: seconds after which an unanswered frame is given up on
+                           (LIVE_STREAM drops frames without calling back)
+        landmarker: object with detect_async(image, timestamp_ms) and close() to
+                    use instead of a PoseLandmarker; it reports to _on_result
+        """
+        self.model = model
+        self.max_in_flight = max_in_flight
+        self.num_poses = num_poses
+        self.in_flight_timeout = in_flight_timeout
+
+        self.frames = 0
+        self.dropped = 0
+        self.expired = 0         # submitted frames never answered within in_flight_timeout
+        self.results = {}        # timestamp_ms -> PoseResult, until detect() hands them out
+        self._submitted = {}     # timestamp_ms -> perf_counter at submission
+        self._last_timestamp = -1
+        self._cond = threading.Condition()
+
+        self.landmarker = landmarker or self._create_landmarker(
+            model, model_dir, num_poses, min_detection_confidence, min_tracking_confidence)
+
+    def _create_landmarker(self, model, model_dir, num_poses, min_detection_confidence, min_tracking_confidence):
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python import vision
+
+        path = model_path(model, model_dir)
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"{path} not found - run: python pose_backends.py --download {model}")
+
+        options = vision.PoseLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=num_poses,
+            min_pose_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            result_callback=self._on_result
+        )
+        return vision.PoseLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Called on MediaPipe's thread when a frame's inference finishes"""
+        with self._cond:
+            submitted = self._submitted.pop(timestamp_ms, None)
+            latency = time.perf_counter() - submitted if submitted is not None else 0.0
+            people = list(result.pose_landmarks)
+            self.results[timestamp_ms] = PoseResult(timestamp_ms, people[0] if people else None, latency, people)
+            self.frames += 1
+            self._cond.notify_all()
+
+    def _expire_submitted(self, now):
+        """
+        Forget frames submitted more than in_flight_timeout ago - MediaPipe
+        drops frames in LIVE_STREAM mode without a callback, and a frame that
+        never answers must not hold up inference (call under _cond)
+        """
+        stale = [ts for ts, submitted in self._submitted.items() if now - submitted > self.in_flight_timeout]
+        for ts in stale:
+            del self._submitted[ts]
+        self.expired += len(stale)
+
+    def detect(self, image, timestamp_ms, wait=False):
+        """
+        Submit an RGB image and collect whatever inference has finished
+        wait: block until this image's own result is in (benchmarks, profiling)
+        Returns: newest PoseResult not handed out yet, or None if nothing finished
+        """
+        # LIVE_STREAM rejects timestamps that don't strictly increase
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp + 1)
+
+        with self._cond:
+            self._expire_submitted(time.perf_counter())
+            busy = len(self._submitted) >= self.max_in_flight
+
+        if busy and not wait:
+            self.dropped += 1
+        else:
+            # mp.Image copies the pixels, so the caller may reuse its buffer
+            frame = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+            with self._cond:
+                self._submitted[timestamp_ms] = time.perf_counter()
+            self._last_timestamp = timestamp_ms
+            self.landmarker.detect_async(frame, timestamp_ms)
+
+            if wait:
+                with self._cond:
+                    if not self._cond.wait_for(lambda: timestamp_ms in self.results, RESULT_TIMEOUT):
+                        # Gave up on it - stop counting it as in flight
+                        if self._submitted.pop(timestamp_ms, None) is not None:
+                            self.expired += 1
+
+        with self._cond:
+            if not self.results:
+                return None
+            newest = self.results[max(self.results)]
+            self.results.clear()  # older results are superseded
+            return newest
+
+    def describe(self):
+        return {
+            'backend': self.name,
+            'model': self.model,
+            'num_poses': self.num_poses,
+            'frames': self.frames,
+            'dropped': self.dropped,
+            'expired': self.expired,
+            'in_flight': len(self._submitted)
+        }
+
+    def close(self):
+        self.landmarker.close()
+
+
+BACKENDS = {
+    'solutions': SolutionsBackend,
+    'tasks': TasksBackend
+}
+
+
+def create_backend(name=DEFAULT_BACKEND, model=DEFAULT_MODEL, **options):
+    """
+    Construct a pose backend by name
+    Returns: SolutionsBackend or TasksBackend
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"unknown pose backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if model not in MODEL_VARIANTS:
+        raise ValueError(f"unknown model '{model}' (choose from {', '.join(MODEL_VARIANTS)})")
+    return BACKENDS[name](model=model, **options)
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import argparse
+
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description='Pose backend check')
+    parser.add_argument('--download', nargs='+', choices=MODEL_VARIANTS, metavar='MODEL',
+                        help='download PoseLandmarker models (lite, full, heavy) and exit')
+    args = parser.parse_args()
+
+    if args.download:
+        for variant in args.download:
+            print(f"✅ {download_model(variant)}")
+        raise SystemExit(0)
+
+    print("=" * 60)
+    print("POSE BACKENDS - SYNTHETIC TEST")
+    print("=" * 60)
+
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    for name in BACKENDS:
+        for variant in MODEL_VARIANTS:
+            try:
+                backend = create_backend(name, variant)
+            except Exception as e:
+                print(f"{name:<10}{variant:<7} ⚠️ unavailable ({e})")
+                continue
+
+            backend.detect(image, 0, wait=True)  # warm up
+            start = time.perf_counter()
+            for i in range(1, 31):
+                backend.detect(image, i * 33, wait=True)
+            elapsed = (time.perf_counter() - start) / 30
+            print(f"{name:<10}{variant:<7} {elapsed * 1000:6.1f} ms/frame  {backend.describe()}")
+            backend.close()
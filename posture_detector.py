@@ -1,29 +1,102 @@
 # --- posture_detector.py (clean, production-ready) ---
 
 import cv2
+import getpass
 import mediapipe as mp
 import math
 import time
 import numpy as np
 import threading
 
+import metrics
+from calibration_store import (VALIDATION_FRAMES, CalibrationStore, camera_fingerprint, measure_frame,
+                               summarize, validate_profile)
+from drift_detector import DriftDetector, body_geometry
+from capture_profiles import DEFAULT_PROFILE, apply_capture_profile, format_capture_report
+from frame_preprocessor import FramePreprocessor
+from head_pose import HeadPoseEstimator
+from landmark_tracker import LandmarkTracker, as_landmarks
+from motion_gate import MotionGate
+from person_tracker import PersonTracker
+from pose_backends import DEFAULT_BACKEND, DEFAULT_MODEL, create_backend
+
+FRAMES_PROCESSED = metrics.counter(
+    'devcare_posture_frames_total', 'Webcam frames run through pose inference')
+INFERENCE_SECONDS = metrics.histogram(
+    'devcare_posture_inference_seconds', 'Latency from submitting a frame to its pose landmarks')
+POSTURE_FPS = metrics.gauge(
+    'devcare_posture_fps', 'Posture frames processed per second')
+CAPTURE_READ_SECONDS = metrics.histogram(
+    'devcare_capture_read_seconds', 'Time spent in one camera.read() call')
+CAPTURE_USB_BYTES = metrics.gauge(
+    'devcare_capture_usb_bytes_per_second', 'Estimated webcam bandwidth of the negotiated capture format')
+
+NUM_LANDMARKS = 33
+HIPS = [23, 24]
+
+# Head mode: score from face detection alone when the hips stay out of frame
+HIP_VISIBILITY = 0.5       # mean hip visibility that counts as "hips in frame"
+HEAD_MODE_AFTER = 15       # consecutive full-body inferences without hips before switching
+POSE_PROBE_INTERVAL = 10.0 # seconds between full-body checks for hips while in head mode
+
+MAX_READ_FAILURES = 50     # consecutive failed reads (~5 s) before run() gives up on the camera
+
+DRIFT_SAVE_FRAMES = 30     # detections (~3 s once calibrated) measured before saving re-baselined calibration
+
+
+def landmarks_to_array(landmarks, out=None):
+    """
+    Copy MediaPipe landmarks into a (33, 4) float32 array of x, y, z, visibility
+    Returns: numpy array (out, if given)
+    """
+    values = [(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks]
+    if out is None:
+        return np.array(values, dtype=np.float32)
+    out[:] = values
+    return out
+
 class PostureDetector:
-    def __init__(self):
+    def __init__(self, pose_backend=None, pose_model=None, max_people=1):
+        """
+        pose_backend: 'solutions' (synchronous) or 'tasks' (pipelined LIVE_STREAM), see pose_backends.py
+        pose_model: 'lite', 'full' or 'heavy'
+        max_people: people scored per frame (more than 1 needs the tasks backend)
+        """
         print("📷 Initializing Posture Detector...")
 
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
 
-        self.pose = self.mp_pose.Pose(
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-            model_complexity=1
-        )
+        pose_backend = pose_backend or DEFAULT_BACKEND
+        if max_people > 1 and pose_backend != 'tasks':
+            print("⚠️ Multi-person posture needs the tasks pose backend - tracking one person")
+            max_people = 1
+
+        try:
+            self.backend = create_backend(pose_backend, pose_model or DEFAULT_MODEL, num_poses=max_people)
+        except FileNotFoundError as e:
+            print(f"⚠️ {e}")
+            print(f"⚠️ Falling back to the {DEFAULT_BACKEND} pose backend")
+            self.backend = create_backend(DEFAULT_BACKEND, pose_model or DEFAULT_MODEL)
+            max_people = 1
+
+        # Shared desks: every person gets an ID, baselines and score; the one
+        # tracked longest drives the single-person pipeline (None = one person)
+        self.person_tracker = PersonTracker() if max_people > 1 else None
+        self.primary_id = None          # person the single-person pipeline follows
+        self.owner_id = None            # first primary - the person the saved calibration belongs to
+        self.primary_switched = False   # following someone other than the owner
+        self._owner_calibration = None  # owner's calibration_data and source while someone else is followed
 
         self.current_score = 0
         self.running = False
         self.camera = None
         self.last_detection_time = 0
+        self.last_frame_time = 0   # time.time() of the last frame read from the camera
+
+        # Capture properties to negotiate (see capture_profiles.py) and what the device accepted
+        self.capture_profile = DEFAULT_PROFILE
+        self.capture_report = None
 
         self.calibration_data = {
             'shoulder_hip_ratio': [],
@@ -35,9 +108,54 @@ class PostureDetector:
         }
 
         self.CALIBRATION_FRAMES = 90
+
+        # Baselines saved per user/camera so restarts skip calibration (None = always calibrate)
+        self.calibration_store = CalibrationStore()
+        self.user = getpass.getuser()
+        self.camera_index = None
+        self.calibration_source = None   # 'stored', 'fresh' or 'tracked' (a switched primary's) once calibrated
+        self.validating = False          # checking a loaded profile against the first frames
+        self._stored_profile = None
+        self._geometry_samples = []
+
+        # Re-baselines when the ratios shift for good (None = keep the calibration until reset)
+        self.drift_detector = DriftDetector()
+        self.last_ratios = None   # (shoulder_hip, head_shoulder) of the last scored frame
+        self._drift_save_pending = False   # re-baselined, measuring the new setup before saving
+
         self.score_history = []
         self.max_history = 5
 
+        # Latest landmarks as x, y, z, visibility rows
+        self.landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+
+        # Optional SharedChannelWriter to publish every detection to
+        self.channel = None
+
+        # Optional callable(source, timestamp) told about every frame with a person in it
+        self.on_activity = None
+
+        # Reusable capture/RGB buffers (no per-frame allocations)
+        self.preprocessor = FramePreprocessor()
+
+        # Skips inference on frames that barely changed (None = infer every frame)
+        self.motion_gate = MotionGate()
+
+        # Once calibrated, infer at most every inference_interval seconds and
+        # score Kalman-predicted landmarks on the frames in between
+        self.inference_interval = 0.1
+        self.tracker = LandmarkTracker()
+        self._last_inference = 0.0
+        self._fps_window_start = time.perf_counter()
+        self._fps_window_frames = 0
+
+        # Face-only scoring for close-up setups (None = always run full-body pose)
+        self.head_pose = HeadPoseEstimator()
+        self.head_mode = False
+        self._hipless_frames = 0
+        self._probing = False
+        self._last_probe = 0.0
+
         print("✅ Posture Detector initialized")
 
     def calculate_posture_score(self, landmarks):
@@ -56,6 +174,7 @@ class PostureDetector:
                 (left_shoulder.y - right_shoulder.y)**2
             )
 
+            self.last_ratios = None
             if shoulder_width < 0.05:
                 return 0
 
@@ -86,6 +205,7 @@ class PostureDetector:
 
             head_shoulder_vertical = abs(shoulder_y - ear_y)
             head_shoulder_ratio = head_shoulder_vertical / shoulder_width
+            self.last_ratios = (shoulder_hip_ratio, head_shoulder_ratio)
 
             if not self.calibration_data['complete']:
                 self.calibration_data['head_shoulder_ratio'].append(head_shoulder_ratio)
@@ -149,62 +269,385 @@ class PostureDetector:
             print(f"⚠️ Error calculating posture: {e}")
             return 50
 
+    def complete_calibration(self):
+        """Set baselines from the median of the collected calibration ratios"""
+        self.calibration_data['baseline_shoulder_hip'] = np.median(
+            self.calibration_data['shoulder_hip_ratio']
+        )
+        self.calibration_data['baseline_head_shoulder'] = np.median(
+            self.calibration_data['head_shoulder_ratio']
+        )
+        self.calibration_data['complete'] = True
+        if self.head_pose and not self.head_pose.complete_calibration():
+            print("⚠️ Face not seen during calibration - head mode unavailable")
+        self.calibration_source = 'fresh'
+        print("✅ Calibration complete!")
+        self.save_calibration()
+        self._start_drift_detection()
+
+    def _start_drift_detection(self):
+        if self.drift_detector and not self.primary_switched:
+            self.drift_detector.start({
+                'shoulder_hip': self.calibration_data['baseline_shoulder_hip'],
+                'head_shoulder': self.calibration_data['baseline_head_shoulder']
+            })
+
+    def _check_drift(self):
+        """Feed the last scored frame to the drift detector and adopt any new baselines"""
+        changed = self.drift_detector.update(self.last_ratios, body_geometry(self.landmarks))
+        for name, value in changed.items():
+            print(f"📐 Baseline drift: {name} ratio re-baselined "
+                  f"{self.calibration_data['baseline_' + name]:.2f} -> {value:.2f}")
+            self.calibration_data['baseline_' + name] = value
+        if changed:
+            # Save the new setup's geometry as a median over a few seconds, not one noisy frame
+            self._geometry_samples = []
+            self._drift_save_pending = True
+
+        if self._drift_save_pending:
+            self._geometry_samples.append(measure_frame(self.landmarks))
+            if len(self._geometry_samples) >= DRIFT_SAVE_FRAMES:
+                self._drift_save_pending = False
+                self.save_calibration()
+
+    def camera_fingerprint(self):
+        """Returns: str identifying the open camera setup, or None before open_camera"""
+        if self.capture_report is None or self.camera_index is None:
+            return None
+        return camera_fingerprint(self.capture_report, self.camera_index)
+
+    def save_calibration(self):
+        """Store the current baselines for this user and camera"""
+        fingerprint = self.camera_fingerprint()
+        if self.primary_switched or not self.calibration_store or not fingerprint or not self._geometry_samples:
+            return
+        self.calibration_store.save(
+            self.user, fingerprint,
+            self.calibration_data['baseline_shoulder_hip'],
+            self.calibration_data['baseline_head_shoulder'],
+            summarize(self._geometry_samples),
+            head=self.head_pose.baseline if self.head_pose else None
+        )
+        print(f"💾 Calibration saved for {self.user} on {fingerprint}")
+
+    def load_calibration(self):
+        """
+        Use the stored baselines for this user and camera, pending a quick
+        check against the first detected frames
+        Returns: bool - True if a profile was loaded
+        """
+        fingerprint = self.camera_fingerprint()
+        if not self.calibration_store or not fingerprint:
+            return False
+        profile = self.calibration_store.load(self.user, fingerprint)
+        if profile is None:
+            return False
+
+        self.calibration_data.update(
+            complete=True,
+            baseline_shoulder_hip=profile['baseline_shoulder_hip'],
+            baseline_head_shoulder=profile['baseline_head_shoulder']
+        )
+        if self.head_pose and profile.get('head'):
+            self.head_pose.baseline = profile['head']
+        self.calibration_source = 'stored'
+        self.validating = True
+        self._stored_profile = profile
+        self._geometry_samples = []
+        self._start_drift_detection()
+        print(f"📂 Loaded calibration for {self.user} on {fingerprint} - checking it still fits")
+        return True
+
+    def _check_stored_calibration(self):
+        """Validate a loaded profile once enough frames were seen; recalibrate if it no longer fits"""
+        self._geometry_samples.append(measure_frame(self.landmarks))
+        if len(self._geometry_samples) < VALIDATION_FRAMES:
+            return
+
+        fits, reason = validate_profile(self._stored_profile, self._geometry_samples)
+        self.validating = False
+        if fits:
+            print("✅ Stored calibration still fits")
+            return
+        print(f"⚠️ Stored calibration no longer fits ({reason}) - recalibrating")
+        print("⚙️ Calibration: Sit with GOOD posture for 3 seconds")
+        self.reset_calibration()
+
     def smooth_score(self, new_score):
         self.score_history.append(new_score)
         if len(self.score_history) > self.max_history:
             self.score_history.pop(0)
         return int(sum(self.score_history) / len(self.score_history))
 
-    def run(self):
-        self.running = True
-        print("📹 Starting webcam...")
-
+    def open_camera(self):
+        """
+        Open the first available webcam (index 0, then 1) and negotiate capture_profile
+        Returns: bool - True if a camera was opened
+        """
+        self.camera_index = 0
         self.camera = cv2.VideoCapture(0)
         if not self.camera.isOpened():
+            self.camera_index = 1
             self.camera = cv2.VideoCapture(1)
 
         if not self.camera.isOpened():
+            self.camera_index = None
+            return False
+
+        self.capture_report = apply_capture_profile(self.camera, self.capture_profile)
+        CAPTURE_USB_BYTES.set(self.capture_report['cost']['usb_mbytes_per_sec'] * 1e6)
+        print(f"📷 Capture: {format_capture_report(self.capture_report)}")
+        return True
+
+    def process_frame(self, frame):
+        """
+        Run one BGR webcam frame through the motion gate and pose inference
+        Returns: bool - True if new landmarks were scored (False if the frame
+        was scored from Kalman-predicted landmarks instead)
+        """
+        now = time.perf_counter()
+        calibrated = self.calibration_data['complete']
+
+        # Calibration needs every frame; gate only once it is done
+        if calibrated:
+            due = now - self._last_inference >= self.inference_interval
+            if not due or (self.motion_gate and not self.motion_gate.should_process(frame)):
+                self.score_tracked(now)
+                return False
+
+        image = self.preprocessor.to_rgb(frame)
+        if self.head_mode and not self._pose_probe_due(now):
+            return self.process_head_frame(image)
+
+        self._last_inference = time.perf_counter()
+        result = self.backend.detect(image, int(self._last_inference * 1000))
+        if result is None:
+            # Pipelined backend: nothing finished yet, this frame is still in flight
+            self.score_tracked(now)
+            return False
+
+        INFERENCE_SECONDS.observe(result.latency)
+        FRAMES_PROCESSED.inc()
+        self._probing = False
+
+        # The result may belong to an earlier frame than this one
+        detected_at = result.timestamp_ms / 1000
+        inference_end = time.perf_counter()
+        self._count_fps(inference_end)
+
+        if self.person_tracker:
+            self.person_tracker.update([landmarks_to_array(pose) for pose in result.people])
+            # The primary keeps the role through missed frames while its track lives
+            primary = self.person_tracker.primary()
+            found = primary is not None and not primary.missed
+            if found:
+                if primary.id != self.primary_id:
+                    self._follow_primary(primary)
+                    calibrated = self.calibration_data['complete']
+                self.landmarks[:] = primary.landmarks
+        else:
+            found = bool(result.landmarks)
+            if found:
+                landmarks_to_array(result.landmarks, out=self.landmarks)
+
+        if found:
+
+            if self.validating:
+                self._check_stored_calibration()
+                calibrated = self.calibration_data['complete']
+
+            if calibrated:
+                self._update_mode(now)
+            else:
+                self._geometry_samples.append(measure_frame(self.landmarks))
+                if self.head_pose:
+                    # Face baseline for head mode, from the same good-posture frames
+                    features = self.head_pose.detect(image)
+                    if features:
+                        self.head_pose.add_calibration_sample(features)
+
+            if self.head_mode:
+                # A probe that still found no hips - keep the face-only score
+                self.tracker.reset()
+                return True
+
+            if calibrated:
+                self.tracker.update(self.landmarks, detected_at)
+                raw_score = self.calculate_posture_score(as_landmarks(self.tracker.predict(inference_end)))
+                if self.drift_detector and not self.validating and self.last_ratios:
+                    self._check_drift()
+            else:
+                raw_score = self.calculate_posture_score(as_landmarks(self.landmarks))
+
+            if not self.calibration_data['complete']:
+                self.calibration_data['frames'] += 1
+
+                if self.calibration_data['frames'] >= self.CALIBRATION_FRAMES:
+                    self.complete_calibration()
+
+            self._record_score(raw_score, self.landmarks)
+
+        else:
+            self.current_score = 0
+            self.tracker.reset()
+
+        return True
+
+    def _follow_primary(self, person):
+        """
+        Point the single-person pipeline at a new primary person. Calibration,
+        Kalman state, drift and the saved profile belong to whoever was followed
+        before, so restart from the new person's own tracker baselines and never
+        save or drift-adapt them - the stored profile is the owner's (the first
+        primary), whose calibration comes back if the role returns to them
+        """
+        if self.owner_id is None:
+            self.owner_id = self.primary_id = person.id
+            return
+
+        print(f"👥 Primary person changed to #{person.id} - restarting the posture pipeline")
+        if self.primary_id == self.owner_id:
+            self._owner_calibration = (self.calibration_data, self.calibration_source)
+        self.primary_id = person.id
+        self.primary_switched = person.id != self.owner_id
+        self.tracker.reset()
+        self.score_history = []
+        self.current_score = 0
+        if self.motion_gate:
+            self.motion_gate.reset()
+        if self.drift_detector:
+            self.drift_detector.stop()
+        self.validating = False
+        self._stored_profile = None
+        self._geometry_samples = []
+        self._drift_save_pending = False
+
+        if not self.primary_switched and self._owner_calibration:
+            self.calibration_data, self.calibration_source = self._owner_calibration
+            self._owner_calibration = None
+            self._start_drift_detection()
+            return
+
+        baselines = person.baselines or (None, None)
+        self.calibration_data = {
+            'shoulder_hip_ratio': [],
+            'head_shoulder_ratio': [],
+            'frames': 0,
+            'complete': person.calibrated,
+            'baseline_shoulder_hip': baselines[0],
+            'baseline_head_shoulder': baselines[1]
+        }
+        self.calibration_source = 'tracked' if person.calibrated else None
+
+    def process_head_frame(self, image):
+        """
+        Score an RGB frame from face detection alone (head mode)
+        Returns: bool - True (inference ran)
+        """
+        start = time.perf_counter()
+        self._last_inference = start
+        features = self.head_pose.detect(image)
+        end = time.perf_counter()
+        INFERENCE_SECONDS.observe(end - start)
+        FRAMES_PROCESSED.inc()
+        self._count_fps(end)
+
+        if features:
+            self._record_score(self.head_pose.score(features))
+        else:
+            self.current_score = 0
+        return True
+
+    def _pose_probe_due(self, now):
+        """In head mode, whether to run full-body pose to check if the hips are back"""
+        if not self._probing and now - self._last_probe >= POSE_PROBE_INTERVAL:
+            self._probing = True
+            self._last_probe = now
+        return self._probing
+
+    def _update_mode(self, now):
+        """Switch between full-body and head mode on hip visibility (calibrated, person in frame)"""
+        if self.landmarks[HIPS, 3].mean() >= HIP_VISIBILITY:
+            self._hipless_frames = 0
+            if self.head_mode:
+                self.head_mode = False
+                print("🧍 Hips visible again - back to full-body posture")
+            return
+
+        self._hipless_frames += 1
+        # Face-only inference would stop tracking everyone else at a shared desk
+        if (not self.head_mode and self._hipless_frames >= HEAD_MODE_AFTER
+                and self.head_pose and self.head_pose.calibrated and not self.person_tracker):
+            self.head_mode = True
+            self._last_probe = now
+            self.tracker.reset()
+            print("🙂 Hips out of frame - switching to head-only posture")
+
+    def _count_fps(self, now):
+        self._fps_window_frames += 1
+        if now - self._fps_window_start >= 1.0:
+            POSTURE_FPS.set(self._fps_window_frames / (now - self._fps_window_start))
+            self._fps_window_start = now
+            self._fps_window_frames = 0
+
+    def _record_score(self, raw_score, landmarks=None):
+        """Smooth and publish a score from a frame with a person in it"""
+        self.current_score = self.smooth_score(raw_score)
+        self.last_detection_time = time.time()
+
+        if self.on_activity:
+            self.on_activity('presence', self.last_detection_time)
+
+        if self.channel:
+            self.channel.publish(
+                landmarks=landmarks,
+                posture=self.get_score(),
+                calibrated=self.calibration_data['complete']
+            )
+
+    def score_tracked(self, now):
+        """Re-score from landmarks predicted to `now` (frames without inference)"""
+        if self.head_mode or not self.tracker.initialized:
+            return
+        tracked = self.tracker.predict(now)
+        self.current_score = self.smooth_score(self.calculate_posture_score(as_landmarks(tracked)))
+
+    def run(self):
+        self.running = True
+        print("📹 Starting webcam...")
+
+        if not self.open_camera():
             print("❌ Could not open webcam")
             self.running = False
             return
 
         print("✅ Webcam opened")
-        print("⚙️ Calibration: Sit with GOOD posture for 3 seconds")
+        if not self.load_calibration():
+            print("⚙️ Calibration: Sit with GOOD posture for 3 seconds")
+
+        self._fps_window_start = time.perf_counter()
+        self._fps_window_frames = 0
 
+        read_failures = 0
         while self.running:
-            success, frame = self.camera.read()
+            read_start = time.perf_counter()
+            success, frame = self.preprocessor.read(self.camera)
+            CAPTURE_READ_SECONDS.observe(time.perf_counter() - read_start)
             if not success:
+                read_failures += 1
+                if read_failures >= MAX_READ_FAILURES:
+                    print("❌ Webcam stopped delivering frames")
+                    self.running = False
+                    break
                 time.sleep(0.1)
                 continue
 
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image.flags.writeable = False
-            results = self.pose.process(image)
-
-            if results.pose_landmarks:
-                raw_score = self.calculate_posture_score(results.pose_landmarks.landmark)
-
-                if not self.calibration_data['complete']:
-                    self.calibration_data['frames'] += 1
-
-                    if self.calibration_data['frames'] >= self.CALIBRATION_FRAMES:
-                        self.calibration_data['baseline_shoulder_hip'] = np.median(
-                            self.calibration_data['shoulder_hip_ratio']
-                        )
-                        self.calibration_data['baseline_head_shoulder'] = np.median(
-                            self.calibration_data['head_shoulder_ratio']
-                        )
-                        self.calibration_data['complete'] = True
-                        print("✅ Calibration complete!")
-
-                self.current_score = self.smooth_score(raw_score)
-                self.last_detection_time = time.time()
-
-            else:
-                self.current_score = 0
-
+            read_failures = 0
+            self.last_frame_time = time.time()
+            self.process_frame(frame)
             time.sleep(0.033)
 
+        POSTURE_FPS.set(0)
         if self.camera:
             self.camera.release()
 
@@ -215,6 +658,19 @@ class PostureDetector:
             return 0
         return self.current_score
 
+    def get_people(self):
+        """
+        Per-person scores when tracking several people
+        Returns: list of dicts (id, score, calibrated, visible) - empty in single-person mode
+        """
+        if not self.person_tracker:
+            return []
+        people = self.person_tracker.describe()
+        if time.time() - self.last_detection_time > 5:
+            for person in people:
+                person['score'] = 0
+        return people
+
     def get_status(self):
         score = self.get_score()
 
@@ -243,7 +699,15 @@ class PostureDetector:
             'color': color,
             'running': self.running,
             'calibrated': self.calibration_data['complete'],
-            'person_detected': score > 0 or not self.calibration_data['complete']
+            'calibration_source': self.calibration_source,
+            'drift': self.drift_detector.describe() if self.drift_detector else None,
+            'person_detected': score > 0 or not self.calibration_data['complete'],
+            'motion_gate': self.motion_gate.describe() if self.motion_gate else None,
+            'capture': self.capture_report,
+            'frame_buffers': self.preprocessor.describe(),
+            'pose_backend': self.backend.describe(),
+            'mode': 'head' if self.head_mode else 'full_body',
+            'people': self.get_people()
         }
 
     def reset_calibration(self):
@@ -256,6 +720,26 @@ class PostureDetector:
             'baseline_head_shoulder': None
         }
         self.score_history = []
+        self.tracker.reset()
+        if self.person_tracker:
+            self.person_tracker.reset()
+        self.primary_id = None
+        self.owner_id = None
+        self.primary_switched = False
+        self._owner_calibration = None
+        if self.motion_gate:
+            self.motion_gate.reset()
+        if self.head_pose:
+            self.head_pose.reset()
+        self.head_mode = False
+        self._hipless_frames = 0
+        self._probing = False
+        self.calibration_source = None
+        self.validating = False
+        self._geometry_samples = []
+        self._drift_save_pending = False
+        if self.drift_detector:
+            self.drift_detector.stop()
         print("🔄 Calibration reset")
 
     def stop(self):
@@ -263,8 +747,10 @@ class PostureDetector:
         self.running = False
         if self.camera:
             self.camera.release()
-        if self.pose:
-            self.pose.close()
+        if self.backend:
+            self.backend.close()
+        if self.head_pose:
+            self.head_pose.close()
 
 
 if __name__ == "__main__":
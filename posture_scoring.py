@@ -0,0 +1,182 @@
+"""
+Vectorized Posture Scoring for DevCare
+The calibrated branch of PostureDetector.calculate_posture_score over many
+frames at once: landmarks come in as an (N, 33, 4) array of x, y, z,
+visibility and every metric is a NumPy expression over all N rows.
+
+Used to re-score recorded sessions (batch_score.py) where a per-frame Python
+call would dominate the run time. Keep the thresholds in step with
+calculate_posture_score - the test mode below checks the two agree.
+"""
+
+import numpy as np
+
+NOSE, LEFT_EAR, RIGHT_EAR = 0, 7, 8
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_HIP, RIGHT_HIP = 23, 24
+
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+MIN_SHOULDER_WIDTH = 0.05
+
+# Component weights of the final score (same as calculate_posture_score)
+WEIGHTS = {
+    'torso': 0.35,
+    'head': 0.25,
+    'neck': 0.20,
+    'visibility': 0.12,
+    'symmetry': 0.08
+}
+
+
+def synthetic_pose(x=0.5, slouch=0.0, head_drop=0.0, scale=1.0, hip_y=0.85, jitter=0.0, rng=None):
+    """
+    Landmarks of a seated person facing the camera, for simulations and tests
+    x: horizontal centre; slouch: drops head and shoulders; head_drop: drops the head only
+    scale: upper body size in the frame (distance to the camera)
+    jitter: standard deviation of noise added to x and y (drawn from rng)
+    Returns: (33, 4) array of x, y, z, visibility
+    """
+    shoulder_y = 0.50 + slouch
+    ear_y = shoulder_y - 0.18 * scale + head_drop
+    points = np.tile([x, 0.5, 0.0, 0.5], (33, 1))
+    points[NOSE] = [x, ear_y - 0.02, -0.3, 0.99]
+    points[LEFT_EAR] = [x - 0.05 * scale, ear_y, -0.1, 0.98]
+    points[RIGHT_EAR] = [x + 0.05 * scale, ear_y, -0.1, 0.98]
+    points[LEFT_SHOULDER] = [x - 0.12 * scale, shoulder_y, 0.0, 0.99]
+    points[RIGHT_SHOULDER] = [x + 0.12 * scale, shoulder_y + 0.01, 0.0, 0.99]
+    points[LEFT_HIP] = [x - 0.08, hip_y, 0.0, 0.90]
+    points[RIGHT_HIP] = [x + 0.08, hip_y, 0.0, 0.90]
+    if jitter:
+        points[:, :2] += (rng or np.random.default_rng()).normal(0, jitter, (33, 2))
+    return points
+
+
+def posture_ratios(landmarks):
+    """
+    Compute the scale-free ratios the score is built from
+    landmarks: (N, 33, 4) array (rows of NaN for frames without a person)
+    Returns: dict of (N,) arrays - shoulder_width, shoulder_hip, head_shoulder,
+    head_forward, shoulder_tilt, visibility
+    """
+    lm = np.asarray(landmarks, dtype=np.float64)
+    left_shoulder, right_shoulder = lm[:, LEFT_SHOULDER], lm[:, RIGHT_SHOULDER]
+
+    shoulder_width = np.hypot(left_shoulder[:, X] - right_shoulder[:, X],
+                              left_shoulder[:, Y] - right_shoulder[:, Y])
+    shoulder_x = (left_shoulder[:, X] + right_shoulder[:, X]) / 2
+    shoulder_y = (left_shoulder[:, Y] + right_shoulder[:, Y]) / 2
+    hip_y = (lm[:, LEFT_HIP, Y] + lm[:, RIGHT_HIP, Y]) / 2
+    ear_x = (lm[:, LEFT_EAR, X] + lm[:, RIGHT_EAR, X]) / 2
+    ear_y = (lm[:, LEFT_EAR, Y] + lm[:, RIGHT_EAR, Y]) / 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'shoulder_width': shoulder_width,
+            'shoulder_hip': np.abs(hip_y - shoulder_y) / shoulder_width,
+            'head_shoulder': np.abs(shoulder_y - ear_y) / shoulder_width,
+            'head_forward': np.abs(ear_x - shoulder_x) / shoulder_width,
+            'shoulder_tilt': np.abs(left_shoulder[:, Y] - right_shoulder[:, Y]) / shoulder_width,
+            'visibility': lm[:, [NOSE, LEFT_EAR, RIGHT_EAR], VISIBILITY].mean(axis=1)
+        }
+
+
+def calibrate(landmarks, frames=90):
+    """
+    Baselines from the first `frames` usable rows, like PostureDetector's calibration
+    Returns: (baseline_shoulder_hip, baseline_head_shoulder), or None if no usable rows
+    """
+    ratios = posture_ratios(landmarks)
+    usable = np.flatnonzero(ratios['shoulder_width'] >= MIN_SHOULDER_WIDTH)[:frames]
+    if len(usable) == 0:
+        return None
+    return (float(np.median(ratios['shoulder_hip'][usable])),
+            float(np.median(ratios['head_shoulder'][usable])))
+
+
+def score_landmarks(landmarks, baseline_shoulder_hip, baseline_head_shoulder, weights=WEIGHTS, ratios=None):
+    """
+    Score many frames against calibrated baselines
+    landmarks: (N, 33, 4) array (rows of NaN for frames without a person)
+    baselines: floats, or (N,) arrays to score each row against its own (one row per person)
+    ratios: posture_ratios(landmarks) if the caller already has them
+    Returns: (N,) int array of scores 0-100 (0 where nobody usable is in frame)
+    """
+    r = ratios if ratios is not None else posture_ratios(landmarks)
+
+    # Each curve is continuous and piecewise linear, so it is written as
+    # min/max of its segments - np.select costs ~70 µs a call on the few rows
+    # of a live frame (one per person), ufuncs ~1 µs
+    deviation = (baseline_shoulder_hip - r['shoulder_hip']) / baseline_shoulder_hip
+    torso = np.clip(np.maximum(np.maximum(100 - deviation * 300, 55 - (deviation - 0.15) * 200),
+                               25 - (deviation - 0.30) * 100), 0, 100)
+
+    deviation = (baseline_head_shoulder - r['head_shoulder']) / baseline_head_shoulder
+    head = np.clip(np.maximum(np.maximum(100 - deviation * 400, 40 - (deviation - 0.15) * 200),
+                              10 - (deviation - 0.30) * 50), 0, 100)
+
+    forward = r['head_forward']
+    neck = np.minimum(100, np.maximum(np.maximum(100 - (forward - 0.15) * 500, 25 - (forward - 0.30) * 100), 20))
+
+    symmetry = np.clip(100 - (r['shoulder_tilt'] - 0.10) * 500, 50, 100)
+
+    visibility = r['visibility']
+    visible = np.minimum(100, np.maximum(np.maximum(70 + (visibility - 0.7) * 150, visibility * 100), 30))
+
+    final = (torso * weights['torso'] +
+             head * weights['head'] +
+             neck * weights['neck'] +
+             visible * weights['visibility'] +
+             symmetry * weights['symmetry'])
+
+    usable = r['shoulder_width'] >= MIN_SHOULDER_WIDTH  # False for NaN rows too
+    return np.where(usable, np.clip(np.nan_to_num(final), 0, 100), 0).astype(np.int64)
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import time
+    from collections import namedtuple
+
+    from posture_detector import PostureDetector
+
+    print("=" * 60)
+    print("VECTORIZED POSTURE SCORING - CONSISTENCY TEST")
+    print("=" * 60)
+
+    Landmark = namedtuple('Landmark', 'x y z visibility')
+    rng = np.random.default_rng(0)
+
+    # Upright seated person plus noise, drifting into a slouch
+    n = 5000
+    frames = np.tile(synthetic_pose(), (n, 1, 1))
+    drift = np.linspace(0, 0.15, n)
+    for index in (NOSE, LEFT_EAR, RIGHT_EAR, LEFT_SHOULDER, RIGHT_SHOULDER):
+        frames[:, index, Y] += drift
+    frames[:, :, :2] += rng.normal(0, 0.01, (n, 33, 2))
+    frames[:, :, VISIBILITY] = np.clip(frames[:, :, VISIBILITY] - rng.uniform(0, 0.4, (n, 33)), 0, 1)
+    frames[::50] = np.nan  # nobody in frame
+
+    baselines = calibrate(frames)
+    start = time.perf_counter()
+    vectorized = score_landmarks(frames, *baselines)
+    vector_time = time.perf_counter() - start
+
+    detector = PostureDetector()
+    detector.calibration_data.update(complete=True, baseline_shoulder_hip=baselines[0],
+                                     baseline_head_shoulder=baselines[1])
+    start = time.perf_counter()
+    scalar = [detector.calculate_posture_score(list(map(Landmark._make, row)))
+              if not np.isnan(row).any() else 0 for row in frames]
+    scalar_time = time.perf_counter() - start
+
+    mismatches = int(np.sum(vectorized != np.array(scalar)))
+    print(f"Frames:       {n}")
+    print(f"Mismatches:   {mismatches}")
+    print(f"Vectorized:   {vector_time * 1e6 / n:.2f} µs/frame")
+    print(f"Per-frame:    {scalar_time * 1e6 / n:.2f} µs/frame")
+    print(f"Mean score:   {vectorized.mean():.1f} (first 500: {vectorized[:500].mean():.1f}, "
+          f"last 500: {vectorized[-500:].mean():.1f})")
@@ -0,0 +1,352 @@
+"""
+Posture Worker Process for DevCare
+Runs PostureDetector in a separate process so MediaPipe inference does not
+compete for the GIL with Flask, the keyboard hook and the state loop.
+
+The worker sends compact fixed-size score records back over a pipe; the
+parent side (PostureProcess) has the same interface as PostureDetector and
+restarts the worker with exponential backoff if it crashes, hangs or loses
+the camera.
+"""
+
+import multiprocessing
+import struct
+import threading
+import time
+
+import metrics
+
+# timestamp, last_detection_time, last_frame_time, fps, score, flags,
+# people count, then MAX_PEOPLE slots of (person id, score, person flags)
+MAX_PEOPLE = 4   # people reported per record at a shared desk
+RECORD = struct.Struct('<dddfBBB' + 'IBB' * MAX_PEOPLE)
+FLAG_CALIBRATED = 0x01
+FLAG_RUNNING = 0x02
+FLAG_HEAD_MODE = 0x04
+PERSON_CALIBRATED = 0x01
+PERSON_VISIBLE = 0x02
+
+CMD_RESET_CALIBRATION = b'R'
+CMD_STOP = b'S'
+
+EXIT_CAMERA_FAILED = 3
+
+PUBLISH_INTERVAL = 0.1   # seconds between score records (10 Hz)
+HEARTBEAT_TIMEOUT = 10   # restart the worker if silent this long
+DETECTOR_TIMEOUT = 20    # restart it if the detector has read no frame this long
+MIN_BACKOFF = 1
+MAX_BACKOFF = 30
+STABLE_UPTIME = 60       # reset backoff once a worker survives this long
+
+WORKER_RESTARTS = metrics.counter(
+    'devcare_posture_worker_restarts_total', 'Posture worker process restarts')
+WORKER_ALIVE = metrics.gauge(
+    'devcare_posture_worker_alive', '1 while the posture worker process is running')
+POSTURE_FPS = metrics.gauge(
+    'devcare_posture_fps', 'Posture frames processed per second')
+
+
+def pack_people(people):
+    """
+    Flatten get_people() into the record's fixed person slots
+    Returns: tuple - count followed by MAX_PEOPLE (id, score, flags) triples
+    """
+    people = people[:MAX_PEOPLE]
+    fields = [len(people)]
+    for person in people:
+        flags = (PERSON_CALIBRATED if person['calibrated'] else 0) | (PERSON_VISIBLE if person['visible'] else 0)
+        fields += [person['id'], person['score'], flags]
+    fields += [0, 0, 0] * (MAX_PEOPLE - len(people))
+    return tuple(fields)
+
+
+def unpack_people(fields):
+    """
+    Inverse of pack_people
+    Returns: list of dicts like PostureDetector.get_people()
+    """
+    count, slots = fields[0], fields[1:]
+    return [{
+        'id': slots[i * 3],
+        'score': slots[i * 3 + 1],
+        'calibrated': bool(slots[i * 3 + 2] & PERSON_CALIBRATED),
+        'visible': bool(slots[i * 3 + 2] & PERSON_VISIBLE)
+    } for i in range(count)]
+
+
+def worker_main(conn, capture_profile=None, pose_backend=None, pose_model=None, max_people=1):
+    """Entry point of the worker process"""
+    import posture_detector
+    from posture_detector import PostureDetector
+
+    detector = PostureDetector(pose_backend, pose_model, max_people)
+    if capture_profile:
+        detector.capture_profile = capture_profile
+    thread = threading.Thread(target=detector.run, daemon=True)
+    thread.start()
+
+    # Give run() a moment to open the camera before checking it
+    while not detector.running and thread.is_alive():
+        time.sleep(0.01)
+
+    try:
+        while thread.is_alive():
+            if conn.poll():
+                command = conn.recv_bytes()
+                if command == CMD_RESET_CALIBRATION:
+                    detector.reset_calibration()
+                elif command == CMD_STOP:
+                    break
+
+            flags = 0
+            if detector.calibration_data['complete']:
+                flags |= FLAG_CALIBRATED
+            if detector.running:
+                flags |= FLAG_RUNNING
+            if detector.head_mode:
+                flags |= FLAG_HEAD_MODE
+
+            conn.send_bytes(RECORD.pack(
+                time.time(),
+                detector.last_detection_time,
+                detector.last_frame_time,
+                posture_detector.POSTURE_FPS.get(),
+                detector.get_score(),
+                flags,
+                *pack_people(detector.get_people())
+            ))
+            time.sleep(PUBLISH_INTERVAL)
+
+    except (BrokenPipeError, EOFError):
+        pass  # parent went away
+
+    finally:
+        camera_failed = not thread.is_alive() and not detector.running
+        detector.stop()
+
+    if camera_failed:
+        raise SystemExit(EXIT_CAMERA_FAILED)
+
+
+class PostureProcess:
+    def __init__(self, pose_backend=None, pose_model=None, max_people=1):
+        """Supervisor for a posture worker process (same API as PostureDetector)"""
+        self.ctx = multiprocessing.get_context('spawn')
+        self.process = None
+        self.conn = None
+        self.running = False
+        self.restarts = 0
+
+        self.current_score = 0
+        self.last_detection_time = 0
+        self.last_record_time = 0
+        self.last_frame_time = 0
+        self.worker_started = 0
+        self.calibrated = False
+        self.worker_running = False
+        self.head_mode = False
+        self.people = []
+        self.fps = 0.0
+
+        # Capture profile passed to the worker's PostureDetector (None = its default)
+        self.capture_profile = None
+
+        # Pose backend/model for the worker's PostureDetector (None = its defaults)
+        self.pose_backend = pose_backend
+        self.pose_model = pose_model
+        self.max_people = max_people
+
+        # Optional callable(source, timestamp) told when the worker sees a person
+        self.on_activity = None
+
+        print("🧩 Posture worker supervisor initialized")
+
+    def _start_worker(self):
+        parent_conn, child_conn = self.ctx.Pipe()
+        self.process = self.ctx.Process(
+            target=worker_main,
+            args=(child_conn, self.capture_profile, self.pose_backend, self.pose_model, self.max_people),
+            name='devcare-posture',
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.last_record_time = self.worker_started = time.time()
+        self.last_frame_time = 0
+        WORKER_ALIVE.set(1)
+        print(f"🧩 Posture worker started (pid {self.process.pid})")
+
+    def _apply_record(self, data):
+        timestamp, last_detection, last_frame, fps, score, flags, *people = RECORD.unpack(data)
+        self.last_record_time = timestamp
+        self.last_frame_time = last_frame
+        if self.on_activity and last_detection > self.last_detection_time:
+            self.on_activity('presence', last_detection)
+        self.last_detection_time = last_detection
+        self.fps = fps
+        self.current_score = score
+        self.calibrated = bool(flags & FLAG_CALIBRATED)
+        self.worker_running = bool(flags & FLAG_RUNNING)
+        self.head_mode = bool(flags & FLAG_HEAD_MODE)
+        self.people = unpack_people(people)
+        POSTURE_FPS.set(fps)
+
+    def detector_stalled(self, now=None):
+        """
+        Whether the worker still publishes but its detector has stopped reading frames
+        Returns: bool
+        """
+        now = now or time.time()
+        # Before the first frame, count from the worker start (model load, camera open)
+        return now - max(self.last_frame_time, self.worker_started) > DETECTOR_TIMEOUT
+
+    def _supervise_worker(self):
+        """
+        Read records until the worker exits or stops responding
+        Returns: str - why the worker ended
+        """
+        while self.running:
+            try:
+                if self.conn.poll(0.5):
+                    self._apply_record(self.conn.recv_bytes())
+                    if not self.detector_stalled():
+                        continue
+            except (EOFError, OSError):
+                break
+
+            if not self.process.is_alive():
+                break
+            if time.time() - self.last_record_time > HEARTBEAT_TIMEOUT:
+                print("⚠️ Posture worker stopped responding, killing it")
+                self.process.kill()
+                return 'hung'
+            if self.detector_stalled():
+                print("⚠️ Posture detector stopped reading frames, killing the worker")
+                self.process.kill()
+                return 'detector stalled'
+
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+
+        if self.process.exitcode == EXIT_CAMERA_FAILED:
+            return 'camera failure'
+        return f"exit code {self.process.exitcode}"
+
+    def run(self):
+        """Start the worker and keep it running (blocking, like PostureDetector.run)"""
+        self.running = True
+        backoff = MIN_BACKOFF
+
+        while self.running:
+            started = time.time()
+            self._start_worker()
+            reason = self._supervise_worker()
+
+            self.worker_running = False
+            self.fps = 0.0
+            WORKER_ALIVE.set(0)
+            POSTURE_FPS.set(0)
+            if self.conn:
+                self.conn.close()
+
+            if not self.running:
+                break
+
+            if time.time() - started > STABLE_UPTIME:
+                backoff = MIN_BACKOFF
+
+            self.restarts += 1
+            WORKER_RESTARTS.inc()
+            print(f"⚠️ Posture worker ended ({reason}), restarting in {backoff}s")
+
+            deadline = time.time() + backoff
+            while self.running and time.time() < deadline:
+                time.sleep(0.1)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def _send(self, command):
+        try:
+            if self.conn:
+                self.conn.send_bytes(command)
+        except (BrokenPipeError, OSError):
+            pass
+
+    def get_score(self):
+        # A silent worker must not leave a stale score on the dashboard
+        if time.time() - self.last_record_time > 5:
+            return 0
+        return self.current_score
+
+    def get_people(self):
+        if time.time() - self.last_record_time > 5:
+            return [dict(person, score=0) for person in self.people]
+        return self.people
+
+    def get_status(self):
+        score = self.get_score()
+
+        # Mirrors PostureDetector.get_status
+        if not self.calibrated:
+            status = "Calibrating..."
+            color = "yellow"
+        elif score == 0:
+            status = "No person detected"
+            color = "gray"
+        elif score >= 80:
+            status = "Excellent posture"
+            color = "green"
+        elif score >= 60:
+            status = "Good posture"
+            color = "yellow"
+        elif score >= 40:
+            status = "Poor posture"
+            color = "orange"
+        else:
+            status = "Bad posture"
+            color = "red"
+
+        return {
+            'score': score,
+            'status': status,
+            'color': color,
+            'running': self.running and self.worker_running,
+            'calibrated': self.calibrated,
+            'person_detected': score > 0 or not self.calibrated,
+            'mode': 'head' if self.head_mode else 'full_body',
+            'people': self.get_people(),
+            'worker': {
+                'pid': self.process.pid if self.process else None,
+                'alive': bool(self.process and self.process.is_alive()),
+                'restarts': self.restarts,
+                'fps': round(self.fps, 1)
+            }
+        }
+
+    def reset_calibration(self):
+        self._send(CMD_RESET_CALIBRATION)
+        print("🔄 Calibration reset requested")
+
+    def stop(self):
+        print("⏹️ Stopping posture worker...")
+        self.running = False
+        self._send(CMD_STOP)
+        if self.process:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+
+
+if __name__ == "__main__":
+    supervisor = PostureProcess()
+    thread = threading.Thread(target=supervisor.run, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            print(supervisor.get_status())
+            time.sleep(1)
+    except KeyboardInterrupt:
+        supervisor.stop()
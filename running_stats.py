@@ -0,0 +1,82 @@
+"""
+Running Statistics for DevCare
+Aggregates that update in O(1) per value and answer queries without keeping
+(or rescanning) the values themselves.
+"""
+
+import math
+
+
+class RunningStats:
+    def __init__(self):
+        """Count, sum, min, max and Welford mean/variance of a stream of values"""
+        self.count = 0
+        self.total = 0.0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared differences from the mean
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
+
+        # Welford's update - numerically stable, no second pass
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Sample variance (0 with fewer than two values)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Approximate quantiles of positive values with bounded relative error
+        (log-spaced buckets, as in DDSketch). Memory grows with the log of the
+        value range, not with the number of values.
+
+        relative_accuracy: e.g. 0.01 - any quantile is within 1% of a true value
+        """
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile (0 <= q <= 1)
+        Returns: float, or None if nothing was added
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
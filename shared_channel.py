@@ -0,0 +1,285 @@
+"""
+Shared-Memory Metrics Channel for DevCare
+A fixed-layout ring buffer in multiprocessing.shared_memory that carries
+timestamped posture/typing/break records plus the 33 pose landmarks.
+
+One process writes (devcareapp); any local process (tray, dashboard, scripts)
+can read the latest record without HTTP or serialization. Each slot is
+guarded by a seqlock: the writer makes the slot's sequence odd while it
+writes and even when done, and readers retry if the sequence was odd or
+changed while they were copying. Retries are bounded, so a writer that died
+mid-write leaves one unreadable slot rather than spinning readers forever.
+"""
+
+import os
+import struct
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+MAGIC = b'DVC1'
+VERSION = 1
+DEFAULT_NAME = 'devcare'
+DEFAULT_SLOTS = 64
+NUM_LANDMARKS = 33
+
+# magic, version, slot count, slot size, records written
+HEADER = struct.Struct('<4sHHIQ')
+HEADER_SIZE = 32
+
+# seq, pad, timestamp, posture, stress, flags, pad, typing_speed, breaks_taken, time_working
+SLOT_HEADER = struct.Struct('<IIdBBBBHHI')
+SLOT_HEADER_SIZE = 32
+LANDMARKS_SIZE = NUM_LANDMARKS * 4 * 4  # x, y, z, visibility as float32
+SLOT_SIZE = SLOT_HEADER_SIZE + LANDMARKS_SIZE
+
+FLAG_CALIBRATED = 0x01
+FLAG_SHOULD_BREAK = 0x02
+FLAG_HAS_LANDMARKS = 0x04
+
+STRESS_LEVELS = ('Low', 'Medium', 'High')
+STRESS_CODES = {level: code for code, level in enumerate(STRESS_LEVELS)}
+
+# Seqlock retries: spin briefly (a write takes microseconds), then back off.
+# READ_TIMEOUT bounds how long read() waits on a slot by the clock, not by a
+# retry count: sleeps round up to the OS tick (~15 ms on Windows)
+READ_TIMEOUT = 0.05
+SPIN_ATTEMPTS = 10
+RETRY_SLEEP = 0.00005
+
+_SEQ = struct.Struct('<I')
+_WRITE_COUNT = struct.Struct('<Q')
+_WRITE_COUNT_OFFSET = 12
+
+
+class SharedChannelWriter:
+    def __init__(self, name=DEFAULT_NAME, slots=DEFAULT_SLOTS):
+        """
+        Create the shared-memory segment
+        name: segment name readers attach to
+        slots: ring size (records kept for readers that fall behind)
+        """
+        self.name = name
+        self.slots = slots
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=HEADER_SIZE + slots * SLOT_SIZE)
+        except FileExistsError:
+            # Left behind by a crashed run - take it over
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True,
+                                                  size=HEADER_SIZE + slots * SLOT_SIZE)
+
+        self.buf = self.shm.buf
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, SLOT_SIZE, 0)
+        self.landmarks = _landmark_views(self.buf, slots)
+
+        self.written = 0
+        self._lock = threading.Lock()  # serializes writers within this process
+
+        # Latest value of every field; each publish writes a full snapshot
+        self.fields = {
+            'posture': 0,
+            'stress': 'Low',
+            'typing_speed': 0,
+            'breaks_taken': 0,
+            'time_working': 0,
+            'calibrated': False,
+            'should_break': False
+        }
+        self.has_landmarks = False
+        self._pending_landmarks = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+
+        print(f"🔗 Shared channel '{name}' created ({slots} slots)")
+
+    def publish(self, landmarks=None, **fields):
+        """
+        Write a record with the given fields changed
+        landmarks: optional (33, 4) array of x, y, z, visibility
+        """
+        with self._lock:
+            self.fields.update(fields)
+            if landmarks is not None:
+                self._pending_landmarks[:] = landmarks
+                self.has_landmarks = True
+
+            f = self.fields
+            flags = 0
+            if f['calibrated']:
+                flags |= FLAG_CALIBRATED
+            if f['should_break']:
+                flags |= FLAG_SHOULD_BREAK
+            if self.has_landmarks:
+                flags |= FLAG_HAS_LANDMARKS
+
+            index = self.written % self.slots
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            seq = _SEQ.unpack_from(self.buf, offset)[0]
+
+            _SEQ.pack_into(self.buf, offset, seq + 1)  # odd: write in progress
+            SLOT_HEADER.pack_into(
+                self.buf, offset,
+                seq + 1, 0,
+                time.time(),
+                max(0, min(100, int(f['posture']))),
+                STRESS_CODES.get(f['stress'], 0),
+                flags, 0,
+                min(0xFFFF, int(f['typing_speed'])),
+                min(0xFFFF, int(f['breaks_taken'])),
+                int(f['time_working'])
+            )
+            self.landmarks[index][:] = self._pending_landmarks
+            _SEQ.pack_into(self.buf, offset, seq + 2)  # even: slot consistent
+
+            self.written += 1
+            _WRITE_COUNT.pack_into(self.buf, _WRITE_COUNT_OFFSET, self.written)
+
+    def close(self):
+        """Release and remove the segment"""
+        self.landmarks = None
+        self.buf = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedChannelReader:
+    def __init__(self, name=DEFAULT_NAME):
+        """Attach to an existing channel (raises FileNotFoundError if absent)"""
+        # Readers don't own the segment; keep the resource tracker from
+        # unlinking it when this process exits
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            if os.name == 'posix':
+                # Tracked under the POSIX name, which has a leading slash
+                resource_tracker.unregister('/' + self.shm.name, 'shared_memory')
+        self.buf = self.shm.buf
+
+        magic, version, slots, slot_size, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION or slot_size != SLOT_SIZE:
+            self.shm.close()
+            raise ValueError(f"Shared channel '{name}' has an incompatible layout")
+
+        self.slots = slots
+        self.landmarks = _landmark_views(self.buf, slots)
+
+    def written(self):
+        """
+        Get the number of records written so far
+        Returns: int
+        """
+        return _WRITE_COUNT.unpack_from(self.buf, _WRITE_COUNT_OFFSET)[0]
+
+    def read(self, record_number, with_landmarks=True):
+        """
+        Read one record by its sequence number (0-based)
+        Returns: dict, or None if it has been overwritten, not written yet or
+        stayed mid-write (writer crashed) for READ_TIMEOUT seconds
+        """
+        if record_number < 0 or record_number >= self.written():
+            return None
+
+        index = record_number % self.slots
+        offset = HEADER_SIZE + index * SLOT_SIZE
+
+        deadline = time.perf_counter() + READ_TIMEOUT
+        attempt = 0
+        while True:
+            seq_before = _SEQ.unpack_from(self.buf, offset)[0]
+            if not seq_before & 1:  # even: no write in progress
+                (_, _, timestamp, posture, stress, flags, _,
+                 typing_speed, breaks_taken, time_working) = SLOT_HEADER.unpack_from(self.buf, offset)
+                landmarks = None
+                if with_landmarks and flags & FLAG_HAS_LANDMARKS:
+                    landmarks = self.landmarks[index].copy()
+
+                if _SEQ.unpack_from(self.buf, offset)[0] == seq_before:
+                    break
+
+            attempt += 1
+            if attempt > SPIN_ATTEMPTS:
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(RETRY_SLEEP)
+
+        # The slot has been reused by a newer record since we asked for it
+        if self.written() - record_number > self.slots:
+            return None
+
+        return {
+            'timestamp': timestamp,
+            'posture': posture,
+            'stress': STRESS_LEVELS[stress] if stress < len(STRESS_LEVELS) else 'Low',
+            'typing_speed': typing_speed,
+            'breaks_taken': breaks_taken,
+            'time_working': time_working,
+            'calibrated': bool(flags & FLAG_CALIBRATED),
+            'should_break': bool(flags & FLAG_SHOULD_BREAK),
+            'landmarks': landmarks
+        }
+
+    def latest(self, with_landmarks=True):
+        """
+        Read the newest record
+        Returns: dict, or None if nothing has been written yet (or it can't be read)
+        """
+        while True:
+            written = self.written()
+            if written == 0:
+                return None
+            record = self.read(written - 1, with_landmarks)
+            if record is not None or self.written() == written:
+                return record
+            # Overwritten while reading - a newer record is there now
+
+    def get(self, key, default=None):
+        """
+        dict-style access so DashboardWindow / SystemTrayApp can use a reader
+        in place of the in-process state dict
+        """
+        record = self.latest(with_landmarks=False)
+        if record is None:
+            return default
+        if key == 'time':
+            return f"{record['time_working']} min"
+        return record.get(key, default)
+
+    def close(self):
+        self.landmarks = None
+        self.buf = None
+        self.shm.close()
+
+
+def _landmark_views(buf, slots):
+    """numpy views straight onto each slot's landmark block (no copies)"""
+    return [
+        np.ndarray((NUM_LANDMARKS, 4), dtype=np.float32, buffer=buf,
+                   offset=HEADER_SIZE + i * SLOT_SIZE + SLOT_HEADER_SIZE)
+        for i in range(slots)
+    ]
+
+
+# ==========================================
+# TEST CODE (Run this file directly to watch a running DevCare)
+# ==========================================
+
+if __name__ == "__main__":
+    reader = SharedChannelReader()
+    try:
+        while True:
+            record = reader.latest(with_landmarks=False)
+            if record:
+                print(f"Posture: {record['posture']:3d} | Stress: {record['stress']:<6} | "
+                      f"Typing: {record['typing_speed']} keys/min | Breaks: {record['breaks_taken']}")
+            time.sleep(1)
+    except KeyboardInterrupt:
+        reader.close()
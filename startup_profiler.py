@@ -0,0 +1,231 @@
+"""
+Startup Profiler for DevCare
+Times heavy imports, component constructors, camera open and first inference
+
+Run with: python devcareapp.py --profile-startup [--profile-output FILE] [--startup-budget SECONDS]
+"""
+
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+# Imports we care about, each timed cold in a fresh interpreter so the
+# numbers don't depend on import order or on what devcareapp already loaded
+PROFILED_IMPORTS = ['cv2', 'mediapipe', 'pynput', 'flask', 'customtkinter']
+
+# Give up waiting for a detected person after this many seconds
+FIRST_INFERENCE_TIMEOUT = 15
+
+IMPORT_TIMER = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import {module}\n"
+    "sys.stdout.write(repr(time.perf_counter() - start))\n"
+)
+
+
+class StartupProfiler:
+    def __init__(self):
+        """Initialize an empty profile"""
+        self.entries = []
+        self.started = time.perf_counter()
+        self.capture = None  # negotiated webcam properties, if a camera opened
+
+    @contextmanager
+    def measure(self, name, category):
+        """
+        Time the wrapped block and record it (errors are recorded, not raised)
+        """
+        entry = {'name': name, 'category': category, 'seconds': None, 'ok': False, 'error': None}
+        start = time.perf_counter()
+        try:
+            yield entry
+            entry['ok'] = entry['error'] is None
+        except Exception as e:
+            entry['error'] = str(e)
+        finally:
+            entry['seconds'] = round(time.perf_counter() - start, 4)
+            self.entries.append(entry)
+
+    def record(self, name, category, seconds, error=None):
+        """Record a measurement taken elsewhere"""
+        self.entries.append({
+            'name': name,
+            'category': category,
+            'seconds': round(seconds, 4) if seconds is not None else None,
+            'ok': error is None,
+            'error': error
+        })
+
+    def time_import(self, module):
+        """Time a cold import of module in a fresh interpreter"""
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-c', IMPORT_TIMER.format(module=module)],
+            capture_output=True,
+            text=True
+        )
+        if proc.returncode == 0:
+            self.record(f"import {module}", 'import', float(proc.stdout.strip()))
+        else:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'import failed'
+            self.record(f"import {module}", 'import', time.perf_counter() - start, error)
+
+    def construct(self, module_name, class_name):
+        """
+        Time one component constructor (the module import is already timed
+        separately, so it is done before the clock starts)
+        Returns: the instance, or None on failure
+        """
+        name = f"{class_name}()"
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except ImportError as e:
+            self.record(name, 'constructor', None, str(e))
+            return None
+
+        instance = None
+        with self.measure(name, 'constructor'):
+            instance = cls()
+        return instance
+
+    def profile_components(self):
+        """Time each component constructor, camera open and first inference"""
+        detector = self.construct('posture_detector', 'PostureDetector')
+        self.construct('typing_analyzer', 'TypingAnalyzer')
+        self.construct('break_manager', 'BreakManager')
+
+        if detector is None:
+            self.record('camera open', 'camera', None, 'posture detector unavailable')
+            self.record('first inference', 'inference', None, 'posture detector unavailable')
+            return
+
+        try:
+            with self.measure('camera open', 'camera') as entry:
+                if not detector.open_camera():
+                    entry['error'] = 'could not open webcam'
+
+            if entry['error']:
+                self.record('first inference', 'inference', None, 'no camera')
+                return
+
+            self.capture = detector.capture_report
+
+            self.profile_first_inference(detector)
+        finally:
+            detector.stop()
+
+    def profile_first_inference(self, detector):
+        """Time from camera open until the first frame with pose landmarks"""
+        start = time.perf_counter()
+        first_frame = None
+
+        while time.perf_counter() - start < FIRST_INFERENCE_TIMEOUT:
+            success, frame = detector.camera.read()
+            if not success:
+                time.sleep(0.01)
+                continue
+
+            if first_frame is None:
+                first_frame = time.perf_counter() - start
+                self.record('first frame', 'camera', first_frame)
+
+            image = detector.preprocessor.to_rgb(frame)
+            result = detector.backend.detect(image, int(time.perf_counter() * 1000), wait=True)
+            if result and result.landmarks:
+                self.record('first inference', 'inference', time.perf_counter() - start)
+                return
+
+        self.record('first inference', 'inference', None,
+                    f"no person detected within {FIRST_INFERENCE_TIMEOUT}s")
+
+    def run(self):
+        """Profile everything"""
+        for module in PROFILED_IMPORTS:
+            self.time_import(module)
+        self.profile_components()
+
+    def total_seconds(self):
+        return round(time.perf_counter() - self.started, 4)
+
+    def to_dict(self):
+        """
+        Get the profile as machine-readable data
+        Returns: dict
+        """
+        return {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'total_seconds': self.total_seconds(),
+            'entries': self.sorted_entries(),
+            'capture': self.capture
+        }
+
+    def sorted_entries(self):
+        """Entries slowest first (failed entries without a time go last)"""
+        return sorted(self.entries, key=lambda e: -(e['seconds'] or 0))
+
+    def format_report(self):
+        """
+        Get a human-readable report, slowest first
+        Returns: str
+        """
+        lines = [
+            "=" * 60,
+            "DEVCARE - STARTUP PROFILE",
+            "=" * 60,
+            f"{'Step':<28}{'Category':<14}{'Seconds':>10}",
+            "-" * 60
+        ]
+        for entry in self.sorted_entries():
+            seconds = f"{entry['seconds']:.3f}" if entry['seconds'] is not None else '--'
+            marker = '' if entry['ok'] else f"  ❌ {entry['error']}"
+            lines.append(f"{entry['name']:<28}{entry['category']:<14}{seconds:>10}{marker}")
+        lines.append("-" * 60)
+        lines.append(f"{'Total profiling time':<42}{self.total_seconds():>10.3f}")
+        if self.capture:
+            from capture_profiles import format_capture_report
+            lines.append(f"Capture: {format_capture_report(self.capture)}")
+        lines.append("=" * 60)
+        return '\n'.join(lines)
+
+
+def run_profile(output_path='startup_profile.json', budget=None):
+    """
+    Run the startup profile, print the report and write JSON
+    Args:
+        output_path: str - where to write the JSON profile ('-' for stdout)
+        budget: float - optional startup budget in seconds
+    Returns: int - exit code (1 if the budget was exceeded)
+    """
+    profiler = StartupProfiler()
+    profiler.run()
+
+    print(profiler.format_report())
+
+    data = profiler.to_dict()
+    if output_path == '-':
+        print(json.dumps(data, indent=2))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"📄 Profile written to {output_path}")
+
+    if budget is not None:
+        # The budget covers what a real startup pays: imports + constructors + camera + first inference
+        spent = sum(e['seconds'] or 0 for e in data['entries'] if e['name'] != 'first frame')
+        if spent > budget:
+            print(f"❌ Startup budget exceeded: {spent:.2f}s > {budget:.2f}s")
+            return 1
+        print(f"✅ Within startup budget: {spent:.2f}s <= {budget:.2f}s")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run_profile())
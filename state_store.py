@@ -0,0 +1,53 @@
+"""
+Versioned State for DevCare
+A drop-in replacement for the global state dict that bumps a version number
+whenever a value actually changes, so UIs can skip work when nothing did
+"""
+
+import threading
+
+
+class VersionedState(dict):
+    def __init__(self, *args, **kwargs):
+        """Same arguments as dict()"""
+        super().__init__(*args, **kwargs)
+        self.version = 0
+        self._listeners = []
+        self._changed = threading.Condition()
+
+    def __setitem__(self, key, value):
+        # Writing the same value again is not a change
+        if key in self and dict.__getitem__(self, key) == value:
+            return
+
+        with self._changed:
+            dict.__setitem__(self, key, value)
+            self.version += 1
+            self._changed.notify_all()
+
+        for listener in list(self._listeners):
+            listener(self.version)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def subscribe(self, listener):
+        """
+        Call listener(version) after every change (on the writer's thread,
+        so listeners must be cheap and must not touch UI widgets)
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def wait_for_change(self, version, timeout=None):
+        """
+        Block until the state is newer than version
+        Returns: int - the current version
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
@@ -6,9 +6,14 @@ NOTE: This is OPTIONAL and complex. Skip if short on time!
 """
 
 import sys
+import threading
+import time
+from functools import lru_cache
 from PIL import Image, ImageDraw
 import io
 
+from command_bus import bus
+
 try:
     import pystray
     from pystray import MenuItem as item
@@ -20,23 +25,47 @@ except ImportError:
     print("   Install with: pip install pystray")
 
 
-def create_icon_image(posture_score):
+ICON_SIZE = 64
+
+ICON_COLORS = {
+    'good': (0, 200, 0),    # Green
+    'ok': (255, 200, 0),    # Yellow
+    'bad': (255, 0, 0)      # Red
+}
+
+# Progress ring granularity (score rounded down to this many points)
+RING_STEP = 10
+
+
+def score_band(posture_score):
     """
-    Create a colored icon based on posture score
-    Green = good, Yellow = ok, Red = bad
+    Get the icon band for a posture score
+    Returns: str - 'good', 'ok' or 'bad'
     """
-    # Create a 64x64 image
-    size = 64
-    image = Image.new('RGB', (size, size), 'white')
-    draw = ImageDraw.Draw(image)
-
-    # Choose color based on score
     if posture_score >= 80:
-        color = (0, 200, 0)  # Green
+        return 'good'
     elif posture_score >= 60:
-        color = (255, 200, 0)  # Yellow
-    else:
-        color = (255, 0, 0)  # Red
+        return 'ok'
+    return 'bad'
+
+
+def icon_key(posture_score, ring=False):
+    """
+    Cache key for a score: the band, plus the rounded score if a ring is drawn
+    Returns: tuple
+    """
+    band = score_band(posture_score)
+    if not ring:
+        return (band, None)
+    return (band, min(100, max(0, int(posture_score))) // RING_STEP * RING_STEP)
+
+
+@lru_cache(maxsize=None)
+def _render_icon(band, ring_score):
+    size = ICON_SIZE
+    image = Image.new('RGB', (size, size), 'white')
+    draw = ImageDraw.Draw(image)
+    color = ICON_COLORS[band]
 
     # Draw a circle
     margin = 8
@@ -47,16 +76,41 @@ def create_icon_image(posture_score):
         width=2
     )
 
+    # Optional progress ring around the circle
+    if ring_score is not None and ring_score > 0:
+        draw.arc(
+            [2, 2, size - 2, size - 2],
+            start=-90,
+            end=-90 + 360 * ring_score / 100,
+            fill=color,
+            width=4
+        )
+
     return image
 
 
+def create_icon_image(posture_score, ring=False):
+    """
+    Get a colored icon based on posture score
+    Green = good, Yellow = ok, Red = bad
+    Icons are rendered once per band (and ring step) and then reused
+    """
+    return _render_icon(*icon_key(posture_score, ring))
+
+
 class SystemTrayApp:
-    def __init__(self, state_dict):
+    def __init__(self, state_dict, commands=None, show_ring=False):
         """
         state_dict: Reference to the global state dictionary
+        commands: CommandBus for menu actions (defaults to the shared bus)
+        show_ring: draw a progress ring showing the score in 10-point steps
         """
         self.state = state_dict
+        self.commands = commands or bus
         self.icon = None
+        self.show_ring = show_ring
+        self._icon_key = None
+        self._updating = False
 
         if not HAS_TRAY:
             print("❌ System tray not available")
@@ -97,21 +151,40 @@ class SystemTrayApp:
         )
 
     def update_icon(self):
-        """Update icon based on current posture"""
-        if self.icon:
-            posture = self.state.get('posture', 0)
-            image = create_icon_image(posture)
-            self.icon.icon = image
+        """
+        Update icon based on current posture (only swaps the image when the band changes)
+        Returns: bool - True if the icon was swapped
+        """
+        if not self.icon:
+            return False
+
+        key = icon_key(self.state.get('posture', 0), self.show_ring)
+        if key == self._icon_key:
+            return False
+
+        self._icon_key = key
+        self.icon.icon = _render_icon(*key)
+        return True
+
+    def icon_update_loop(self):
+        """Keep the icon in sync with the state (background thread)"""
+        version = None
+        while self._updating:
+            if hasattr(self.state, 'wait_for_change'):
+                # Sleeps until the state changes (timeout so stop() is noticed)
+                version = self.state.wait_for_change(version, timeout=1)
+            else:
+                time.sleep(1)
+            self.update_icon()
 
     def open_dashboard(self):
         """Open the full dashboard window"""
         print("📊 Opening dashboard...")
         try:
             from ui_dashboard import DashboardWindow
-            import threading
 
             def launch():
-                dashboard = DashboardWindow(self.state)
+                dashboard = DashboardWindow(self.state, self.commands)
                 dashboard.run()
 
             threading.Thread(target=launch, daemon=True).start()
@@ -120,16 +193,16 @@ class SystemTrayApp:
 
     def take_break(self):
         """Record a break"""
-        import requests
-        try:
-            requests.post('http://localhost:5000/break', timeout=1)
+        result = self.commands.dispatch('take_break')
+        if result.get('success'):
             print("✅ Break recorded!")
-        except:
-            print("❌ Could not record break")
+        else:
+            print(f"❌ Could not record break: {result.get('message')}")
 
     def quit_app(self):
         """Quit the application"""
         print("👋 Quitting DevCare...")
+        self._updating = False
         if self.icon:
             self.icon.stop()
         sys.exit(0)
@@ -138,6 +211,9 @@ class SystemTrayApp:
         """Run the system tray (blocking)"""
         if self.icon:
             print("✅ System tray active")
+            self._updating = True
+            self.update_icon()
+            threading.Thread(target=self.icon_update_loop, daemon=True).start()
             self.icon.run()
         else:
             print("❌ System tray not available")
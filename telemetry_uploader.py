@@ -0,0 +1,423 @@
+"""
+Telemetry Uploader for DevCare
+Ships this machine's scores to a fleet collector (fleet_collector.py) without
+an HTTP call per sample.
+
+update_state_loop hands every state snapshot to record(), which only appends
+to a bounded in-memory buffer. A background thread packs the buffer into a
+compact binary frame (timeseries_codec: delta-of-delta timestamps, one byte
+per score, bit-packed stress and flags), zlib compresses it and POSTs it.
+If the collector is unreachable, frames go to a local spool file and are
+retried with exponential backoff.
+"""
+
+import getpass
+import os
+import socket
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from collections import deque
+
+import numpy as np
+
+import metrics
+from timeseries_codec import SAMPLE_SCHEMA, decode_block, encode_block
+
+FRAME_CONTENT_TYPE = 'application/x-devcare-frame'
+FRAME_MAGIC = b'DCTF'
+FRAME_VERSION = 2
+
+# magic, version, agent id length, team length, sample count, first timestamp
+FRAME_HEADER = struct.Struct('<4sBBBHd')
+# Version 1 body: ms since previous sample, posture, stress, typing speed, breaks taken, flags
+V1_SAMPLE = struct.Struct('<IBBHHB')
+
+STRESS_LEVELS = ('Low', 'Medium', 'High')
+STRESS_CODES = {level: code for code, level in enumerate(STRESS_LEVELS)}
+
+MAX_FRAME_SAMPLES = 0xFFFF
+SPOOL_RECORD = struct.Struct('<I')  # length prefix of each spooled frame
+
+MIN_BACKOFF = 1
+MAX_BACKOFF = 300
+
+SAMPLES_RECORDED = metrics.counter(
+    'devcare_telemetry_samples_total', 'Samples handed to the telemetry uploader')
+SAMPLES_DROPPED = metrics.counter(
+    'devcare_telemetry_samples_dropped_total', 'Samples dropped because buffers were full')
+FRAMES_UPLOADED = metrics.counter(
+    'devcare_telemetry_frames_uploaded_total', 'Frames accepted by the collector')
+UPLOAD_FAILURES = metrics.counter(
+    'devcare_telemetry_upload_failures_total', 'Failed frame uploads')
+FRAMES_DROPPED = metrics.counter(
+    'devcare_telemetry_frames_dropped_total', 'Spooled frames dropped to keep the spool bounded')
+UPLOAD_BYTES = metrics.counter(
+    'devcare_telemetry_upload_bytes_total', 'Compressed bytes uploaded')
+
+
+def default_agent_id():
+    """
+    Identify this agent
+    Returns: str - 'user@hostname'
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = 'unknown'
+    return f"{user}@{socket.gethostname()}"
+
+
+# ==========================================
+# FRAME ENCODING
+# ==========================================
+
+def encode_frame(agent_id, team, samples):
+    """
+    Pack samples into one compressed frame (see timeseries_codec.py for the layout)
+    samples: sequence of (timestamp, posture, stress_code, typing_speed, breaks_taken, should_break)
+    Returns: bytes
+    """
+    agent = agent_id.encode()[:255]
+    team_bytes = team.encode()[:255]
+    samples = list(samples)[:MAX_FRAME_SAMPLES]
+    base = samples[0][0] if samples else 0.0
+
+    rows = np.array(samples, dtype=np.float64).reshape(len(samples), 1 + len(SAMPLE_SCHEMA))
+    columns = {name: rows[:, i + 1] for i, (name, _) in enumerate(SAMPLE_SCHEMA)}
+
+    return zlib.compress(b''.join((
+        FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(agent), len(team_bytes), len(samples), base),
+        agent,
+        team_bytes,
+        encode_block(rows[:, 0], columns)
+    )), 6)
+
+
+def decompress_limited(data, limit, wbits=zlib.MAX_WBITS):
+    """
+    zlib/gzip-decompress data, refusing anything that inflates past limit bytes
+    wbits: zlib.MAX_WBITS for zlib streams, 16 + zlib.MAX_WBITS for gzip
+    Returns: bytes
+    Raises: ValueError if the output would exceed limit or the stream is truncated
+    """
+    decompressor = zlib.decompressobj(wbits)
+    raw = decompressor.decompress(data, limit)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"decompresses to more than {limit} bytes")
+    if not decompressor.eof:
+        raise ValueError("truncated compressed data")
+    return raw
+
+
+def decode_frame(data, max_size=None):
+    """
+    Unpack a compressed frame
+    max_size: refuse frames that decompress to more than this many bytes
+    Returns: dict - {'agent_id', 'team', 'samples': [{'ts', 'posture', 'stress', ...}]}
+    Raises: ValueError if the frame is malformed
+    """
+    try:
+        raw = decompress_limited(data, max_size) if max_size else zlib.decompress(data)
+        magic, version, agent_len, team_len, count, base = FRAME_HEADER.unpack_from(raw, 0)
+    except (zlib.error, struct.error) as e:
+        raise ValueError(f"corrupt frame: {e}")
+    if magic != FRAME_MAGIC or version not in (1, FRAME_VERSION):
+        raise ValueError(f"unsupported frame {magic!r} v{version}")
+
+    offset = FRAME_HEADER.size
+    agent_id = raw[offset:offset + agent_len].decode()
+    offset += agent_len
+    team = raw[offset:offset + team_len].decode()
+    offset += team_len
+
+    if version == 1:
+        samples = _decode_v1_samples(raw, offset, count, base)
+    else:
+        timestamps, columns = decode_block(raw, offset=offset)
+        if len(timestamps) != count:
+            raise ValueError(f"frame header says {count} samples, block holds {len(timestamps)}")
+        samples = [
+            {'ts': ts, 'posture': posture, 'stress': stress, 'typing_speed': typing_speed,
+             'breaks_taken': breaks_taken, 'should_break': should_break}
+            for ts, posture, stress, typing_speed, breaks_taken, should_break in zip(
+                timestamps.tolist(), *(columns[name].tolist() for name, _ in SAMPLE_SCHEMA))
+        ]
+    return {'agent_id': agent_id, 'team': team, 'samples': samples}
+
+
+def _decode_v1_samples(raw, offset, count, base):
+    """Version 1 frames (fixed-size struct per sample) may still sit in older spool files"""
+    if len(raw) != offset + count * V1_SAMPLE.size:
+        raise ValueError(f"frame length does not match {count} samples")
+
+    samples = []
+    ts = base
+    for delta_ms, posture, stress, typing_speed, breaks_taken, flags in V1_SAMPLE.iter_unpack(raw[offset:]):
+        ts += delta_ms / 1000
+        samples.append({
+            'ts': ts,
+            'posture': posture,
+            'stress': stress,
+            'typing_speed': typing_speed,
+            'breaks_taken': breaks_taken,
+            'should_break': bool(flags & 0x01)
+        })
+    return samples
+
+
+# ==========================================
+# UPLOADER
+# ==========================================
+
+class TelemetryUploader:
+    def __init__(self, url, agent_id=None, team='default', flush_interval=30,
+                 max_buffered=3600, spool_path='telemetry_spool.bin', max_spool_bytes=5 * 1024 * 1024,
+                 timeout=10):
+        """
+        url: collector base URL (frames go to <url>/ingest)
+        flush_interval: seconds between uploads
+        max_buffered: samples kept in memory; the oldest are dropped beyond this
+        spool_path: file holding frames that could not be uploaded yet
+        max_spool_bytes: oldest spooled frames are dropped beyond this size
+        """
+        self.url = url.rstrip('/') + '/ingest'
+        self.agent_id = agent_id or default_agent_id()
+        self.team = team
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.max_spool_bytes = max_spool_bytes
+        self.timeout = timeout
+
+        self.buffer = deque(maxlen=max_buffered)
+        self.backoff = 0
+        self.next_attempt = 0
+        self.last_error = None
+        self.running = False
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        metrics.gauge('devcare_telemetry_buffered_samples', 'Samples waiting to be framed',
+                      fn=lambda: len(self.buffer))
+        metrics.gauge('devcare_telemetry_spool_bytes', 'Bytes of frames waiting in the spool file',
+                      fn=self.spool_size)
+
+    def record(self, state):
+        """Buffer one state snapshot (called from update_state_loop; never blocks on I/O)"""
+        if len(self.buffer) == self.buffer.maxlen:
+            SAMPLES_DROPPED.inc()
+        self.buffer.append((
+            time.time(),
+            state.get('posture', 0),
+            STRESS_CODES.get(state.get('stress'), 0),
+            state.get('typing_speed', 0),
+            state.get('breaks_taken', 0),
+            state.get('should_break', False)
+        ))
+        SAMPLES_RECORDED.inc()
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self.run, name='telemetry', daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        """Upload loop: frame the buffer every flush_interval, then drain the spool"""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self):
+        """Stop the loop and make a last attempt; anything unsent stays in the spool"""
+        self.running = False
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1)
+        self.next_attempt = 0
+        self.flush()
+
+    def take_frame(self):
+        """
+        Move everything buffered into one frame
+        Returns: bytes or None if nothing was buffered
+        """
+        samples = []
+        while self.buffer and len(samples) < MAX_FRAME_SAMPLES:
+            samples.append(self.buffer.popleft())
+        if not samples:
+            return None
+        return encode_frame(self.agent_id, self.team, samples)
+
+    def flush(self):
+        """
+        Frame the buffer and try to deliver it plus anything spooled
+        Returns: bool - True if nothing is left waiting
+        """
+        with self._lock:
+            frame = self.take_frame()
+
+            if time.time() < self.next_attempt:
+                # Still backing off - don't even try the network
+                if frame:
+                    self.spool([frame])
+                return False
+
+            pending = self.read_spool()
+            if frame:
+                pending.append(frame)
+
+            sent = 0
+            for data in pending:
+                if not self.send(data):
+                    break
+                sent += 1
+
+            if sent < len(pending) or pending and self.spool_size():
+                self.rewrite_spool(pending[sent:])
+
+            if sent == len(pending):
+                self.backoff = 0
+                return True
+
+            self.backoff = min(MAX_BACKOFF, max(MIN_BACKOFF, self.backoff * 2))
+            self.next_attempt = max(self.next_attempt, time.time() + self.backoff)
+            return False
+
+    def send(self, data):
+        """
+        POST one frame
+        Returns: bool - True if the collector accepted it
+        """
+        request = urllib.request.Request(
+            self.url, data=data, method='POST',
+            headers={'Content-Type': FRAME_CONTENT_TYPE}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout):
+                pass
+        except urllib.error.HTTPError as e:
+            UPLOAD_FAILURES.inc()
+            self.last_error = f"HTTP {e.code}"
+            if e.code == 429:
+                retry_after = e.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    self.next_attempt = time.time() + int(retry_after)
+            elif 400 <= e.code < 500:
+                # The collector will never accept this frame; don't retry it forever
+                print(f"⚠️ Telemetry frame rejected ({e.code}), dropping it")
+                return True
+            return False
+        except (urllib.error.URLError, OSError) as e:
+            UPLOAD_FAILURES.inc()
+            self.last_error = str(e)
+            return False
+
+        FRAMES_UPLOADED.inc()
+        UPLOAD_BYTES.inc(len(data))
+        self.last_error = None
+        return True
+
+    # ------------------------------------------
+    # Spool file
+    # ------------------------------------------
+
+    def spool_size(self):
+        try:
+            return os.path.getsize(self.spool_path)
+        except OSError:
+            return 0
+
+    def read_spool(self):
+        """
+        Read all spooled frames (a truncated last record is ignored)
+        Returns: list of bytes
+        """
+        try:
+            with open(self.spool_path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return []
+
+        frames = []
+        offset = 0
+        while offset + SPOOL_RECORD.size <= len(data):
+            (length,) = SPOOL_RECORD.unpack_from(data, offset)
+            offset += SPOOL_RECORD.size
+            if offset + length > len(data):
+                break
+            frames.append(data[offset:offset + length])
+            offset += length
+        return frames
+
+    def spool(self, frames):
+        """Append frames to the spool file, then trim it to max_spool_bytes"""
+        with open(self.spool_path, 'ab') as f:
+            for frame in frames:
+                f.write(SPOOL_RECORD.pack(len(frame)) + frame)
+        if self.spool_size() > self.max_spool_bytes:
+            self.rewrite_spool(self.read_spool())
+
+    def rewrite_spool(self, frames):
+        """Replace the spool with frames, keeping the newest that fit"""
+        kept = []
+        size = 0
+        for frame in reversed(frames):
+            size += SPOOL_RECORD.size + len(frame)
+            if size > self.max_spool_bytes:
+                FRAMES_DROPPED.inc(len(frames) - len(kept))
+                break
+            kept.append(frame)
+        kept.reverse()
+
+        if not kept:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+
+        tmp_path = self.spool_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            for frame in kept:
+                f.write(SPOOL_RECORD.pack(len(frame)) + frame)
+        os.replace(tmp_path, self.spool_path)
+
+    def get_status(self):
+        """
+        Get uploader state for health reporting
+        Returns: dict
+        """
+        return {
+            'collector': self.url,
+            'agent_id': self.agent_id,
+            'team': self.team,
+            'buffered_samples': len(self.buffer),
+            'spool_bytes': self.spool_size(),
+            'backoff_seconds': self.backoff,
+            'last_error': self.last_error
+        }
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import random
+
+    print("=" * 60)
+    print("DEVCARE - TELEMETRY FRAME TEST")
+    print("=" * 60)
+
+    now = time.time()
+    samples = [(now + i + random.random() * 0.01, random.randint(50, 95), random.choice((0, 0, 0, 1, 2)),
+                random.randint(0, 300), 2, i % 600 > 540) for i in range(3600)]
+    frame = encode_frame('test@host', 'default', samples)
+    decoded = decode_frame(frame)
+
+    print(f"Samples:        {len(samples)}")
+    print(f"Frame size:     {len(frame):,} bytes ({len(frame) / len(samples):.2f} bytes/sample)")
+    print(f"Max ts error:   {max(abs(s['ts'] - o[0]) for s, o in zip(decoded['samples'], samples)) * 1000:.2f} ms")
@@ -0,0 +1,98 @@
+"""
+Batch Scoring Tests
+A failing file doesn't end the run, CSV names never collide, and
+calibration waits for usable detections
+"""
+
+import csv
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+import batch_score
+from posture_scoring import synthetic_pose
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / 'session.avi')
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+    for _ in range(5):
+        writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_output_names_keep_relative_paths_and_never_collide():
+    paths = ['rec/s1/cam.mp4', 'rec/s2/cam.mp4', 'rec/s1/cam.avi', 'rec/s1/cam.mp4']
+    assert batch_score.output_names(paths) == [
+        os.path.join('s1', 'cam'), os.path.join('s2', 'cam'),
+        os.path.join('s1', 'cam-2'), os.path.join('s1', 'cam-3')]
+
+
+def test_failing_file_becomes_its_error(monkeypatch):
+    def explode(path, *args):
+        raise RuntimeError('decoder crashed')
+    monkeypatch.setattr(batch_score, 'score_file', explode)
+
+    stats = batch_score._score_task(('broken.mp4', 'out'))
+    assert stats['file'] == 'broken.mp4'
+    assert stats['error'] == 'RuntimeError: decoder crashed'
+    assert stats['frames'] == 0
+
+
+def fake_recording(monkeypatch, chunks):
+    """Make score_file see these landmark chunks instead of running pose inference"""
+    def fake_chunks(camera, stride=1):
+        start = 0
+        for landmarks in chunks:
+            indices = np.arange(start, start + len(landmarks))
+            start += len(landmarks)
+            yield indices, indices / 10, landmarks
+
+    monkeypatch.setattr(batch_score, 'iter_landmark_chunks', fake_chunks)
+    monkeypatch.setattr(batch_score, '_open_backend', lambda: None)
+
+
+def read_scores(path):
+    with open(path) as f:
+        return [row['score'] for row in csv.DictReader(f)]
+
+
+def test_calibration_waits_for_usable_detections(monkeypatch, tmp_path, video):
+    # A person is seen from the start, but too far away to calibrate on
+    fake_recording(monkeypatch, [np.stack([synthetic_pose(scale=0.1)] * 100), np.stack([synthetic_pose()] * 100)])
+
+    stats = batch_score.score_file(video, str(tmp_path / 'out'), calibration_frames=90, name='s1/cam')
+
+    assert stats['error'] is None
+    assert stats['csv'] == str(tmp_path / 'out' / 's1' / 'cam.csv')
+    assert len(read_scores(stats['csv'])) == 200
+    assert stats['detected'] == 200
+    assert stats['unscored'] == 0
+
+
+def test_empty_room_is_not_held_in_memory(monkeypatch, tmp_path, video):
+    chunk = batch_score.CHUNK_FRAMES
+    empty = np.full((chunk, 33, 4), np.nan)
+    held_chunks = batch_score.MAX_HELD_FRAMES // chunk + 1
+    fake_recording(monkeypatch, [empty] * (held_chunks + 3) + [np.stack([synthetic_pose()] * chunk)])
+
+    stats = batch_score.score_file(video, str(tmp_path / 'out'), calibration_frames=90)
+
+    assert stats['error'] is None
+    assert stats['unscored'] == held_chunks * chunk       # spilled once past the cap
+    scores = read_scores(stats['csv'])
+    assert len(scores) == stats['frames'] == (held_chunks + 4) * chunk
+    assert scores[:stats['unscored']] == [''] * stats['unscored']
+    assert all(scores[-chunk:])
+    assert stats['detected'] == chunk
+
+
+def test_nobody_usable_is_an_error(monkeypatch, tmp_path, video):
+    fake_recording(monkeypatch, [np.full((50, 33, 4), np.nan)])
+    stats = batch_score.score_file(video, str(tmp_path / 'out'))
+    assert stats['error'] == 'no usable person'
+    assert read_scores(stats['csv']) == [''] * 50
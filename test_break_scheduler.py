@@ -0,0 +1,59 @@
+"""
+Break Scheduler Tests
+Without an activity source the clock is wall time and no natural break is credited
+"""
+
+import time
+
+from break_manager import BreakManager
+from break_scheduler import BreakScheduler
+
+
+def make_scheduler(**options):
+    now = [1000.0]
+    scheduler = BreakScheduler(break_interval=30 * 60, clock=lambda: now[0], **options)
+
+    def advance(minutes, source=None):
+        for _ in range(int(minutes * 60)):
+            now[0] += 1
+            if source:
+                scheduler.on_activity(source, now[0])
+            scheduler.tick(now[0])
+
+    return scheduler, advance
+
+
+def test_no_activity_source_counts_wall_clock():
+    scheduler, advance = make_scheduler()
+
+    advance(10)
+    assert scheduler.state == 'active'
+    assert scheduler.natural_breaks == 0
+    assert not scheduler.reporting
+
+    advance(21)
+    assert scheduler.should_break
+    assert scheduler.natural_breaks == 0
+
+
+def test_silence_after_a_source_reported_is_a_natural_break():
+    scheduler, advance = make_scheduler()
+
+    advance(5, source='presence')
+    advance(8)
+    assert scheduler.natural_breaks == 1
+    assert scheduler.state == 'on_break'
+
+
+def test_manager_uses_wall_clock_until_a_source_reports():
+    manager = BreakManager()
+    scheduler = BreakScheduler(break_interval=manager.break_interval * 60)
+    manager.scheduler = scheduler
+    scheduler.break_manager = manager
+
+    manager.last_break = time.time() - (manager.break_interval + 1) * 60
+    assert manager.should_suggest_break()
+    assert manager.get_status()['should_break']
+
+    scheduler.on_activity('typing')
+    assert not manager.should_suggest_break()
@@ -0,0 +1,94 @@
+"""
+Drift Detector Tests
+A slouch that slides the hips down is not drift; a camera move is
+"""
+
+import random
+
+import pytest
+
+import posture_detector
+from drift_detector import DriftDetector
+from posture_scoring import synthetic_pose
+
+SHOULDER_WIDTH = 0.25
+
+
+@pytest.fixture
+def detector():
+    random.seed(1)
+    detector = DriftDetector()
+    detector.start({'shoulder_hip': 1.40, 'head_shoulder': 0.75})
+    return detector
+
+
+def feed(detector, seconds, shoulder_hip, head_shoulder, hip_y=0.85, scale=1.0):
+    """Feed 10 detections per second; shoulders sit shoulder_hip widths above the hips"""
+    changed = {}
+    for _ in range(int(seconds * 10)):
+        ratio = shoulder_hip * (1 + random.gauss(0, 0.03))
+        y = hip_y + random.gauss(0, 0.01)
+        changed.update(detector.update(
+            (ratio, head_shoulder * (1 + random.gauss(0, 0.03))),
+            (0.16 * scale, 0.5, y, SHOULDER_WIDTH * scale, 0.5, y - ratio * SHOULDER_WIDTH * scale)))
+    return changed
+
+
+def test_slouch_with_hips_slid_down_is_not_drift(detector):
+    feed(detector, 60, 1.40, 0.75)
+    assert feed(detector, 30, 1.15, 0.55, hip_y=0.92) == {}
+    assert detector.baselines == {'shoulder_hip': 1.40, 'head_shoulder': 0.75}
+    assert detector.alarms > 0
+
+
+def test_camera_raised_is_rebaselined(detector):
+    feed(detector, 60, 1.40, 0.75)
+    changed = feed(detector, 60, 1.25, 0.66, hip_y=0.95)
+    assert changed['shoulder_hip'] == pytest.approx(1.25, abs=0.05)
+    assert changed['head_shoulder'] == pytest.approx(0.66, abs=0.05)
+
+
+def test_camera_moved_closer_is_rebaselined(detector):
+    feed(detector, 60, 1.40, 0.75)
+    changed = feed(detector, 60, 1.25, 0.66, scale=1.3)
+    assert changed['shoulder_hip'] == pytest.approx(1.25, abs=0.05)
+
+
+def test_sitting_straighter_than_baseline_is_rebaselined(detector):
+    feed(detector, 60, 1.40, 0.75)
+    changed = feed(detector, 60, 1.60, 0.75)
+    assert changed['shoulder_hip'] == pytest.approx(1.60, abs=0.05)
+    assert 'head_shoulder' not in changed
+
+
+class OneShotDrift:
+    """Reports one re-baseline on the first frame, then nothing"""
+
+    def __init__(self):
+        self.changes = [{'shoulder_hip': 1.25}]
+
+    def update(self, ratios, geometry):
+        return self.changes.pop() if self.changes else {}
+
+
+def test_rebaselined_calibration_is_saved_from_several_frames(calibration_store):
+    detector = posture_detector.PostureDetector()
+    detector.drift_detector = OneShotDrift()
+    detector.calibration_store = calibration_store
+    detector.camera_fingerprint = lambda: 'test-camera'
+    detector.calibration_data.update(complete=True, baseline_shoulder_hip=1.40, baseline_head_shoulder=0.75)
+    detector.last_ratios = (1.25, 0.75)
+
+    for _ in range(posture_detector.DRIFT_SAVE_FRAMES - 1):
+        detector.landmarks[:] = synthetic_pose()
+        detector._check_drift()
+    assert detector.calibration_data['baseline_shoulder_hip'] == 1.25
+    assert calibration_store.saved == []
+
+    detector._check_drift()
+    assert len(calibration_store.saved) == 1
+    assert len(detector._geometry_samples) == posture_detector.DRIFT_SAVE_FRAMES
+
+    detector._check_drift()
+    assert len(calibration_store.saved) == 1
+    detector.stop()
@@ -0,0 +1,101 @@
+"""
+Fleet Collector Tests
+Ingest validation, writer resilience and summary query arguments
+"""
+
+import gzip
+import json
+import time
+import zlib
+
+import pytest
+
+import fleet_collector
+from fleet_collector import FleetCollector, FleetStore, create_app
+from telemetry_uploader import FRAME_CONTENT_TYPE, encode_frame
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = FleetCollector(FleetStore(str(tmp_path / 'fleet.db')), queue_size=5).start()
+    yield collector
+    collector.stop()
+
+
+@pytest.fixture
+def client(collector):
+    return create_app(collector).test_client()
+
+
+def batch(ts=None, **fields):
+    sample = {'ts': time.time() if ts is None else ts, 'posture': 80, 'stress': 'Low'}
+    sample.update(fields)
+    return {'agent_id': 'agent-1', 'team': 'team-a', 'samples': [sample]}
+
+
+def post_json(client, body):
+    return client.post('/ingest', data=gzip.compress(json.dumps(body).encode()),
+                       headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+
+
+@pytest.mark.parametrize('ts', [1e20, -1.0, float('nan'), float('inf'), 'soon'])
+def test_ingest_rejects_bad_timestamps(client, collector, ts):
+    assert post_json(client, batch(ts)).status_code == 400
+    assert collector.queue.empty()
+
+
+def test_ingest_rejects_bad_frame_timestamps(client):
+    frame = encode_frame('agent-1', 'team-a', [(1e12, 80, 0, 100, 1, False)])
+    response = client.post('/ingest', data=frame, headers={'Content-Type': FRAME_CONTENT_TYPE})
+    assert response.status_code == 400
+
+
+def test_ingest_keeps_accepting_after_bad_batches(client, collector):
+    for _ in range(20):
+        post_json(client, batch(1e20))
+        assert post_json(client, batch()).status_code == 202
+        collector.flush()
+    summary = client.get('/api/teams/team-a/summary').get_json()
+    assert summary['samples'] == 20
+
+
+def test_writer_survives_unstorable_batch(collector):
+    # Bypasses decode_upload: the writer itself must not die on a bad batch
+    collector.submit({'agent_id': 'bad', 'team': 'team-a', 'samples': [
+        {'ts': 1e20, 'posture': 1, 'stress': 0, 'typing_speed': 0, 'breaks_taken': 0, 'should_break': 0}]})
+    collector.submit(fleet_collector.decode_upload(json.dumps(batch()).encode(), ''))
+    collector.flush()
+    time.sleep(0.2)
+
+    assert collector._thread.is_alive()
+    now = time.time()
+    assert collector.store.team_summary('team-a', now - 60, now + 60)['samples'] == 1
+
+
+def test_ingest_rejects_decompression_bombs(client):
+    bomb = gzip.compress(b' ' * (fleet_collector.MAX_DECODED_BYTES + 1))
+    response = client.post('/ingest', data=bomb,
+                           headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+    assert response.status_code == 400
+
+    response = client.post('/ingest', data=zlib.compress(b'\0' * (fleet_collector.MAX_DECODED_BYTES + 1)),
+                           headers={'Content-Type': FRAME_CONTENT_TYPE})
+    assert response.status_code == 400
+
+
+def test_stress_and_counts_are_clamped():
+    decoded = fleet_collector.decode_upload(
+        json.dumps(batch(stress=7, typing_speed=10 ** 30, breaks_taken=-3)).encode(), '')
+    sample = decoded['samples'][0]
+    assert sample['stress'] == 2
+    assert sample['typing_speed'] == fleet_collector.MAX_COUNT
+    assert sample['breaks_taken'] == 0
+
+
+@pytest.mark.parametrize('query', ['to=1e20', 'from=nan', 'hours=-5', 'from=0&to=100000000'])
+def test_summary_rejects_bad_windows(client, query):
+    assert client.get(f'/api/teams/team-a/summary?{query}').status_code == 400
+
+
+def test_summary_default_window(client):
+    assert client.get('/api/teams/team-a/summary').status_code == 200
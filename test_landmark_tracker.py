@@ -0,0 +1,83 @@
+"""
+Landmark Tracker Tests
+The Kalman filter smooths jittery detections, follows motion between them,
+holds still when detections stop, and trusts barely visible landmarks less
+"""
+
+import numpy as np
+
+from landmark_tracker import NUM_LANDMARKS, LandmarkTracker, as_landmarks
+
+
+def base_pose(rng):
+    pose = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 4))
+    pose[:, 3] = 0.95
+    return pose
+
+
+def test_tracking_beats_raw_detections():
+    rng = np.random.default_rng(0)
+    tracker = LandmarkTracker()
+    base = base_pose(rng)
+    raw_errors, tracked_errors = [], []
+
+    # Slow slouch, detections at 10 Hz with jitter, predictions at 30 Hz in between
+    for frame in range(300):
+        now = frame / 30
+        truth = base.copy()
+        truth[:, 1] += 0.005 * now
+        if frame % 3 == 0:
+            detection = truth.copy()
+            detection[:, :3] += rng.normal(0, 0.01, (NUM_LANDMARKS, 3))
+            tracked = tracker.update(detection, now)
+            raw_errors.append(np.abs(detection[:, :2] - truth[:, :2]).mean())
+        else:
+            tracked = tracker.predict(now)
+        if frame > 30:
+            tracked_errors.append(np.abs(tracked[:, :2] - truth[:, :2]).mean())
+
+    assert np.mean(tracked_errors) < np.mean(raw_errors)
+
+
+def test_prediction_follows_motion_then_holds_still():
+    tracker = LandmarkTracker()
+    pose = np.full((NUM_LANDMARKS, 4), 0.5)
+    pose[:, 3] = 1.0
+    for frame in range(10):
+        pose[:, 0] = 0.3 + 0.1 * frame / 10   # moving right at 0.1 units/s
+        tracker.update(pose, frame / 10)
+
+    ahead = tracker.predict(1.0)[0, 0]
+    assert ahead > pose[0, 0]
+
+    held = tracker.predict(1.0 + tracker.max_prediction + 0.1)[0, 0]
+    assert tracker.predict(5.0)[0, 0] == held
+
+
+def test_low_visibility_detections_move_the_track_less():
+    visible, hidden = LandmarkTracker(), LandmarkTracker()
+    pose = np.full((NUM_LANDMARKS, 4), 0.5)
+    pose[:, 3] = 1.0
+    visible.update(pose, 0.0)
+    hidden.update(pose, 0.0)
+
+    jump = pose.copy()
+    jump[:, 1] = 0.6
+    visible.update(jump, 0.1)
+    jump[:, 3] = 0.1
+    hidden.update(jump, 0.1)
+
+    assert hidden.output[0, 1] - 0.5 < visible.output[0, 1] - 0.5
+    assert hidden.output[0, 3] == np.float32(0.1)
+
+
+def test_reset_and_record_access():
+    tracker = LandmarkTracker()
+    pose = np.full((NUM_LANDMARKS, 4), 0.25)
+    tracker.update(pose, 0.0)
+    assert as_landmarks(tracker.predict(0.05))[0].x == np.float32(0.25)
+
+    tracker.reset()
+    assert not tracker.initialized
+    pose[:, 0] = 0.75
+    assert tracker.update(pose, 1.0)[0, 0] == np.float32(0.75)  # no blending with the old track
@@ -0,0 +1,53 @@
+"""
+Metrics Tests
+Per-thread shards of exited threads are folded in, not lost or duplicated
+"""
+
+import os
+import subprocess
+import sys
+import threading
+
+import metrics
+
+
+def run_threads(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_exited_thread_shards_are_folded():
+    registry = metrics.MetricsRegistry()
+    counter = registry.counter('test_events_total', 'Events')
+    histogram = registry.histogram('test_latency_seconds', 'Latency')
+
+    def record():
+        for _ in range(10):
+            counter.inc()
+            histogram.observe(0.01)
+
+    run_threads(record, 40)
+    assert counter.get() == 400
+    assert histogram.snapshot()[1] == 400
+
+    # Only the shards of live threads are kept
+    assert counter._shards.shards == []
+    run_threads(record, 5)
+    record()
+    assert counter.get() == 460
+    assert len(counter._shards.shards) == 1
+
+
+def test_cpu_seconds_is_a_counter():
+    text = metrics.render()
+    assert '# TYPE process_cpu_seconds_total counter' in text
+
+
+def test_imports_without_the_resource_module():
+    # Windows has no resource module; metrics is imported by every component
+    code = ("import sys; sys.modules['resource'] = None; import metrics; "
+            "text = metrics.render(); assert 'process_cpu_seconds_total' in text")
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,150 @@
+"""
+Person Tracker Tests
+Stable IDs at a shared desk, handing the single-person pipeline to a new
+primary person, and person IDs past 16 bits in worker records
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import posture_worker
+from person_tracker import MAX_MISSED, PersonTracker
+from pose_backends import PoseResult
+from posture_detector import PostureDetector
+from posture_scoring import synthetic_pose
+
+rng = np.random.default_rng(0)
+
+
+def person_at(x, slouch=0.0):
+    return synthetic_pose(x, slouch=slouch, jitter=0.003, rng=rng)
+
+
+def test_ids_are_stable_when_detection_order_changes():
+    tracker = PersonTracker()
+    for frame in range(20):
+        detections = [person_at(0.25), person_at(0.75)]
+        if frame % 2:
+            detections.reverse()
+        tracker.update(detections)
+
+    assert tracker.next_id == 3
+    by_id = {p.id: p.center[0] for p in tracker.people}
+    assert by_id[1] < 0.5 < by_id[2]
+
+
+def test_primary_is_kept_through_a_missed_frame():
+    tracker = PersonTracker()
+    tracker.update([person_at(0.25), person_at(0.75)])
+    tracker.update([person_at(0.75)])
+    assert tracker.primary().id == 1
+    assert tracker.primary().missed == 1
+
+    tracker.update([person_at(0.75), person_at(0.25)])
+    assert tracker.primary().id == 1
+    assert not tracker.primary().missed
+
+
+def test_primary_hands_over_when_the_first_person_leaves():
+    tracker = PersonTracker()
+    tracker.update([person_at(0.25), person_at(0.75)])
+    assert tracker.primary().id == 1
+
+    for _ in range(MAX_MISSED + 1):
+        tracker.update([person_at(0.75)])
+    assert tracker.primary().id == 2
+    assert [p['id'] for p in tracker.describe()] == [2]
+
+
+class FakeBackend:
+    """Returns the queued people as if the pose model had found them"""
+
+    def __init__(self):
+        self.people = []
+
+    def detect(self, image, timestamp_ms, wait=False):
+        people = [[SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in points]
+                  for points in self.people]
+        return PoseResult(timestamp_ms, people[0] if people else None, 0.01, people)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def shared_desk(calibration_store):
+    """Detector tracking two people; the first one has calibrated the single-person pipeline"""
+    detector = PostureDetector()
+    detector.backend = FakeBackend()
+    detector.person_tracker = PersonTracker()
+    detector.calibration_store = calibration_store
+    detector.camera_fingerprint = lambda: 'test-camera'
+    detector.motion_gate = None
+    detector.head_pose = None
+    detector.inference_interval = 0
+
+    detector.backend.people = [person_at(0.25), person_at(0.75, slouch=0.08)]
+    run_frames(detector, detector.CALIBRATION_FRAMES + 5)
+    assert detector.primary_id == detector.owner_id == 1
+    assert len(detector.calibration_store.saved) == 1
+    assert detector.drift_detector.active
+    yield detector
+    detector.stop()
+
+
+def run_frames(detector, count):
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    for _ in range(count):
+        detector.process_frame(frame)
+
+
+def test_one_missed_detection_keeps_the_primary(shared_desk, capsys):
+    detector = shared_desk
+    baselines = dict(detector.calibration_data)
+
+    detector.backend.people = [person_at(0.75, slouch=0.08)]
+    run_frames(detector, 1)
+    detector.backend.people = [person_at(0.25), person_at(0.75, slouch=0.08)]
+    run_frames(detector, 5)
+
+    assert 'Primary person changed' not in capsys.readouterr().out
+    assert detector.primary_id == 1
+    assert not detector.primary_switched
+    assert detector.drift_detector.active
+    assert detector.calibration_data['baseline_shoulder_hip'] == baselines['baseline_shoulder_hip']
+    assert detector.get_score() > 0
+
+
+def test_switched_primary_restarts_the_pipeline_without_saving(shared_desk):
+    detector = shared_desk
+    owner = detector.person_tracker.primary()
+    owner_baseline = detector.calibration_data['baseline_shoulder_hip']
+
+    # The first person leaves; the slouching one becomes primary
+    detector.backend.people = [person_at(0.75, slouch=0.08)]
+    run_frames(detector, MAX_MISSED + 10)
+
+    second = detector.person_tracker.primary()
+    assert detector.primary_id == second.id == 2
+    assert detector.primary_switched
+    assert detector.calibration_data['baseline_shoulder_hip'] == second.baselines[0]
+    assert not detector.drift_detector.active
+    assert len(detector.calibration_store.saved) == 1
+
+    # Back to the owner: their calibration and drift adaptation return
+    detector._follow_primary(owner)
+    assert not detector.primary_switched
+    assert detector.calibration_data['baseline_shoulder_hip'] == owner_baseline
+    assert detector.drift_detector.active
+
+    detector.reset_calibration()
+    assert detector.primary_id is None and detector.owner_id is None
+    assert not detector.primary_switched
+
+
+def test_person_ids_past_16_bits_fit_the_worker_record():
+    people = [{'id': 70000, 'score': 81, 'calibrated': True, 'visible': True}]
+    data = posture_worker.RECORD.pack(0.0, 0.0, 0.0, 10.0, 81, 0, *posture_worker.pack_people(people))
+    assert posture_worker.unpack_people(posture_worker.RECORD.unpack(data)[6:]) == people
@@ -0,0 +1,68 @@
+"""
+Pose Backend Tests
+A TasksBackend frame that never gets a result stops counting as in flight
+"""
+
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+import pose_backends
+from pose_backends import TasksBackend
+
+
+class SilentLandmarker:
+    """Accepts frames and answers only when told to (LIVE_STREAM drops frames silently)"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def detect_async(self, frame, timestamp_ms):
+        self.submitted.append(timestamp_ms)
+
+    def close(self):
+        pass
+
+
+def make_backend(max_in_flight=1):
+    # No model file or MediaPipe graph needed
+    return TasksBackend(max_in_flight=max_in_flight, landmarker=SilentLandmarker())
+
+
+IMAGE = np.zeros((48, 64, 3), dtype=np.uint8)
+
+
+def test_unanswered_frame_expires(monkeypatch):
+    backend = make_backend()
+    assert backend.detect(IMAGE, 0) is None
+    assert backend.detect(IMAGE, 33) is None
+    assert backend.dropped == 1          # the first frame is still in flight
+
+    # Never answered: it soon stops blocking new frames - well before the
+    # 5 s after which a silent detector reports a score of 0
+    assert pose_backends.IN_FLIGHT_TIMEOUT < 1
+    now = time.perf_counter() + pose_backends.IN_FLIGHT_TIMEOUT + 0.01
+    monkeypatch.setattr(pose_backends.time, 'perf_counter', lambda: now)
+    backend.detect(IMAGE, 66)
+    assert backend.expired == 1
+    assert backend.landmarker.submitted == [0, 66]
+    assert backend.describe()['in_flight'] == 1
+
+
+def test_answered_frame_is_returned():
+    backend = make_backend()
+    backend.detect(IMAGE, 0)
+    backend._on_result(SimpleNamespace(pose_landmarks=[]), None, 0)
+    result = backend.detect(IMAGE, 33)
+    assert result.timestamp_ms == 0 and result.people == []
+    assert backend.landmarker.submitted == [0, 33]
+    assert backend.expired == 0
+
+
+def test_wait_timeout_releases_the_frame(monkeypatch):
+    monkeypatch.setattr(pose_backends, 'RESULT_TIMEOUT', 0.05)
+    backend = make_backend()
+    assert backend.detect(IMAGE, 0, wait=True) is None
+    assert backend.expired == 1
+    assert not backend._submitted
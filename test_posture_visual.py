@@ -4,6 +4,8 @@ import math
 import time
 import numpy as np
 
+from frame_preprocessor import FramePreprocessor
+
 print("=" * 60)
 print("PRODUCTION POSTURE DETECTOR - V4")
 print("=" * 60)
@@ -240,20 +242,20 @@ frame_count = 0
 scores_history = []
 CALIBRATION_FRAMES = 90  # 3 seconds at 30fps
 
+# Reused capture and RGB buffers - nothing is allocated per frame
+preprocessor = FramePreprocessor()
+
 while True:
-    success, frame = camera.read()
+    success, frame = preprocessor.read(camera)
 
     if not success:
         break
 
     frame_count += 1
 
-    # Process frame
-    image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    image.flags.writeable = False
-    results = pose.process(image)
-    image.flags.writeable = True
-    image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+    # Process frame (inference reads the RGB buffer; we draw on the BGR frame)
+    results = pose.process(preprocessor.to_rgb(frame))
+    image = frame
 
     # Check for recalibration (press 'r')
     key = cv2.waitKey(5) & 0xFF
@@ -0,0 +1,72 @@
+"""
+Posture Worker Tests
+Camera loss ends the detector so the worker can exit and be restarted, and
+the supervisor notices a detector that stopped reading frames
+"""
+
+import time
+
+import numpy as np
+
+import posture_detector
+import posture_worker
+from posture_detector import PostureDetector
+from posture_worker import PostureProcess
+
+
+class DeadCamera:
+    """Delivers a few frames, then fails every read (unplugged webcam)"""
+
+    def __init__(self, frames=3):
+        self.frames = frames
+
+    def read(self, buffer=None):
+        if self.frames:
+            self.frames -= 1
+            return True, np.zeros((48, 64, 3), dtype=np.uint8)
+        return False, None
+
+    def release(self):
+        pass
+
+
+def test_run_stops_after_repeated_read_failures(monkeypatch):
+    monkeypatch.setattr(posture_detector, 'MAX_READ_FAILURES', 3)
+    monkeypatch.setattr(posture_detector.time, 'sleep', lambda seconds: None)
+
+    detector = PostureDetector()
+    camera = DeadCamera()
+    detector.open_camera = lambda: setattr(detector, 'camera', camera) or True
+    detector.process_frame = lambda frame: None
+
+    detector.run()  # returns instead of retrying forever
+
+    assert not detector.running
+    assert detector.last_frame_time > 0
+    detector.stop()
+
+
+def record(last_frame):
+    now = time.time()
+    return posture_worker.RECORD.pack(now, now, last_frame, 10.0, 80, posture_worker.FLAG_RUNNING,
+                                      *posture_worker.pack_people([]))
+
+
+def test_supervisor_detects_stalled_detector():
+    supervisor = PostureProcess()
+    supervisor.worker_started = time.time() - 60
+
+    supervisor._apply_record(record(time.time()))
+    assert not supervisor.detector_stalled()
+
+    # The publisher loop is alive but the detector read its last frame long ago
+    supervisor._apply_record(record(time.time() - posture_worker.DETECTOR_TIMEOUT - 1))
+    assert supervisor.detector_stalled()
+
+
+def test_supervisor_allows_startup_before_first_frame():
+    supervisor = PostureProcess()
+    supervisor.worker_started = time.time()
+    supervisor._apply_record(record(0))
+    assert not supervisor.detector_stalled()
+    assert supervisor.detector_stalled(time.time() + posture_worker.DETECTOR_TIMEOUT + 1)
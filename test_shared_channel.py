@@ -0,0 +1,73 @@
+"""
+Shared Channel Tests
+Seqlock reads: round trip, and a slot left mid-write by a crashed writer
+gives up after READ_TIMEOUT even when sleeps are coarse
+"""
+
+import time
+import uuid
+from multiprocessing import resource_tracker
+
+import numpy as np
+import pytest
+
+import shared_channel
+from shared_channel import SharedChannelReader, SharedChannelWriter
+
+
+@pytest.fixture
+def channel():
+    writer = SharedChannelWriter(name=f"devcare-test-{uuid.uuid4().hex[:8]}", slots=4)
+    reader = SharedChannelReader(writer.name)
+    yield writer, reader
+    reader.close()
+    # Writer and reader share this process's resource tracker; the reader
+    # untracked the segment, so track it again for the writer's unlink
+    resource_tracker.register('/' + writer.shm.name, 'shared_memory')
+    writer.close()
+
+
+def test_round_trip(channel):
+    writer, reader = channel
+    landmarks = np.arange(132, dtype=np.float32).reshape(33, 4)
+    writer.publish(landmarks=landmarks, posture=72, stress='High', calibrated=True)
+
+    record = reader.latest()
+    assert record['posture'] == 72
+    assert record['stress'] == 'High'
+    assert record['calibrated']
+    assert np.array_equal(record['landmarks'], landmarks)
+
+
+def test_torn_slot_does_not_spin_forever(channel):
+    writer, reader = channel
+    writer.publish(posture=50)
+    writer.publish(posture=60)
+
+    # Writer died mid-write: the first slot's sequence stays odd
+    offset = shared_channel.HEADER_SIZE
+    seq = shared_channel._SEQ.unpack_from(writer.buf, offset)[0]
+    shared_channel._SEQ.pack_into(writer.buf, offset, seq + 1)
+
+    start = time.perf_counter()
+    assert reader.read(0) is None
+    assert time.perf_counter() - start < 2.0
+
+    # Other slots are unaffected
+    assert reader.read(1)['posture'] == 60
+    assert reader.latest()['posture'] == 60
+
+
+def test_torn_slot_wait_is_bounded_by_time(channel, monkeypatch):
+    writer, reader = channel
+    writer.publish(posture=50)
+    offset = shared_channel.HEADER_SIZE
+    seq = shared_channel._SEQ.unpack_from(writer.buf, offset)[0]
+    shared_channel._SEQ.pack_into(writer.buf, offset, seq + 1)
+
+    # Windows rounds short sleeps up to its ~15 ms timer tick
+    monkeypatch.setattr(shared_channel, 'RETRY_SLEEP', 0.015)
+
+    start = time.perf_counter()
+    assert reader.read(0) is None
+    assert time.perf_counter() - start < shared_channel.READ_TIMEOUT + 0.1
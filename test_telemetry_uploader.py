@@ -0,0 +1,55 @@
+"""
+Telemetry Uploader Tests
+Frames survive an unreachable collector in the spool and drain in order
+"""
+
+import time
+
+from telemetry_uploader import TelemetryUploader, decode_frame
+
+
+def make_uploader(tmp_path, outcomes):
+    """Uploader whose send() returns the queued outcomes and records what it sent"""
+    uploader = TelemetryUploader('http://collector.invalid', agent_id='test@host',
+                                 spool_path=str(tmp_path / 'spool.bin'))
+    uploader.sent = []
+
+    def send(data):
+        ok = outcomes.pop(0)
+        if ok:
+            uploader.sent.append(data)
+        return ok
+
+    uploader.send = send
+    return uploader
+
+
+def test_frame_round_trip(tmp_path):
+    uploader = make_uploader(tmp_path, [])
+    for posture in (70, 80, 90):
+        uploader.record({'posture': posture, 'stress': 'High', 'typing_speed': 120,
+                         'breaks_taken': 2, 'should_break': posture == 90})
+    frame = decode_frame(uploader.take_frame())
+
+    assert frame['agent_id'] == 'test@host'
+    assert [s['posture'] for s in frame['samples']] == [70, 80, 90]
+    assert [s['stress'] for s in frame['samples']] == [2, 2, 2]
+    assert [s['should_break'] for s in frame['samples']] == [False, False, True]
+    assert abs(frame['samples'][0]['ts'] - time.time()) < 5
+
+
+def test_offline_frames_are_spooled_then_drained_in_order(tmp_path):
+    uploader = make_uploader(tmp_path, [False, True, True])
+
+    uploader.record({'posture': 60})
+    assert not uploader.flush()          # collector down: frame goes to the spool
+    assert uploader.spool_size() > 0
+    assert uploader.backoff > 0
+
+    uploader.record({'posture': 90})
+    uploader.next_attempt = 0            # backoff elapsed
+    assert uploader.flush()
+
+    assert [decode_frame(data)['samples'][0]['posture'] for data in uploader.sent] == [60, 90]
+    assert uploader.spool_size() == 0
+    assert uploader.backoff == 0
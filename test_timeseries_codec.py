@@ -0,0 +1,66 @@
+"""
+Time Series Codec Tests
+Blocks round-trip for every timestamp width and column kind
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+from telemetry_uploader import FRAME_HEADER, FRAME_MAGIC, V1_SAMPLE, decode_frame
+from timeseries_codec import SAMPLE_SCHEMA, decode_block, encode_block, quantize
+
+
+def make_columns(n, rng):
+    return {
+        'posture': rng.integers(0, 101, n),
+        'stress': rng.integers(0, 3, n),
+        'typing_speed': rng.integers(0, 70000, n),   # clipped to uint16
+        'breaks_taken': rng.integers(0, 20, n),
+        'should_break': rng.random(n) < 0.3
+    }
+
+
+@pytest.mark.parametrize('n', [0, 1, 2, 3, 9, 1000])
+@pytest.mark.parametrize('jitter', [0.0, 0.004, 5.0, 1e5])  # int8 .. int64 delta-of-delta
+def test_block_round_trip(n, jitter):
+    rng = np.random.default_rng(n)
+    timestamps = 1.7e9 + np.arange(n) + rng.normal(0, jitter, n)
+    columns = make_columns(n, rng)
+
+    decoded_ts, decoded = decode_block(encode_block(timestamps, columns))
+
+    assert len(decoded_ts) == n
+    assert np.abs(decoded_ts - timestamps).max(initial=0) <= 0.0005 + 1e-6
+    for name, kind in SAMPLE_SCHEMA:
+        assert np.array_equal(decoded[name], quantize(columns[name], kind)), name
+
+
+def test_decode_rejects_truncated_blocks():
+    rng = np.random.default_rng(0)
+    block = encode_block(np.arange(100.0), make_columns(100, rng))
+    with pytest.raises(ValueError):
+        decode_block(block[:-1])
+    with pytest.raises(ValueError):
+        decode_block(block[:5])
+
+
+def test_version_1_spool_frames_still_decode():
+    body = (V1_SAMPLE.pack(0, 80, 2, 120, 1, 0) + V1_SAMPLE.pack(1500, 60, 0, 90, 1, 1))
+    frame = zlib.compress(FRAME_HEADER.pack(FRAME_MAGIC, 1, 2, 1, 2, 1.7e9) + b'a1' + b't' + body)
+
+    decoded = decode_frame(frame)
+    assert decoded['agent_id'] == 'a1' and decoded['team'] == 't'
+    assert [s['ts'] for s in decoded['samples']] == [1.7e9, 1.7e9 + 1.5]
+    assert [s['posture'] for s in decoded['samples']] == [80, 60]
+    assert [s['should_break'] for s in decoded['samples']] == [False, True]
+
+    with pytest.raises(ValueError, match='frame length'):
+        decode_frame(zlib.compress(zlib.decompress(frame)[:-1]))
+
+
+def test_unknown_frame_versions_are_rejected():
+    header = FRAME_HEADER.pack(FRAME_MAGIC, 3, 0, 0, 0, 0.0)
+    with pytest.raises(ValueError, match='unsupported frame'):
+        decode_frame(zlib.compress(header))
@@ -0,0 +1,242 @@
+"""
+Time Series Codec for DevCare
+Compact, vectorized (NumPy) encoding for the scores DevCare records about
+once a second:
+
+- timestamps: millisecond delta-of-delta; samples ~1 s apart make almost
+  every value 0 or a few ms, stored in the narrowest integer type that fits
+- scores (posture 0-100): uint8
+- counters (typing speed, breaks): uint16
+- enums (stress level): bit-packed, 2 bits per value
+- booleans (should_break): bit-packed, 1 bit per value
+
+A block is a fixed schema of named columns plus timestamps. Blocks are not
+compressed here; callers that ship or store them zlib-compress the bytes,
+which squeezes the runs of zero deltas down to almost nothing.
+"""
+
+import struct
+
+import numpy as np
+
+# count, timestamp width (bytes per delta-of-delta), first timestamp (ms), first delta (ms)
+BLOCK_HEADER = struct.Struct('<IBqq')
+
+TIMESTAMP_WIDTHS = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+
+# Column kinds: name -> (bits per value, dtype after decoding)
+KINDS = {
+    'u8': (8, np.uint8),
+    'u16': (16, np.uint16),
+    'enum2': (2, np.uint8),
+    'bool': (1, np.bool_)
+}
+
+# Telemetry samples (see telemetry_uploader.py)
+SAMPLE_SCHEMA = (
+    ('posture', 'u8'),
+    ('stress', 'enum2'),
+    ('typing_speed', 'u16'),
+    ('breaks_taken', 'u16'),
+    ('should_break', 'bool')
+)
+
+
+# ==========================================
+# TIMESTAMPS
+# ==========================================
+
+def encode_timestamps(timestamps):
+    """
+    Delta-of-delta encode timestamps (seconds) at millisecond resolution
+    Returns: (width, first_ms, first_delta_ms, bytes)
+    """
+    ms = np.round(np.asarray(timestamps, dtype=np.float64) * 1000).astype(np.int64)
+    if len(ms) == 0:
+        return 1, 0, 0, b''
+    if len(ms) == 1:
+        return 1, int(ms[0]), 0, b''
+
+    deltas = np.diff(ms)
+    dod = np.diff(deltas)
+
+    width = 8
+    if len(dod) == 0:
+        width = 1
+    else:
+        low, high = int(dod.min()), int(dod.max())
+        for candidate in (1, 2, 4):
+            info = np.iinfo(TIMESTAMP_WIDTHS[candidate])
+            if info.min <= low and high <= info.max:
+                width = candidate
+                break
+
+    return width, int(ms[0]), int(deltas[0]), dod.astype(TIMESTAMP_WIDTHS[width]).tobytes()
+
+
+def decode_timestamps(count, width, first_ms, first_delta_ms, data):
+    """
+    Reverse encode_timestamps
+    Returns: np.ndarray of float64 seconds
+    """
+    if count == 0:
+        return np.empty(0, dtype=np.float64)
+
+    dod = np.frombuffer(data, dtype=TIMESTAMP_WIDTHS[width], count=max(0, count - 2)).astype(np.int64)
+    deltas = np.empty(count - 1, dtype=np.int64)
+    if count > 1:
+        deltas[0] = first_delta_ms
+        deltas[1:] = first_delta_ms + np.cumsum(dod)
+
+    ms = np.empty(count, dtype=np.int64)
+    ms[0] = first_ms
+    ms[1:] = first_ms + np.cumsum(deltas)
+    return ms / 1000.0
+
+
+# ==========================================
+# VALUES
+# ==========================================
+
+def quantize(values, kind):
+    """
+    Clip values into the range of a column kind
+    Returns: np.ndarray of the kind's storage type
+    """
+    bits, dtype = KINDS[kind]
+    array = np.asarray(values)
+    if kind == 'bool':
+        return array.astype(np.bool_)
+    return np.clip(np.rint(array), 0, (1 << bits) - 1).astype(dtype)
+
+
+def pack_bits(values, bits):
+    """
+    Pack small unsigned ints (< 2**bits) into bytes, 8 // bits per byte
+    Returns: bytes
+    """
+    values = np.asarray(values, dtype=np.uint8)
+    if bits == 1:
+        return np.packbits(values, bitorder='little').tobytes()
+
+    per_byte = 8 // bits
+    padded = np.zeros(-(-len(values) // per_byte) * per_byte, dtype=np.uint8)
+    padded[:len(values)] = values
+    shifts = np.arange(per_byte, dtype=np.uint8) * bits
+    return np.bitwise_or.reduce(padded.reshape(-1, per_byte) << shifts, axis=1).astype(np.uint8).tobytes()
+
+
+def unpack_bits(data, bits, count):
+    """
+    Reverse pack_bits
+    Returns: np.ndarray of uint8
+    """
+    packed = np.frombuffer(data, dtype=np.uint8)
+    if bits == 1:
+        return np.unpackbits(packed, count=count, bitorder='little')
+
+    per_byte = 8 // bits
+    shifts = np.arange(per_byte, dtype=np.uint8) * bits
+    return ((packed[:, None] >> shifts) & ((1 << bits) - 1)).reshape(-1)[:count].astype(np.uint8)
+
+
+def column_size(kind, count):
+    """Bytes used by `count` values of a column kind"""
+    bits = KINDS[kind][0]
+    return -(-count * bits // 8)
+
+
+# ==========================================
+# BLOCKS
+# ==========================================
+
+def encode_block(timestamps, columns, schema=SAMPLE_SCHEMA):
+    """
+    Encode timestamps plus one array per schema column
+    columns: dict - column name -> sequence of values (same length as timestamps)
+    Returns: bytes
+    """
+    count = len(timestamps)
+    width, first_ms, first_delta, ts_bytes = encode_timestamps(timestamps)
+    parts = [BLOCK_HEADER.pack(count, width, first_ms, first_delta), ts_bytes]
+
+    for name, kind in schema:
+        values = quantize(columns[name], kind)
+        if len(values) != count:
+            raise ValueError(f"column '{name}' has {len(values)} values, expected {count}")
+        bits = KINDS[kind][0]
+        parts.append(pack_bits(values, bits) if bits < 8 else values.astype(f'<u{bits // 8}').tobytes())
+    return b''.join(parts)
+
+
+def decode_block(data, schema=SAMPLE_SCHEMA, offset=0):
+    """
+    Reverse encode_block
+    Returns: (timestamps, columns) - float64 seconds and dict of name -> np.ndarray
+    Raises: ValueError if data is too short for the schema
+    """
+    try:
+        count, width, first_ms, first_delta = BLOCK_HEADER.unpack_from(data, offset)
+    except struct.error as e:
+        raise ValueError(f"truncated block header: {e}")
+    offset += BLOCK_HEADER.size
+
+    ts_size = max(0, count - 2) * width
+    expected = offset + ts_size + sum(column_size(kind, count) for _, kind in schema)
+    if len(data) < expected:
+        raise ValueError(f"block holds {len(data)} bytes, {count} samples need {expected}")
+
+    timestamps = decode_timestamps(count, width, first_ms, first_delta, data[offset:offset + ts_size])
+    offset += ts_size
+
+    columns = {}
+    for name, kind in schema:
+        bits, dtype = KINDS[kind]
+        size = column_size(kind, count)
+        chunk = data[offset:offset + size]
+        if bits < 8:
+            columns[name] = unpack_bits(chunk, bits, count).astype(dtype)
+        else:
+            columns[name] = np.frombuffer(chunk, dtype=f'<u{bits // 8}').astype(dtype)
+        offset += size
+    return timestamps, columns
+
+
+# ==========================================
+# TEST MODE
+# ==========================================
+
+if __name__ == "__main__":
+    import pickle
+    import time
+    import zlib
+
+    print("=" * 60)
+    print("DEVCARE - TIME SERIES CODEC TEST")
+    print("=" * 60)
+
+    n = 3600
+    rng = np.random.default_rng(0)
+    start = time.time()
+    timestamps = start + np.arange(n) + rng.normal(0, 0.004, n)
+    columns = {
+        'posture': np.clip(75 + np.cumsum(rng.integers(-2, 3, n)), 0, 100),
+        'stress': rng.choice(3, n, p=(0.7, 0.2, 0.1)),
+        'typing_speed': rng.integers(0, 400, n),
+        'breaks_taken': np.repeat(np.arange(6), n // 6),
+        'should_break': rng.random(n) < 0.1
+    }
+
+    as_dicts = [
+        {'timestamp': float(timestamps[i]), **{k: v[i].item() for k, v in columns.items()}}
+        for i in range(n)
+    ]
+    block = encode_block(timestamps, columns)
+    decoded_ts, decoded = decode_block(block)
+
+    print(f"Samples:               {n}")
+    print(f"Pickled dicts:         {len(pickle.dumps(as_dicts)):>10,} bytes")
+    print(f"Encoded block:         {len(block):>10,} bytes")
+    print(f"Encoded + zlib:        {len(zlib.compress(block, 6)):>10,} bytes")
+    print(f"Max timestamp error:   {np.abs(decoded_ts - timestamps).max() * 1000:.2f} ms")
+    print(f"Columns round-trip:    {all(np.array_equal(decoded[k], quantize(v, kind)) for (k, kind), v in zip(SAMPLE_SCHEMA, columns.values()))}")
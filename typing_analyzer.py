@@ -1,11 +1,36 @@
-from pynput import keyboard
 import time
 import threading
 
+import metrics
+
+try:
+    from pynput import keyboard
+
+    HAS_KEYBOARD = True
+    BACKSPACE = keyboard.Key.backspace
+except ImportError as e:
+    # No keyboard backend (e.g. headless Linux) - analysis still works on
+    # keys fed to on_press directly, but run() can't listen
+    keyboard = None
+    HAS_KEYBOARD = False
+    KEYBOARD_ERROR = str(e)
+    BACKSPACE = 'backspace'
+
+KEYSTROKES_PROCESSED = metrics.counter(
+    'devcare_keystrokes_total', 'Key press events processed by the typing analyzer')
+BACKSPACES_PROCESSED = metrics.counter(
+    'devcare_backspaces_total', 'Backspace presses processed by the typing analyzer')
+
 
 class TypingAnalyzer:
-    def __init__(self):
-        """Initialize typing analyzer"""
+    def __init__(self, listen=True):
+        """
+        Initialize typing analyzer
+        listen: require a keyboard backend (set False to feed keys manually)
+        """
+        if listen and not HAS_KEYBOARD:
+            raise ImportError(f"pynput keyboard backend not available ({KEYBOARD_ERROR})")
+
         self.keystrokes = 0
         self.backspaces = 0
         self.start_time = time.time()
@@ -17,6 +42,9 @@ class TypingAnalyzer:
         self.keys_last_minute = []
         self.backspaces_last_minute = []
 
+        # Optional callable(source, timestamp) told about every key press
+        self.on_activity = None
+
         print("📝 Typing Analyzer initialized")
 
     def on_press(self, key):
@@ -26,7 +54,10 @@ class TypingAnalyzer:
 
             # Count keystroke
             self.keystrokes += 1
+            KEYSTROKES_PROCESSED.inc()
             self.last_key_time = current_time
+            if self.on_activity:
+                self.on_activity('typing', current_time)
 
             # Track for rolling average
             self.keys_last_minute.append(current_time)
@@ -36,8 +67,9 @@ class TypingAnalyzer:
             self.keys_last_minute = [t for t in self.keys_last_minute if t > cutoff]
 
             # Check if it's a backspace
-            if key == keyboard.Key.backspace:
+            if key == BACKSPACE:
                 self.backspaces += 1
+                BACKSPACES_PROCESSED.inc()
                 self.backspaces_last_minute.append(current_time)
                 # Clean old backspaces
                 self.backspaces_last_minute = [t for t in self.backspaces_last_minute if t > cutoff]
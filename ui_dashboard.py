@@ -8,13 +8,37 @@ from datetime import datetime
 import threading
 import time
 
+from command_bus import bus
+
+# How often the Tk loop checks for a new state version (a cheap int compare)
+POLL_INTERVAL_MS = 100
+
+# Renders are spaced at least this far apart; the spacing grows with the
+# measured render cost so a busy state can't keep Tk saturated
+MIN_RENDER_INTERVAL_MS = 100
+MAX_RENDER_INTERVAL_MS = 1000
+
 
 class DashboardWindow:
-    def __init__(self, state_dict):
+    def __init__(self, state_dict, commands=None):
         """
         state_dict: Reference to the global state dictionary
+        commands: CommandBus for button actions (defaults to the shared bus)
         """
         self.state = state_dict
+        self.commands = commands or bus
+
+        # Change tracking: last rendered widget values and state version
+        self._rendered = {}
+        self._rendered_version = None
+        self._dirty = True
+        self._last_render = 0.0
+        self.render_interval_ms = MIN_RENDER_INTERVAL_MS
+        self._after_id = None
+
+        # VersionedState tells us when it changes; a plain dict is diffed on each poll
+        if hasattr(self.state, 'subscribe'):
+            self.state.subscribe(self._on_state_change)
 
         # Set theme
         ctk.set_appearance_mode("dark")
@@ -24,6 +48,7 @@ class DashboardWindow:
         self.root = ctk.CTk()
         self.root.title("DevCare Dashboard")
         self.root.geometry("600x700")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
         # Build UI
         self.create_ui()
@@ -169,58 +194,118 @@ class DashboardWindow:
 
         return card
 
-    def update_ui(self):
-        """Update UI with current state (called every second)"""
-        try:
-            # Update posture
-            posture = self.state.get('posture', 0)
-            self.posture_score.configure(text=f"{posture}/100")
-            self.posture_bar.set(posture / 100)
-
-            # Change color based on posture
-            if posture >= 80:
-                color = "#4CAF50"  # Green
-            elif posture >= 60:
-                color = "#FFA726"  # Orange
+    def _on_state_change(self, version):
+        """Called on the writer's thread - only flags the change"""
+        self._dirty = True
+
+    def build_view(self):
+        """
+        Compute what every widget should show from the current state
+        Returns: dict - widget name -> value (progress) or configure kwargs
+        """
+        posture = self.state.get('posture', 0)
+
+        # Change color based on posture
+        if posture >= 80:
+            color = "#4CAF50"  # Green
+        elif posture >= 60:
+            color = "#FFA726"  # Orange
+        else:
+            color = "#EF5350"  # Red
+
+        return {
+            'posture_score': {'text': f"{posture}/100", 'text_color': color},
+            'posture_bar': posture / 100,
+            'time_value': {'text': self.state.get('time', '0 min')},
+            'stress_value': {'text': self.state.get('stress', 'Low')},
+            'breaks_value': {'text': str(self.state.get('breaks_taken', 0))},
+            'typing_value': {'text': f"{self.state.get('typing_speed', 0)} keys/min"}
+        }
+
+    def render(self, view):
+        """
+        Apply only what changed since the last render, one configure call per widget
+        Returns: int - number of widgets touched
+        """
+        touched = 0
+        for name, value in view.items():
+            previous = self._rendered.get(name)
+            if previous == value:
+                continue
+
+            widget = getattr(self, name)
+            if name == 'posture_bar':
+                widget.set(value)
             else:
-                color = "#EF5350"  # Red
-            self.posture_score.configure(text_color=color)
-
-            # Update stats
-            self.time_value.configure(text=self.state.get('time', '0 min'))
-            self.stress_value.configure(text=self.state.get('stress', 'Low'))
-            self.breaks_value.configure(text=str(self.state.get('breaks_taken', 0)))
-            self.typing_value.configure(
-                text=f"{self.state.get('typing_speed', 0)} keys/min"
-            )
+                previous = previous or {}
+                changed = {k: v for k, v in value.items() if previous.get(k) != v}
+                widget.configure(**changed)
 
-        except Exception as e:
-            print(f"Error updating UI: {e}")
+            self._rendered[name] = value
+            touched += 1
+        return touched
 
-        # Schedule next update
-        self.root.after(1000, self.update_ui)
+    def update_ui(self):
+        """Render state changes (polled every POLL_INTERVAL_MS, rendered only on change)"""
+        now = time.perf_counter()
+        version = getattr(self.state, 'version', None)
+        changed = self._dirty or version is None or version != self._rendered_version
+        due = (now - self._last_render) * 1000 >= self.render_interval_ms
+
+        if changed and due:
+            self._dirty = False
+            self._rendered_version = version
+            try:
+                self.render(self.build_view())
+            except Exception as e:
+                print(f"Error updating UI: {e}")
+
+            finished = time.perf_counter()
+            self._last_render = finished
+            # Keep rendering under ~10% of the Tk loop
+            self.render_interval_ms = min(
+                MAX_RENDER_INTERVAL_MS,
+                max(MIN_RENDER_INTERVAL_MS, (finished - now) * 1000 * 10)
+            )
+
+        # Schedule next check
+        self._after_id = self.root.after(POLL_INTERVAL_MS, self.update_ui)
 
     def take_break(self):
         """Record a break"""
-        import requests
-        try:
-            requests.post('http://localhost:5000/break', timeout=1)
+        result = self.commands.dispatch('take_break')
+        if result.get('success'):
             print("✅ Break recorded!")
-        except:
-            print("❌ Could not record break")
+        else:
+            print(f"❌ Could not record break: {result.get('message')}")
 
     def reset_stats(self):
         """Reset statistics"""
-        import requests
-        try:
-            requests.post('http://localhost:5000/reset', timeout=1)
+        result = self.commands.dispatch('reset')
+        if result.get('success'):
             print("✅ Stats reset!")
-        except:
-            print("❌ Could not reset stats")
+        else:
+            print(f"❌ Could not reset stats: {result.get('message')}")
 
     def run(self):
         """Run the dashboard (blocking)"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self._unsubscribe()
+
+    def _unsubscribe(self):
+        # The state outlives this window; don't leave a dead listener on it
+        if hasattr(self.state, 'unsubscribe'):
+            self.state.unsubscribe(self._on_state_change)
+
+    def close(self):
+        """Tear down the window and stop listening for state changes"""
+        self._unsubscribe()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self.root.destroy()
 
 
 # Test